@@ -4,44 +4,22 @@ from caeModules import *
 import __main__
 import sys
 
+from contact_domain import DEFAULT_MARGIN, restrict_general_contact
+from mesh_grading import MESH_SUFFIX, count_elements, seed_graded, write_mesh_report
+from output_profiles import DEFAULT_PROFILE, LAYUP_VARIABLES, profile_settings
+
 
 #Overlap = 30 #mm
 #orient = [-45.0, 0.0, 45.0, 90.0, 90.0, 45.0, 0.0, -45.0]
 #Film_thickness = 0.1 #mm
 #Cores = 10 #number of cores for the job
 
-class AdhesiveMaterial:
-    def __init__(self, name, Ek, Gk, damage_initiation, damage_evolution):
-        self.name = name
-        self.Ek = Ek
-        self.Gk = Gk
-        self.damage_initiation = damage_initiation
-        self.damage_evolution = damage_evolution
-
-    def cohesive_penalties(self, thickness):
-        Kn = self.Ek / thickness
-        Ks = self.Gk / thickness
-        Kt = Ks
-        return (Kn, Ks, Kt)
-
-DP490 = AdhesiveMaterial(
-    name = "DP490",
-    Ek=659.6,
-    Gk=239.0,
-    damage_initiation=(30.112, 36.0, 36.0),
-    damage_evolution=(0.9055, 2.3213, 2.3213),
-)
-
-AF163 = AdhesiveMaterial(
-    name = "AF163",
-    Ek=1110.0,
-    Gk=413.69,
-    damage_initiation=(48.26, 47.92, 47.92),
-    damage_evolution=(3.8, 9.8, 9.8),
-)
-
-
-def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2.0, pl=8, num_steps=4, orientation_values= [-45.0, 0.0, 45.0, 90.0, 90.0, 45.0, 0.0, -45.0]):
+def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2.0, pl=8, num_steps=4, orientation_values= [-45.0, 0.0, 45.0, 90.0, 90.0, 45.0, 0.0, -45.0], memory=90, write_input=False, work_dir=None, scratch='', seed_size=0.4, mass_scaling_target=1e-05, explicit_precision='SINGLE', save_cae=True, domains=None, threads_per_process=1, load_balancing=False, step_time=1.0, output_profile=DEFAULT_PROFILE, coarse_seed_size=None, half_width=False, restricted_contact=False, contact_margin=DEFAULT_MARGIN, overlap_partitions=False):
+
+    profile = profile_settings(output_profile)
+    if half_width:
+        #only 0 <= z <= B/2 is modelled, the face z = B/2 is the symmetry plane
+        B = B / 2.0
 
     # Round overlap to 2 decimal places and format
     # Round overlap to 4 decimal places and keep all 4 decimals
@@ -296,6 +274,14 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
 
     a.PartitionCellByDatumPlane(datumPlane=a.datums[dplane1.id], cells=a.instances['Fuegepartner1-1'].cells)
     a.PartitionCellByDatumPlane(datumPlane=a.datums[dplane2.id], cells=a.instances['Fuegepartner2-1'].cells)
+    if coarse_seed_size or restricted_contact or overlap_partitions:
+        #bound the overlap by partitions so that the graded seed and the contact
+        #domain stay outside of / within it; overlap_partitions cuts them for
+        #an all-inclusive contact run that is compared with a restricted one
+        dplane3 = a.DatumPlaneByPrincipalPlane(principalPlane=YZPLANE, offset=(L - Overlap))
+        dplane4 = a.DatumPlaneByPrincipalPlane(principalPlane=YZPLANE, offset=L)
+        a.PartitionCellByDatumPlane(datumPlane=a.datums[dplane3.id], cells=a.instances['Fuegepartner1-1'].cells)
+        a.PartitionCellByDatumPlane(datumPlane=a.datums[dplane4.id], cells=a.instances['Fuegepartner2-1'].cells)
 
     #create surfaces, sets and reference points
     f1 = a.instances['Fuegepartner1-1'].faces
@@ -363,8 +349,10 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
     c2 = a.instances['Fuegepartner2-1'].cells
     a.Set(cells=c1+c2, name='AllCells')
 
-    zugMesspunkt = a.ReferencePoint(point=(2*L - Overlap, th/2, B/2))
-    ankerpunkt = a.ReferencePoint(point=(0.0, th/2, B/2))
+    #reference points in the middle of the specimen width
+    zRef = B if half_width else B/2
+    zugMesspunkt = a.ReferencePoint(point=(2*L - Overlap, th/2, zRef))
+    ankerpunkt = a.ReferencePoint(point=(0.0, th/2, zRef))
 
     a.Set(referencePoints=(a.referencePoints[zugMesspunkt.id],), name='ZugMesspunkt')
     a.Set(referencePoints=(a.referencePoints[ankerpunkt.id],), name='Ankerpunkt')
@@ -383,8 +371,8 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
         alpha=0.0, localCsys=None, u1=ON, u2=ON, u3=ON, ur1=ON, ur2=ON, ur3=ON)
        
     #create step
-    mymodel.ExplicitDynamicsStep(name='Step-1', previous='Initial', 
-        massScaling=((SEMI_AUTOMATIC, MODEL, AT_BEGINNING, 0.0, 1e-05, 
+    mymodel.ExplicitDynamicsStep(name='Step-1', previous='Initial', timePeriod=step_time, 
+        massScaling=((SEMI_AUTOMATIC, MODEL, AT_BEGINNING, 0.0, mass_scaling_target, 
         BELOW_MIN, 0, 0, 0.0, 0.0, 0, None), ), improvedDtMethod=ON)
     
     #create interaction properties
@@ -410,8 +398,14 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
     
     #create interactions
     mymodel.ContactExp(name='Int-1', createStepName='Initial')
-    mymodel.interactions['Int-1'].includedPairs.setValuesInStep(
-        stepName='Initial', useAllstar=ON)
+    if restricted_contact:
+        #contact domain limited to the overlap, see contact_domain.py
+        contactFaces = restrict_general_contact(mymodel, a, (a.instances['Fuegepartner1-1'], a.instances['Fuegepartner2-1']),
+            L - Overlap, L, contact_margin)
+        print(f"Contact domain: {contactFaces} faces within {contact_margin} mm of the overlap")
+    else:
+        mymodel.interactions['Int-1'].includedPairs.setValuesInStep(
+            stepName='Initial', useAllstar=ON)
     
     r21=mymodel.rootAssembly.surfaces['Fuegepartner1-Klebeflaeche']
     r22=mymodel.rootAssembly.surfaces['Fuegepartner2-Klebeflaeche']
@@ -425,7 +419,7 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
     
     #create smooth step amplitude
     mymodel.SmoothStepAmplitude(name='SmoothStep', timeSpan=STEP, 
-        data=((0.0, 0.0), (2.0, 1.0)))
+        data=((0.0, 0.0), (2.0 * step_time, 1.0)))
     
 
      #boundary conditions
@@ -447,6 +441,20 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
     
     mymodel.boundaryConditions['Zug'].setValuesInStep(
         stepName='Step-1', u1=6.0, amplitude='SmoothStep')
+
+    if half_width:
+        #symmetry plane z = B/2 of the specimen
+        symmetryFaces = None
+        for name in ('Fuegepartner1-1', 'Fuegepartner2-1'):
+            faces = a.instances[name].faces.getByBoundingBox(
+                xMin=-1.0, xMax=2*L + 1.0,
+                yMin=-1.0, yMax=3*th + 1.0,
+                zMin=B, zMax=B
+            )
+            symmetryFaces = faces if symmetryFaces is None else symmetryFaces + faces
+        a.Set(faces=symmetryFaces, name='Symmetrieflaeche')
+        mymodel.ZsymmBC(name='Symmetrie', createStepName='Initial',
+            region=a.sets['Symmetrieflaeche'], localCsys=None)
     
     #mesh
 
@@ -460,35 +468,49 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
 
     partInstances =(a.instances['Fuegepartner1-1'], a.instances['Fuegepartner2-1'], 
         )
-    a.seedPartInstance(regions=partInstances, size=0.4, deviationFactor=0.1, 
+    a.seedPartInstance(regions=partInstances, size=seed_size, deviationFactor=0.1, 
         minSizeFactor=0.1)
+    if coarse_seed_size:
+        #graded seed along x from the overlap to the clamps, see mesh_grading.py
+        seed_graded(a, partInstances, L - Overlap, L, 50.0, 2*L - Overlap - 50.0,
+            seed_size, coarse_seed_size)
 
     a.generateMesh(regions=partInstances)
+    mesh_elements = count_elements(partInstances)
+    print(f"Mesh: {sum(mesh_elements.values())} elements"
+          + (f", graded from {seed_size} to {coarse_seed_size} mm" if coarse_seed_size else ""))
 
     #create outputs and filter
     mymodel.OperatorFilter(name='MinValue', operation=MIN, 
         limit=-5.0, halt=ON)
     
 
-    mymodel.fieldOutputRequests['F-Output-1'].setValues(variables=(
-        'DAMAGEC', 'DAMAGEFC', 'DAMAGEFT', 'DAMAGEMC', 'DAMAGEMT', 'DAMAGESHR', 'DAMAGET', 'DMICRT', 'LE', 'S', 'SDEG', 'STATUS'),
-        numIntervals=50, layupNames=('Fuegepartner1-1.CompositeLayup-Fuegepartner1', ),
-        layupLocationMethod=SPECIFIED, outputAtPlyTop=False, 
-        outputAtPlyMid=True, outputAtPlyBottom=False, rebar=EXCLUDE)
-    
-    mymodel.FieldOutputRequest(name='F-Output-2', 
-        createStepName='Step-1', variables=('DAMAGEC', 'DAMAGEFC', 'DAMAGEFT', 'DAMAGEMC', 'DAMAGEMT', 'DAMAGESHR', 'DAMAGET', 'DMICRT', 'LE', 'S', 'SDEG', 'STATUS'),
-        numIntervals=50, layupNames=('Fuegepartner2-1.CompositeLayup-Fuegepartner2', ), layupLocationMethod=SPECIFIED,
-        outputAtPlyTop=False, outputAtPlyMid=True, outputAtPlyBottom=False, 
-        rebar=EXCLUDE)
-    
-    mymodel.FieldOutputRequest(name='F-Output-3', 
-        createStepName='Step-1', variables=('CSDMG', 'STATUS'), 
-        numIntervals=50)
+    #field output on the composite layups, see output_profiles.py
+    layups = ('Fuegepartner1-1.CompositeLayup-Fuegepartner1', 'Fuegepartner2-1.CompositeLayup-Fuegepartner2')
+    if profile['layup_intervals']:
+        mymodel.fieldOutputRequests['F-Output-1'].setValues(variables=LAYUP_VARIABLES,
+            numIntervals=profile['layup_intervals'], layupNames=(layups[0], ),
+            layupLocationMethod=SPECIFIED, outputAtPlyTop=False, 
+            outputAtPlyMid=True, outputAtPlyBottom=False, rebar=EXCLUDE)
+        for number, layup in enumerate(layups[1:], start=2):
+            mymodel.FieldOutputRequest(name='F-Output-%d' % number, 
+                createStepName='Step-1', variables=LAYUP_VARIABLES,
+                numIntervals=profile['layup_intervals'], layupNames=(layup, ), layupLocationMethod=SPECIFIED,
+                outputAtPlyTop=False, outputAtPlyMid=True, outputAtPlyBottom=False, 
+                rebar=EXCLUDE)
+    else:
+        del mymodel.fieldOutputRequests['F-Output-1']
     
+    if profile['damage_intervals']:
+        mymodel.FieldOutputRequest(name='F-Output-3', 
+            createStepName='Step-1', variables=('CSDMG', 'STATUS'), 
+            numIntervals=profile['damage_intervals'])
 
-    mymodel.historyOutputRequests['H-Output-1'].setValues(variables=(
-        'ALLIE', 'ALLKE'), numIntervals=100)
+    if profile['energy']:
+        mymodel.historyOutputRequests['H-Output-1'].setValues(variables=(
+            'ALLIE', 'ALLKE'), numIntervals=100)
+    else:
+        del mymodel.historyOutputRequests['H-Output-1']
     
     regionDef=mymodel.rootAssembly.sets['ZugMesspunkt']
     mymodel.HistoryOutputRequest(name='H-Output-2', 
@@ -506,27 +528,38 @@ def SteppedJoint(overlap, adhesive, film_thickness, cores, L=150.0, B=25.0, th=2
     import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
     results_dir = os.path.abspath(os.path.join(script_dir, '..', 'results'))
+    # A per-job work directory keeps concurrent jobs from sharing files;
+    # the caller moves the final artifacts into the results directory
+    if work_dir:
+        results_dir = os.path.abspath(work_dir)
     if not os.path.exists(results_dir):
         os.makedirs(results_dir)
     
     original_dir = os.getcwd()
     os.chdir(results_dir)
+    write_mesh_report(f"{part_name}{MESH_SUFFIX}", part_name, seed_size, coarse_seed_size, mesh_elements,
+        width_fraction=0.5 if half_width else 1.0)
     
     #create job
     mdb.Job(name=part_name, model='Model-1', description='', type=ANALYSIS, 
-        atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=90, 
-        memoryUnits=PERCENTAGE, explicitPrecision=SINGLE, 
+        atTime=None, waitMinutes=0, waitHours=0, queue=None, memory=memory, 
+        memoryUnits=PERCENTAGE, explicitPrecision=DOUBLE_PLUS_PACK if explicit_precision == 'DOUBLE' else SINGLE, 
         nodalOutputPrecision=SINGLE, echoPrint=OFF, modelPrint=OFF, 
-        contactPrint=OFF, historyPrint=OFF, userSubroutine='', scratch='', 
-        resultsFormat=ODB, numDomains=cores, activateLoadBalancing=False, 
-        numThreadsPerMpiProcess=1, numCpus=cores)
+        contactPrint=OFF, historyPrint=OFF, userSubroutine='', scratch=scratch, 
+        resultsFormat=ODB, numDomains=domains or cores, activateLoadBalancing=load_balancing, 
+        numThreadsPerMpiProcess=threads_per_process, numCpus=cores)
     
     job = mdb.jobs[part_name]
-    job.submit()
-    job.waitForCompletion()
+    if write_input:
+        # Split mode: only write the input deck, the solver is started separately
+        job.writeInput(consistencyChecking=OFF)
+    else:
+        job.submit()
+        job.waitForCompletion()
 
     # Save CAE file (in results directory)
-    mdb.saveAs(pathName=f"{part_name}.cae")
+    if save_cae:
+        mdb.saveAs(pathName=f"{part_name}.cae")
     
     # Return to original directory
     os.chdir(original_dir)
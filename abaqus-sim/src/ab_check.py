@@ -0,0 +1,139 @@
+"""
+A/B runs of a design point for the model checks.
+
+symmetry_check.py and contact_benchmark.py solve a representative point
+twice per joint type, once as the reference model and once as a variant
+that should be cheaper (half width, restricted contact), and accept the
+variant if its peak RF1 stays within a tolerance of the reference. This
+module holds what both share; the checks only choose the options of the
+two runs and their own CSV columns.
+
+    run_point()      solve one run in a fresh work directory and measure it
+    compare_runs()   CSV rows of the reference and the variant run
+    run_checks()     both runs of every joint type, written as they finish
+    print_summary()  one line per joint type; returns True if all passed
+"""
+
+import csv
+import shutil
+import time
+
+from mesh_grading import MESH_SUFFIX, read_mesh_report
+from solver_metrics import collect_metrics
+
+# Columns of every check; the checks add their own in between
+COMMON_COLUMNS = ['Joint_type', 'Completed', 'Wall_s', 'Max_RF1', 'RF1_deviation', 'Speedup', 'Within_tolerance']
+
+
+def run_point(joint_type, overlap, film_thickness, adhesive, cores, project_root, abaqus_cmd, options,
+              work_dir, log_path):
+    """
+    Solve a design point in work_dir (cleared before and after the run) and
+    return a dict with completed, wall, max_rf1 (at full width), elements,
+    cpu and increments.
+    """
+    from run_batch import run_abaqus_simulation
+    from extraction import extract_odb_result
+    from job_ledger import JOB_DONE
+    from naming import job_name
+
+    name = job_name(joint_type, overlap, film_thickness, adhesive)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    start = time.time()
+    state = run_abaqus_simulation(overlap, adhesive, film_thickness, cores, joint_type, project_root,
+                                  abaqus_cmd, options=dict(options, work_dir=str(work_dir)), log_path=log_path)
+    wall = time.time() - start
+    extracted = None
+    if state == JOB_DONE:
+        # Scaled to the full width with the mesh report next to the ODB
+        extracted = extract_odb_result(work_dir / f"{name}.odb", abaqus_cmd)
+    report = read_mesh_report(work_dir / f"{name}{MESH_SUFFIX}") or {}
+    metrics = collect_metrics(work_dir, name)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return {'completed': extracted is not None, 'wall': wall,
+            'max_rf1': extracted['max_rf1'] if extracted else None,
+            'elements': report.get('total_elements'),
+            'cpu': metrics.get('cpu'), 'increments': metrics.get('increments')}
+
+
+def compare_runs(joint_type, label_column, labels, reference, variant, tolerance, columns=None, compare=None):
+    """
+    Rows of the reference and the variant run of a joint type, labelled
+    with labels (reference, variant) in label_column. columns(result)
+    returns the check's own columns of a run; compare(reference, variant)
+    those of the variant row that need both runs to have completed.
+    """
+    def row(label, result):
+        values = {
+            'Joint_type': joint_type,
+            label_column: label,
+            'Completed': int(result['completed']),
+            'Wall_s': round(result['wall'], 1),
+            'Max_RF1': '' if result.get('max_rf1') is None else round(result['max_rf1'], 3),
+            'RF1_deviation': '',
+            'Speedup': '',
+            'Within_tolerance': '',
+        }
+        if columns is not None:
+            values.update(columns(result))
+        return values
+
+    reference_row, variant_row = row(labels[0], reference), row(labels[1], variant)
+    if reference['completed'] and variant['completed'] and reference['max_rf1']:
+        deviation = abs(variant['max_rf1'] - reference['max_rf1']) / reference['max_rf1']
+        variant_row['RF1_deviation'] = round(deviation, 5)
+        variant_row['Within_tolerance'] = int(deviation <= tolerance)
+        if variant['wall'] > 0:
+            variant_row['Speedup'] = round(reference['wall'] / variant['wall'], 2)
+        if compare is not None:
+            variant_row.update(compare(reference, variant))
+    return [reference_row, variant_row]
+
+
+def write_results(path, header, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=header, restval='')
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_checks(joint_types, run, compare, csv_path, header):
+    """
+    Run the reference (run(joint_type, False)) and the variant
+    (run(joint_type, True)) of every joint type, compare them with
+    compare(joint_type, reference, variant) and write all rows to csv_path
+    after each pair. Returns the rows.
+    """
+    rows = []
+    for joint_type in joint_types:
+        reference = run(joint_type, False)
+        variant = run(joint_type, True)
+        rows.extend(compare(joint_type, reference, variant))
+        write_results(csv_path, header, rows)
+    return rows
+
+
+def print_summary(title, rows, describe, csv_path):
+    """
+    Print one line per joint type; describe(reference_row, variant_row)
+    adds the check's own figures. Returns True if every variant completed
+    within the tolerance.
+    """
+    print("\n" + "=" * 60)
+    print(title)
+    print("=" * 60)
+    passed = True
+    for reference_row, variant_row in zip(rows[::2], rows[1::2]):
+        if variant_row['Within_tolerance'] == '':
+            print(f"{reference_row['Joint_type']}: a run failed, no comparison")
+            passed = False
+            continue
+        passed = passed and bool(variant_row['Within_tolerance'])
+        print(f"{reference_row['Joint_type']}: RF1 {variant_row['Max_RF1']} vs {reference_row['Max_RF1']} "
+              f"({variant_row['RF1_deviation'] * 100:.2f}% deviation, "
+              f"{'within' if variant_row['Within_tolerance'] else 'OUTSIDE'} tolerance), "
+              f"{describe(reference_row, variant_row)}, "
+              f"{variant_row['Speedup'] or 'n/a'}x faster")
+    print(f"Results: {csv_path}")
+    print("=" * 60)
+    return passed
@@ -0,0 +1,313 @@
+"""
+Benchmark of the parallel job configuration (cores x domains x concurrent jobs).
+
+The joint builders create every job with numDomains=cores, one thread per
+MPI process and no load balancing, and the batch splits cpu_cores evenly
+across the concurrent jobs. Whether 1 x 28, 4 x 7 or 7 x 4 cores gives the
+highest campaign throughput depends on the joint type and the machine. The
+benchmark runs a representative design point under every combination of
+
+    concurrent jobs        cpu_cores is split evenly across the jobs
+    threads per process    MPI processes per job = cores / threads
+    domains per process    domains = processes * factor (load balancing if > 1)
+
+For each configuration, one copy of the point per concurrent job runs at
+the same time and the following is recorded:
+
+    wall time        makespan of the concurrent copies
+    CPU efficiency   CPU time / (wall time * cores), from the job time
+                     summary in the .msg/.dat files (or the child process
+                     times where Abaqus does not report it)
+    throughput       design points per hour for the whole node
+
+All runs are written to results/benchmark.csv and the configuration with
+the highest throughput per joint type to results/benchmark.json. With
+cores_per_job = benchmark in the [scheduler] section of config.ini,
+run_batch.py uses that configuration.
+
+Usage (from the abaqus-sim directory):
+    python src/benchmark.py
+    python src/benchmark.py --joint-types SEP --jobs 1 2 4 7 --threads 1 2
+    python src/benchmark.py --dry-run      # list the configurations only
+"""
+
+import argparse
+import csv
+import json
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+
+from solver_metrics import job_time_summary
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_HEADER = ['Joint_type', 'Concurrent_jobs', 'Cores_per_job', 'Domains', 'Threads_per_process',
+                  'Load_balancing', 'Completed', 'Wall_s', 'CPU_efficiency', 'Points_per_hour']
+
+
+class Configuration:
+    """One parallel configuration of a benchmark run."""
+
+    def __init__(self, joint_type, concurrent_jobs, cores, threads=1, domain_factor=1):
+        self.joint_type = joint_type
+        self.concurrent_jobs = concurrent_jobs
+        self.cores = cores
+        self.threads = threads
+        self.processes = cores // threads
+        self.domains = self.processes * domain_factor
+        self.load_balancing = domain_factor > 1
+
+    @property
+    def label(self):
+        return (f"{self.joint_type} {self.concurrent_jobs} x {self.cores} cores, {self.domains} domains, "
+                f"{self.threads} thread(s) per process{', load balancing' if self.load_balancing else ''}")
+
+    @property
+    def key(self):
+        return f"{self.concurrent_jobs}x{self.cores}_d{self.domains}_t{self.threads}"
+
+    def options(self):
+        """run_simulations.py options of the configuration."""
+        return {'domains': self.domains, 'threads_per_process': self.threads,
+                'load_balancing': int(self.load_balancing)}
+
+
+def configurations(joint_types, total_cores, concurrency, threads=(1,), domain_factors=(1,)):
+    """All valid configurations; the cores of a node are split evenly across the jobs."""
+    result = []
+    for joint_type in joint_types:
+        for jobs in concurrency:
+            cores = total_cores // jobs
+            if cores < 1:
+                continue
+            for thread_count in threads:
+                if thread_count < 1 or cores % thread_count:
+                    continue
+                for factor in domain_factors:
+                    result.append(Configuration(joint_type, jobs, cores, thread_count, factor))
+    return result
+
+
+def parse_cpu_time(work_dir, name):
+    """TOTAL CPU TIME (SEC) of the job time summary in <name>.msg or .dat, or None."""
+    for suffix in ('.msg', '.dat'):
+        try:
+            text = (Path(work_dir) / f"{name}{suffix}").read_text(errors='replace')
+        except OSError:
+            continue
+        cpu, _ = job_time_summary(text)
+        if cpu is not None:
+            return cpu
+    return None
+
+
+def _children_cpu_time():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_configuration(config, run_copy):
+    """
+    Run one copy of the point per concurrent job at the same time.
+
+    run_copy(config, index) runs one copy and returns (success, wall_seconds,
+    cpu_seconds or None). Returns a row with the RESULTS_HEADER keys.
+    """
+    outcomes = [None] * config.concurrent_jobs
+    children_before = _children_cpu_time()
+    start = time.time()
+
+    def run(index):
+        outcomes[index] = run_copy(config, index)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(config.concurrent_jobs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    makespan = time.time() - start
+
+    completed = [outcome for outcome in outcomes if outcome and outcome[0]]
+    cpu_times = [outcome[2] for outcome in completed]
+    if completed and all(cpu is not None for cpu in cpu_times):
+        cpu_seconds = sum(cpu_times)
+    elif children_before is not None and len(completed) == config.concurrent_jobs:
+        cpu_seconds = _children_cpu_time() - children_before
+    else:
+        cpu_seconds = None
+    busy_core_seconds = sum(outcome[1] for outcome in completed) * config.cores
+
+    return {
+        'Joint_type': config.joint_type,
+        'Concurrent_jobs': config.concurrent_jobs,
+        'Cores_per_job': config.cores,
+        'Domains': config.domains,
+        'Threads_per_process': config.threads,
+        'Load_balancing': int(config.load_balancing),
+        'Completed': len(completed),
+        'Wall_s': round(makespan, 1),
+        'CPU_efficiency': (round(cpu_seconds / busy_core_seconds, 3)
+                           if cpu_seconds is not None and busy_core_seconds > 0 else ''),
+        'Points_per_hour': round(len(completed) * 3600.0 / makespan, 3) if makespan > 0 else 0.0,
+    }
+
+
+def recommend(rows):
+    """
+    Best configuration per joint type: highest throughput, then highest CPU
+    efficiency. Configurations with a failed copy are not recommended.
+    """
+    best = {}
+    for row in rows:
+        if int(row['Completed']) < int(row['Concurrent_jobs']):
+            continue
+        key = (float(row['Points_per_hour']), float(row['CPU_efficiency'] or 0))
+        current = best.get(row['Joint_type'])
+        if current is None or key > current[0]:
+            best[row['Joint_type']] = (key, row)
+    return {
+        joint_type: {
+            'concurrent_jobs': int(row['Concurrent_jobs']),
+            'cores_per_job': int(row['Cores_per_job']),
+            'domains': int(row['Domains']),
+            'threads_per_process': int(row['Threads_per_process']),
+            'load_balancing': bool(int(row['Load_balancing'])),
+            'points_per_hour': float(row['Points_per_hour']),
+        }
+        for joint_type, (_, row) in best.items()
+    }
+
+
+def write_results(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULTS_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_recommendation(path, recommendation):
+    """Merge the recommendation into path, keeping the entries of other joint types."""
+    path = Path(path)
+    existing = json.loads(path.read_text()) if path.exists() else {}
+    existing.update(recommendation)
+    path.write_text(json.dumps(existing, indent=2))
+
+
+def load_recommendation(path, joint_type):
+    """Recommended configuration of a joint type from benchmark.json, or None."""
+    try:
+        return json.loads(Path(path).read_text()).get(joint_type)
+    except (OSError, ValueError):
+        return None
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(',') if v.strip()]
+
+
+def main(argv=None):
+    from run_batch import (find_project_root, load_config, read_config, read_output_profile,
+                           read_scheduler_config, read_workspace_config, run_abaqus_simulation)
+    from job_ledger import JOB_DONE
+    from naming import job_name
+    from scheduler import plan_job_resources
+
+    project_root = find_project_root()
+    config = load_config(project_root)
+    joint_type, adhesive, total_cores, abaqus_cmd = read_config(project_root)
+    _, _, memory_percent = read_scheduler_config(project_root)
+    output_profile = read_output_profile(project_root)  # ODB writing is part of the cost
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark cores x domains x concurrent jobs on a representative design point.")
+    joint_types = config.get('benchmark', 'joint_types', fallback='').replace(',', ' ').split()
+    parser.add_argument('--joint-types', nargs='+', choices=('SAP', 'SEP'), default=joint_types or [joint_type],
+                        help="joint types to benchmark (default: [benchmark] joint_types)")
+    parser.add_argument('--jobs', nargs='+', type=int,
+                        default=_int_list(config.get('benchmark', 'concurrent_jobs', fallback='1, 2, 4')),
+                        help="concurrent jobs to try (default: [benchmark] concurrent_jobs)")
+    parser.add_argument('--threads', nargs='+', type=int,
+                        default=_int_list(config.get('benchmark', 'threads_per_process', fallback='1')),
+                        help="threads per MPI process to try (default: [benchmark] threads_per_process)")
+    parser.add_argument('--domain-factors', nargs='+', type=int,
+                        default=_int_list(config.get('benchmark', 'domain_factors', fallback='1')),
+                        help="domains per MPI process to try (default: [benchmark] domain_factors)")
+    parser.add_argument('--overlap', type=float,
+                        default=config.getfloat('benchmark', 'overlap', fallback=30.0))
+    parser.add_argument('--film-thickness', type=float,
+                        default=config.getfloat('benchmark', 'film_thickness', fallback=0.2))
+    parser.add_argument('--dry-run', action='store_true', help="list the configurations and exit")
+    args = parser.parse_args(argv)
+
+    runs = configurations(args.joint_types, total_cores, args.jobs, args.threads, args.domain_factors)
+    if not runs:
+        print("ERROR: No valid configuration for the given concurrent jobs and threads")
+        return 1
+    print(f"Benchmark of {len(runs)} configuration(s) on {total_cores} cores, "
+          f"point: {args.overlap} mm overlap, {args.film_thickness} mm {adhesive}")
+    for run in runs:
+        print(f"  {run.label}")
+    if args.dry_run:
+        return 0
+
+    work_root, scratch, _ = read_workspace_config(project_root)
+    results_dir = project_root / 'results'
+    log_dir = results_dir / 'logs' / 'benchmark'
+
+    def run_copy(run, index):
+        name = job_name(run.joint_type, args.overlap, args.film_thickness, adhesive)
+        work_dir = work_root / 'benchmark' / f"{name}_{run.key}_{index}"
+        shutil.rmtree(work_dir, ignore_errors=True)
+        _, memory = plan_job_resources(total_cores, memory_percent, run.concurrent_jobs, run.cores)
+        options = dict(run.options(), memory=memory, work_dir=str(work_dir), save_cae=0,
+                       output_profile=output_profile)
+        if scratch:
+            options['scratch'] = scratch
+        start = time.time()
+        state = run_abaqus_simulation(args.overlap, adhesive, args.film_thickness, run.cores,
+                                      run.joint_type, project_root, abaqus_cmd, options=options,
+                                      log_path=log_dir / f"{name}_{run.key}_{index}.log")
+        wall = time.time() - start
+        cpu = parse_cpu_time(work_dir, name)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return state == JOB_DONE, wall, cpu
+
+    rows = []
+    csv_path = results_dir / 'benchmark.csv'
+    for number, run in enumerate(runs, start=1):
+        print(f"\n[{number}/{len(runs)}] {run.label}")
+        row = run_configuration(run, run_copy)
+        rows.append(row)
+        write_results(csv_path, rows)
+        print(f"  {row['Completed']}/{run.concurrent_jobs} completed in {row['Wall_s']} s, "
+              f"CPU efficiency {row['CPU_efficiency'] or 'n/a'}, {row['Points_per_hour']} points/h")
+
+    recommendation = recommend(rows)
+    json_path = results_dir / 'benchmark.json'
+    write_recommendation(json_path, recommendation)
+
+    print("\n" + "=" * 60)
+    print("RECOMMENDED CONFIGURATION")
+    print("=" * 60)
+    for joint_type, best in recommendation.items():
+        print(f"{joint_type}: {best['concurrent_jobs']} x {best['cores_per_job']} cores, "
+              f"{best['domains']} domains, {best['threads_per_process']} thread(s) per process"
+              f"{', load balancing' if best['load_balancing'] else ''}: {best['points_per_hour']} points/h")
+    if not recommendation:
+        print("No configuration completed all of its copies")
+    print(f"Results: {csv_path}")
+    print(f"Recommendation: {json_path} (used by run_batch.py with cores_per_job = benchmark)")
+    print("=" * 60)
+    return 0 if recommendation else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
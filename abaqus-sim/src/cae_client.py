@@ -0,0 +1,157 @@
+"""
+Client for the CAE server mode of run_simulations.py.
+
+Starting `abaqus cae` for every design point costs a kernel startup and a
+license checkout each time. In server mode, one CAE kernel takes design
+points from a spool directory (see spool.py) and builds and submits them
+one after another. This module starts such servers and hands them points.
+
+It can also be used on its own to drive a running server, e.g. for tests:
+    python cae_client.py <spool_dir> 45.0 DP490 0.25 7 SAP memory=22
+    python cae_client.py <spool_dir> --stop
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import spool
+
+
+class CaeServerPool:
+    """One or more `abaqus cae` server processes sharing a spool directory."""
+
+    def __init__(self, spool_dir, abaqus_cmd, project_root, size=1, log_dir=None):
+        self.spool_dir = str(spool_dir)
+        self.abaqus_cmd = abaqus_cmd
+        self.project_root = Path(project_root)
+        self.size = size
+        self.log_dir = Path(log_dir) if log_dir else Path(spool_dir)
+        self.processes = []
+        self._logs = []
+
+    def start(self):
+        """Start the server processes."""
+        spool.init_spool(self.spool_dir)
+        spool.clear_stop(self.spool_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        for n in range(1, self.size + 1):
+            process, log = self._start_server(n, 'w')
+            self.processes.append(process)
+            self._logs.append(log)
+
+    def _start_server(self, n, log_mode='a'):
+        """Start server n, which claims its tasks as cae_server_<n>."""
+        run_script = self.project_root / 'src' / 'run_simulations.py'
+        cmd = [self.abaqus_cmd, 'cae', f'noGUI={run_script}', '--', 'serve', self.spool_dir,
+               f"cae_server_{n}"]
+        log = open(self.log_dir / f"cae_server_{n}.log", log_mode)
+        print(f"Starting CAE server {n}: {' '.join(cmd)}")
+        process = subprocess.Popen(cmd, cwd=str(self.project_root), stdout=log, stderr=subprocess.STDOUT)
+        return process, log
+
+    def alive(self):
+        """Return True while at least one server process is running."""
+        return any(p.poll() is None for p in self.processes)
+
+    def run_point(self, overlap, adhesive, film_thickness, cores, joint_type,
+                  options=None, timeout=None, watchdog=None, on_abandon=None, release_timeout=300):
+        """
+        Hand one design point to the servers and wait for it to finish.
+
+        Returns the result dict ({'success': ..., 'duration': ...}), or None
+        on timeout, if all servers died or if the watchdog (a
+        job_control.JobWatchdog) reports a stall. Before returning None, the
+        task is released (see release()), so a retry can reuse its work
+        directory; on_abandon() is called first, e.g. to end the analysis.
+        """
+        task_id = submit_point(self.spool_dir, overlap, adhesive, film_thickness,
+                               cores, joint_type, options)
+        alive = self.alive
+        if watchdog is not None:
+            alive = lambda: self.alive() and watchdog.check() is None
+        result = spool.wait_for_result(self.spool_dir, task_id, timeout=timeout, alive=alive)
+        if result is None:
+            if on_abandon is not None:
+                on_abandon()
+            self.release(task_id, release_timeout)
+        return result
+
+    def release(self, task_id, timeout=300, poll_interval=1.0):
+        """
+        Make sure no server works on a task any more. A waiting task is
+        withdrawn; a server still holding it gets timeout seconds to finish,
+        then it is killed and restarted.
+        """
+        deadline = time.time() + timeout
+        while not spool.cancel(self.spool_dir, task_id):
+            if time.time() > deadline:
+                owner = spool.claims(self.spool_dir).get(task_id)
+                print(f"CAE server {owner or '?'} still holds task {task_id}, restarting it")
+                if owner is not None and owner.startswith('cae_server_'):
+                    self.restart(int(owner[len('cae_server_'):]))
+                spool.cancel(self.spool_dir, task_id, force=True)
+                return
+            time.sleep(poll_interval)
+
+    def restart(self, n):
+        """Kill server n (1-based) and start a new one in its place."""
+        process = self.processes[n - 1]
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        self._logs[n - 1].close()
+        self.processes[n - 1], self._logs[n - 1] = self._start_server(n)
+
+    def stop(self, timeout=300):
+        """Ask the servers to stop once idle and wait for them to exit."""
+        spool.request_stop(self.spool_dir)
+        for p in self.processes:
+            try:
+                p.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                print(f"CAE server {p.pid} did not stop, terminating it")
+                p.terminate()
+        for log in self._logs:
+            log.close()
+
+
+def submit_point(spool_dir, overlap, adhesive, film_thickness, cores, joint_type, options=None):
+    """Put a design point into the spool and return its task id."""
+    task = {
+        'overlap': overlap,
+        'adhesive': adhesive,
+        'film_thickness': film_thickness,
+        'cores': cores,
+        'joint_type': joint_type,
+        'options': dict(options or {}),
+    }
+    return spool.submit(str(spool_dir), task)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) == 2 and argv[1] == '--stop':
+        spool.request_stop(argv[0])
+        print(f"Stop requested for spool {argv[0]}")
+        return 0
+
+    if len(argv) < 6:
+        print("Usage: python cae_client.py <spool_dir> overlap adhesive film_thickness cores joint_type [name=value ...]")
+        print("       python cae_client.py <spool_dir> --stop")
+        return 1
+
+    spool_dir, overlap, adhesive, film_thickness, cores, joint_type = argv[:6]
+    options = dict(arg.split('=', 1) for arg in argv[6:])
+    task_id = submit_point(spool_dir, float(overlap), adhesive, float(film_thickness),
+                           int(cores), joint_type, options)
+    print(f"Submitted task {task_id}, waiting for result...")
+    result = spool.wait_for_result(spool_dir, task_id)
+    print(f"Result: {result}")
+    return 0 if result and result.get('success') else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
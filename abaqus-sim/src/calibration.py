@@ -0,0 +1,322 @@
+"""
+Mass-scaling and step-time calibration of the quasi-static tensile step.
+
+Both joint builders solve the tensile test with Abaqus/Explicit: a 1.0 s
+step with semi-automatic mass scaling to a 1e-05 s target increment and a
+SmoothStep amplitude over the step. The cost of a run scales with
+step_time / target increment, but a shorter step or a larger target adds
+inertia to what should be a quasi-static test. The calibration runs a
+reference design point under a reduced sweep of
+
+    mass_scaling_targets   target time increment of the mass scaling
+    step_times             duration of the tensile step (the SmoothStep
+                           amplitude is stretched with it)
+
+and compares every run with the reference run (smallest target, longest
+step time):
+
+    KE/IE          largest ALLKE/ALLIE ratio of the whole model (H-Output-1)
+    RF1 deviation  relative difference of the peak RF1 to the reference
+
+After the reference, the candidates run from the cheapest up and the sweep
+stops at the first one within ke_ie_limit and rf1_tolerance (--full runs
+all of them). All runs are written to results/calibration.csv and the
+cheapest admissible settings per joint type to results/calibration.json.
+With use_calibration = true in the [calibration] section of config.ini,
+run_batch.py runs every job of a calibrated joint type with them.
+
+Usage (from the abaqus-sim directory):
+    python src/calibration.py
+    python src/calibration.py --joint-types SEP --targets 1e-05 2e-05 --step-times 0.5 1
+    python src/calibration.py --dry-run      # list the candidates only
+"""
+
+import argparse
+import csv
+import json
+import shutil
+import sys
+import time
+from pathlib import Path
+
+RESULTS_HEADER = ['Joint_type', 'Mass_scaling_target', 'Step_time', 'Increments', 'Reference',
+                  'Completed', 'Wall_s', 'Max_RF1', 'RF1_deviation', 'KE_IE_ratio',
+                  'Within_tolerance', 'Notes']
+
+
+class Candidate:
+    """One mass-scaling target and step time of a calibration run."""
+
+    def __init__(self, joint_type, mass_scaling_target, step_time):
+        self.joint_type = joint_type
+        self.mass_scaling_target = mass_scaling_target
+        self.step_time = step_time
+
+    @property
+    def increments(self):
+        """Solver increments of the step; the cost of a run is proportional to them."""
+        return self.step_time / self.mass_scaling_target
+
+    @property
+    def label(self):
+        return (f"{self.joint_type} target {self.mass_scaling_target:g} s, step time {self.step_time:g} s "
+                f"(~{self.increments:.0f} increments)")
+
+    @property
+    def key(self):
+        return f"t{self.mass_scaling_target:g}_s{self.step_time:g}"
+
+    def options(self):
+        """run_simulations.py options of the candidate."""
+        return {'mass_scaling_target': self.mass_scaling_target, 'step_time': self.step_time}
+
+
+def candidates(joint_type, targets, step_times):
+    """
+    Return (reference, others): the most expensive combination (smallest
+    target, longest step time) and the remaining ones, cheapest first.
+    """
+    result = sorted((Candidate(joint_type, target, step_time)
+                     for target in sorted(set(targets)) for step_time in sorted(set(step_times))),
+                    key=lambda candidate: candidate.increments)
+    return result[-1], result[:-1]
+
+
+def evaluate(result, reference_rf1, ke_ie_limit, rf1_tolerance):
+    """
+    Compare a run with the reference. result is a dict with max_rf1 and
+    ke_ie_ratio (either may be None). Returns (rf1_deviation, within, notes).
+    """
+    notes = []
+    deviation = None
+    if result.get('max_rf1') is None:
+        notes.append('no RF1 result')
+    elif reference_rf1:
+        deviation = abs(result['max_rf1'] - reference_rf1) / reference_rf1
+        if deviation > rf1_tolerance:
+            notes.append(f"RF1 {deviation * 100:.1f}% off the reference")
+    ke_ie_ratio = result.get('ke_ie_ratio')
+    if ke_ie_ratio is None:
+        notes.append('no ALLKE/ALLIE history')
+    elif ke_ie_ratio > ke_ie_limit:
+        notes.append(f"ALLKE/ALLIE {ke_ie_ratio * 100:.1f}% above {ke_ie_limit * 100:g}%")
+    return deviation, not notes, '; '.join(notes)
+
+
+def result_row(candidate, result, deviation, within, notes, reference=False):
+    """Row of the calibration table with the RESULTS_HEADER keys."""
+    return {
+        'Joint_type': candidate.joint_type,
+        'Mass_scaling_target': f"{candidate.mass_scaling_target:g}",
+        'Step_time': f"{candidate.step_time:g}",
+        'Increments': int(round(candidate.increments)),
+        'Reference': int(reference),
+        'Completed': int(result['completed']),
+        'Wall_s': round(result['wall'], 1),
+        'Max_RF1': '' if result.get('max_rf1') is None else round(result['max_rf1'], 3),
+        'RF1_deviation': '' if deviation is None else round(deviation, 5),
+        'KE_IE_ratio': '' if result.get('ke_ie_ratio') is None else round(result['ke_ie_ratio'], 5),
+        'Within_tolerance': int(within),
+        'Notes': notes,
+    }
+
+
+def calibrate(reference, others, run_candidate, ke_ie_limit, rf1_tolerance, full=False, on_row=None):
+    """
+    Run the reference and then the other candidates, cheapest first.
+
+    run_candidate(candidate) runs one candidate and returns a dict with
+    completed, wall, max_rf1 and ke_ie_ratio. on_row(row) is called after
+    every run. Returns (rows, chosen), where chosen is the cheapest
+    candidate within tolerance with its row, or None.
+    """
+    rows = []
+    result = run_candidate(reference)
+    reference_rf1 = result.get('max_rf1') if result['completed'] else None
+    _, within, notes = evaluate(result, reference_rf1, ke_ie_limit, rf1_tolerance)
+    if not result['completed']:
+        within, notes = False, 'reference run failed'
+    rows.append(result_row(reference, result, 0.0 if reference_rf1 else None, within, notes, reference=True))
+    if on_row is not None:
+        on_row(rows[-1])
+    if reference_rf1 is None:
+        return rows, None
+    chosen = (reference, rows[-1]) if within else None
+
+    for candidate in others:
+        result = run_candidate(candidate)
+        deviation, within, notes = evaluate(result, reference_rf1, ke_ie_limit, rf1_tolerance)
+        if not result['completed']:
+            within, notes = False, 'run failed'
+        rows.append(result_row(candidate, result, deviation, within, notes))
+        if on_row is not None:
+            on_row(rows[-1])
+        if within and (chosen is None or candidate.increments < chosen[0].increments):
+            chosen = (candidate, rows[-1])
+            if not full:
+                break
+    return rows, chosen
+
+
+def write_results(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULTS_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_calibration(path, calibration):
+    """Merge the calibration into path, keeping the entries of other joint types."""
+    path = Path(path)
+    existing = json.loads(path.read_text()) if path.exists() else {}
+    existing.update(calibration)
+    path.write_text(json.dumps(existing, indent=2))
+
+
+def load_calibration(path, joint_type):
+    """Calibrated settings of a joint type from calibration.json, or None."""
+    try:
+        return json.loads(Path(path).read_text()).get(joint_type)
+    except (OSError, ValueError):
+        return None
+
+
+def calibrated_options(entry):
+    """run_simulations.py options of a calibration.json entry."""
+    return {'mass_scaling_target': float(entry['mass_scaling_target']),
+            'step_time': float(entry['step_time'])}
+
+
+def _float_list(text):
+    return [float(v) for v in text.split(',') if v.strip()]
+
+
+def main(argv=None):
+    from run_batch import (find_project_root, load_config, read_config, read_scheduler_config,
+                           read_workspace_config, run_abaqus_simulation)
+    from extraction import extract_odb_result
+    from job_ledger import JOB_DONE
+    from naming import job_name
+    from scheduler import plan_job_resources
+
+    project_root = find_project_root()
+    config = load_config(project_root)
+    joint_type, adhesive, total_cores, abaqus_cmd = read_config(project_root)
+    _, _, memory_percent = read_scheduler_config(project_root)
+
+    parser = argparse.ArgumentParser(
+        description="Find the cheapest mass scaling and step time that keep the tensile step quasi-static.")
+    joint_types = config.get('calibration', 'joint_types', fallback='').replace(',', ' ').split()
+    parser.add_argument('--joint-types', nargs='+', choices=('SAP', 'SEP'), default=joint_types or [joint_type],
+                        help="joint types to calibrate (default: [calibration] joint_types)")
+    parser.add_argument('--targets', nargs='+', type=float,
+                        default=_float_list(config.get('calibration', 'mass_scaling_targets',
+                                                       fallback='5e-06, 1e-05, 2e-05')),
+                        help="mass-scaling target increments to try (default: [calibration] mass_scaling_targets)")
+    parser.add_argument('--step-times', nargs='+', type=float,
+                        default=_float_list(config.get('calibration', 'step_times', fallback='0.5, 1.0')),
+                        help="step times to try (default: [calibration] step_times)")
+    parser.add_argument('--ke-ie-limit', type=float,
+                        default=config.getfloat('calibration', 'ke_ie_limit', fallback=0.05))
+    parser.add_argument('--rf1-tolerance', type=float,
+                        default=config.getfloat('calibration', 'rf1_tolerance', fallback=0.02))
+    parser.add_argument('--overlap', type=float,
+                        default=config.getfloat('calibration', 'overlap', fallback=30.0))
+    parser.add_argument('--film-thickness', type=float,
+                        default=config.getfloat('calibration', 'film_thickness', fallback=0.2))
+    parser.add_argument('--full', action='store_true',
+                        help="run every candidate instead of stopping at the cheapest admissible one")
+    parser.add_argument('--dry-run', action='store_true', help="list the candidates and exit")
+    args = parser.parse_args(argv)
+
+    if not args.targets or not args.step_times or min(args.targets + args.step_times) <= 0:
+        print("ERROR: Mass-scaling targets and step times must be positive")
+        return 1
+    sweeps = {jt: candidates(jt, args.targets, args.step_times) for jt in args.joint_types}
+    print(f"Calibration on {total_cores} cores, point: {args.overlap} mm overlap, "
+          f"{args.film_thickness} mm {adhesive}")
+    print(f"Limits: ALLKE/ALLIE <= {args.ke_ie_limit * 100:g}%, "
+          f"RF1 within {args.rf1_tolerance * 100:g}% of the reference")
+    for reference, others in sweeps.values():
+        print(f"  {reference.label} (reference)")
+        for candidate in others:
+            print(f"  {candidate.label}")
+    if args.dry_run:
+        return 0
+
+    work_root, scratch, _ = read_workspace_config(project_root)
+    results_dir = project_root / 'results'
+    log_dir = results_dir / 'logs' / 'calibration'
+    _, memory = plan_job_resources(total_cores, memory_percent, 1, total_cores)
+
+    def run_candidate(candidate):
+        name = job_name(candidate.joint_type, args.overlap, args.film_thickness, adhesive)
+        work_dir = work_root / 'calibration' / f"{name}_{candidate.key}"
+        shutil.rmtree(work_dir, ignore_errors=True)
+        # The energy profile has the ALLKE/ALLIE history without the field output
+        options = dict(candidate.options(), memory=memory, work_dir=str(work_dir), save_cae=0,
+                       output_profile='energy')
+        if scratch:
+            options['scratch'] = scratch
+        print(f"\n{candidate.label}")
+        start = time.time()
+        state = run_abaqus_simulation(args.overlap, adhesive, args.film_thickness, total_cores,
+                                      candidate.joint_type, project_root, abaqus_cmd, options=options,
+                                      log_path=log_dir / f"{name}_{candidate.key}.log")
+        wall = time.time() - start
+        extracted = None
+        if state == JOB_DONE:
+            extracted = extract_odb_result(work_dir / f"{name}.odb", abaqus_cmd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        return {'completed': extracted is not None, 'wall': wall,
+                'max_rf1': extracted['max_rf1'] if extracted else None,
+                'ke_ie_ratio': extracted['ke_ie_ratio'] if extracted else None}
+
+    rows = []
+    csv_path = results_dir / 'calibration.csv'
+
+    def on_row(row):
+        rows.append(row)
+        write_results(csv_path, rows)
+        print(f"  RF1 {row['Max_RF1'] or 'n/a'}, deviation {row['RF1_deviation'] or 'n/a'}, "
+              f"ALLKE/ALLIE {row['KE_IE_ratio'] or 'n/a'}: "
+              f"{'within tolerance' if row['Within_tolerance'] else row['Notes']}")
+
+    calibration = {}
+    for jt, (reference, others) in sweeps.items():
+        _, chosen = calibrate(reference, others, run_candidate, args.ke_ie_limit, args.rf1_tolerance,
+                              full=args.full, on_row=on_row)
+        if chosen is not None:
+            candidate, row = chosen
+            calibration[jt] = {
+                'mass_scaling_target': candidate.mass_scaling_target,
+                'step_time': candidate.step_time,
+                'increments': int(round(candidate.increments)),
+                'speedup': round(reference.increments / candidate.increments, 3),
+                'rf1_deviation': row['RF1_deviation'] or 0.0,
+                'ke_ie_ratio': row['KE_IE_ratio'] or None,
+                'overlap': args.overlap,
+                'film_thickness': args.film_thickness,
+            }
+
+    json_path = results_dir / 'calibration.json'
+    write_calibration(json_path, calibration)
+
+    print("\n" + "=" * 60)
+    print("CALIBRATED STEP SETTINGS")
+    print("=" * 60)
+    for jt, best in calibration.items():
+        print(f"{jt}: mass-scaling target {best['mass_scaling_target']:g} s, step time {best['step_time']:g} s, "
+              f"{best['speedup']:g}x fewer increments than the reference")
+    for jt in args.joint_types:
+        if jt not in calibration:
+            print(f"{jt}: no setting within tolerance, not even the reference; "
+                  f"try a smaller target or a longer step")
+    print(f"Results: {csv_path}")
+    print(f"Calibration: {json_path} (used by run_batch.py with use_calibration = true)")
+    print("=" * 60)
+    return 0 if len(calibration) == len(args.joint_types) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
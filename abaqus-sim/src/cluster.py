@@ -0,0 +1,297 @@
+"""
+Batch campaigns as Slurm or PBS array jobs (run_batch.py --cluster).
+
+The points of a batch are written to a manifest (JSON, keyed by their row
+in sim_params.csv) and submitted as one array job with one array task per
+row. Each array task runs
+
+    python src/cluster.py <manifest> <row>
+
+which runs that single point like a distributed worker (worker.py) and
+writes its result to <manifest dir>/results/<row>.json. run_batch.py polls
+the scheduler for the state of the array tasks and records each result as
+soon as its file appears. A task that leaves the queue without a result
+counts as failed; its output is in results/logs/array_<job>_<row>.log.
+
+The submit and status commands are configurable, so a campaign can be
+tested with small sbatch/squeue (or qsub/qstat) stand-ins.
+"""
+
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from scheduler import BatchStats
+
+
+class SlurmArray:
+    """Array jobs with sbatch/squeue."""
+
+    name = 'slurm'
+    submit_command = 'sbatch'
+    status_command = 'squeue'
+    index_variable = 'SLURM_ARRAY_TASK_ID'
+
+    def directives(self, rows, cores, log_dir, settings):
+        array = ','.join(str(row) for row in rows)
+        if settings.get('max_parallel'):
+            array += f"%{settings['max_parallel']}"
+        lines = [
+            f"#SBATCH --job-name={settings.get('job_name', 'abaqus_batch')}",
+            f"#SBATCH --array={array}",
+            "#SBATCH --ntasks=1",
+            f"#SBATCH --cpus-per-task={cores}",
+            f"#SBATCH --output={log_dir}/array_%A_%a.log",
+        ]
+        if settings.get('time_limit'):
+            lines.append(f"#SBATCH --time={settings['time_limit']}")
+        if settings.get('partition'):
+            lines.append(f"#SBATCH --partition={settings['partition']}")
+        if settings.get('account'):
+            lines.append(f"#SBATCH --account={settings['account']}")
+        return lines
+
+    def submit_args(self, script_path):
+        return ['--parsable', str(script_path)]
+
+    def parse_job_id(self, output):
+        # --parsable prints "<job id>" or "<job id>;<cluster>"
+        return output.strip().split(';')[0]
+
+    def status_args(self, job_id):
+        return ['-h', '-r', '-j', job_id, '-o', '%i %T']
+
+    def parse_status(self, output, job_id):
+        """Return {row: state} of the array tasks still known to the scheduler."""
+        states = {}
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            match = re.match(rf'{re.escape(job_id)}_(\d+)$', parts[0])
+            if match:
+                states[int(match.group(1))] = parts[1]
+        return states
+
+    def is_running(self, state):
+        return state in ('RUNNING', 'COMPLETING')
+
+
+class PbsArray:
+    """Array jobs with qsub/qstat (PBS Pro)."""
+
+    name = 'pbs'
+    submit_command = 'qsub'
+    status_command = 'qstat'
+    index_variable = 'PBS_ARRAY_INDEX'
+
+    def directives(self, rows, cores, log_dir, settings):
+        # PBS arrays are ranges; rows inside the range that are not in the
+        # manifest exit right away
+        array = f"{min(rows)}-{max(rows)}" if len(rows) > 1 else f"{rows[0]}-{rows[0] + 1}"
+        if settings.get('max_parallel'):
+            array += f"%{settings['max_parallel']}"
+        lines = [
+            f"#PBS -N {settings.get('job_name', 'abaqus_batch')}",
+            f"#PBS -J {array}",
+            f"#PBS -l select=1:ncpus={cores}",
+            f"#PBS -o {log_dir}",
+            "#PBS -j oe",
+        ]
+        if settings.get('time_limit'):
+            lines.append(f"#PBS -l walltime={settings['time_limit']}")
+        if settings.get('partition'):
+            lines.append(f"#PBS -q {settings['partition']}")
+        if settings.get('account'):
+            lines.append(f"#PBS -A {settings['account']}")
+        return lines
+
+    def submit_args(self, script_path):
+        return [str(script_path)]
+
+    def parse_job_id(self, output):
+        # qsub prints "<number>[].<server>"
+        return output.strip().split('[')[0].split('.')[0]
+
+    def status_args(self, job_id):
+        return ['-t', f"{job_id}[]"]
+
+    def parse_status(self, output, job_id):
+        states = {}
+        for line in output.splitlines():
+            match = re.match(rf'{re.escape(job_id)}\[(\d+)\]\S*\s+\S+\s+\S+\s+\S+\s+(\w)\b', line)
+            if match:
+                states[int(match.group(1))] = match.group(2)
+        return states
+
+    def is_running(self, state):
+        return state in ('R', 'E')
+
+
+SCHEDULERS = {'slurm': SlurmArray, 'pbs': PbsArray}
+
+
+def write_manifest(path, tasks):
+    """Write {row: task} to a manifest file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({str(row): task for row, task in tasks.items()}, indent=1))
+
+
+def result_path(manifest_path, row):
+    return Path(manifest_path).parent / 'results' / f"{row}.json"
+
+
+def write_array_script(path, scheduler, manifest_path, rows, cores, project_root, log_dir,
+                       settings, python_cmd='python'):
+    """Write the batch script of an array job with one task per manifest row."""
+    run_script = Path(project_root) / 'src' / 'cluster.py'
+    lines = ['#!/bin/bash']
+    lines += scheduler.directives(rows, cores, log_dir, settings)
+    lines += [
+        '',
+        f'cd "{project_root}"',
+        f'{python_cmd} "{run_script}" "{manifest_path}" "${scheduler.index_variable}"',
+        '',
+    ]
+    Path(path).write_text('\n'.join(lines))
+
+
+class ArrayJobRunner:
+    """Submit scheduled jobs as one array job and collect their results."""
+
+    def __init__(self, scheduler, work_dir, project_root, settings=None, submit_command=None,
+                 status_command=None, python_cmd='python', poll_interval=30.0):
+        self.scheduler = scheduler
+        self.work_dir = Path(work_dir)
+        self.project_root = Path(project_root)
+        self.settings = settings or {}
+        self.submit_command = submit_command or scheduler.submit_command
+        self.status_command = status_command or scheduler.status_command
+        self.python_cmd = python_cmd
+        self.poll_interval = poll_interval
+        self.job_id = None
+
+    def submit(self, jobs, task_for):
+        """Write manifest and script and submit the array. Returns {row: job}."""
+        by_row = {job.payload['index']: job for job in jobs}
+        manifest_path = self.work_dir / 'manifest.json'
+        write_manifest(manifest_path, {row: task_for(job) for row, job in by_row.items()})
+        (self.work_dir / 'results').mkdir(exist_ok=True)
+
+        log_dir = self.project_root / 'results' / 'logs'
+        log_dir.mkdir(parents=True, exist_ok=True)
+        script_path = self.work_dir / 'array_job.sh'
+        cores = max(job.cores for job in jobs)
+        write_array_script(script_path, self.scheduler, manifest_path, sorted(by_row), cores,
+                           self.project_root, log_dir, self.settings, self.python_cmd)
+
+        cmd = [self.submit_command] + self.scheduler.submit_args(script_path)
+        result = subprocess.run(cmd, cwd=str(self.work_dir), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{' '.join(cmd)} failed: {result.stdout}{result.stderr}".strip())
+        self.job_id = self.scheduler.parse_job_id(result.stdout)
+        print(f"Submitted {len(by_row)} array task(s) as {self.scheduler.name} job {self.job_id}")
+        return by_row
+
+    def task_states(self):
+        """Return {row: state} from the scheduler, or None if the query failed."""
+        cmd = [self.status_command] + self.scheduler.status_args(self.job_id)
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"Warning: {self.status_command} failed: {e}")
+            return None
+        if result.returncode != 0 and not re.search(r'(?i)invalid job id|unknown job id', result.stderr):
+            print(f"Warning: {self.status_command} failed: {result.stderr.strip()}")
+            return None
+        # squeue/qstat report an unknown id once the whole array has left the queue
+        return self.scheduler.parse_status(result.stdout, self.job_id)
+
+    def run(self, jobs, task_for, on_result, on_claim=None):
+        """
+        Run all jobs as array tasks. Same callbacks as Coordinator.run().
+
+        Returns BatchStats for the jobs.
+        """
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        start_time = time.time()
+        if not jobs:
+            return BatchStats(jobs, 0, start_time, start_time)
+        pending = self.submit(jobs, task_for)
+        manifest_path = self.work_dir / 'manifest.json'
+        started = set()
+        missing = {}
+
+        while pending:
+            states = self.task_states()
+            for row, job in list(pending.items()):
+                path = result_path(manifest_path, row)
+                if path.exists():
+                    result = json.loads(path.read_text())
+                elif states is None:
+                    continue
+                elif row in states:
+                    missing.pop(row, None)
+                    if row not in started and self.scheduler.is_running(states[row]):
+                        started.add(row)
+                        if on_claim is not None:
+                            on_claim(job, f"{self.scheduler.name} {self.job_id}_{row}")
+                    continue
+                else:
+                    # Gone from the queue; give the result file one more poll to appear
+                    missing[row] = missing.get(row, 0) + 1
+                    if missing[row] < 2:
+                        continue
+                    result = {'success': False, 'worker': f"{self.scheduler.name} {self.job_id}_{row}",
+                              'error': 'array task ended without a result'}
+
+                del pending[row]
+                job.start_time = result.get('started', start_time)
+                job.end_time = result.get('finished', time.time())
+                job.success = bool(on_result(job, result))
+
+            if pending:
+                time.sleep(self.poll_interval)
+
+        return BatchStats(jobs, 0, start_time, time.time())
+
+
+def run_array_task(manifest_path, row):
+    """Run the point of one array task and write its result file."""
+    from run_batch import find_project_root, read_config
+    from worker import Worker
+
+    tasks = json.loads(Path(manifest_path).read_text())
+    if str(row) not in tasks:
+        print(f"Row {row} is not part of this batch, nothing to do")
+        return 0
+
+    project_root = find_project_root()
+    _, _, _, abaqus_cmd = read_config(project_root)
+    worker_id = f"{socket.gethostname()}-{os.environ.get('SLURM_JOB_ID') or os.environ.get('PBS_JOBID') or os.getpid()}"
+    worker = Worker(None, project_root, worker_id, abaqus_cmd)
+    result = worker.handle(tasks[str(row)])
+
+    path = result_path(manifest_path, row)
+    tmp_path = path.with_suffix('.tmp')
+    tmp_path.write_text(json.dumps(result))
+    os.replace(tmp_path, path)
+    return 0 if result['success'] else 1
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2 or not argv[1].isdigit():
+        print("Usage: python cluster.py <manifest.json> <row>")
+        return 1
+    return run_array_task(argv[0], int(argv[1]))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Benchmark of the restricted general contact against all-inclusive contact.
+
+By default the builders include every exterior face in general contact
+(useAllstar). With restricted = true in the [contact] section of
+config.ini, the contact domain is limited to the faces around the overlap
+(contact_domain.py). The benchmark runs a representative design point with
+both contact definitions per joint type and compares
+
+    CPU per increment   CPU time / increments; the difference between both
+                        runs is the contact search saved per increment
+    wall time           and the speedup of the restricted run
+    RF1 deviation       relative difference of the peak RF1 of the
+                        restricted run to the all-inclusive run
+
+The runs use the campaign's model settings (run_batch.campaign_model_options)
+apart from the contact definition; both are built with overlap_partitions,
+so they share the mesh of the restricted run. All runs are written to
+results/contact_benchmark.csv; the exit code is 1 if the RF1 deviation
+exceeds rf1_tolerance or a run fails.
+
+Usage (from the abaqus-sim directory):
+    python src/contact_benchmark.py
+    python src/contact_benchmark.py --joint-types SAP --margin 5
+"""
+
+import argparse
+import sys
+
+from ab_check import compare_runs, print_summary, run_checks, run_point
+from contact_domain import DEFAULT_MARGIN
+
+RESULTS_HEADER = ['Joint_type', 'Contact', 'Completed', 'Wall_s', 'CPU_s', 'Increments', 'CPU_ms_per_increment',
+                  'Max_RF1', 'RF1_deviation', 'Search_saving_percent', 'Speedup', 'Within_tolerance']
+
+
+def cpu_per_increment(result):
+    """CPU milliseconds per increment of a run, or None."""
+    if result.get('cpu') is None or not result.get('increments'):
+        return None
+    return 1000.0 * result['cpu'] / result['increments']
+
+
+def cost_columns(result):
+    per_increment = cpu_per_increment(result)
+    return {
+        'CPU_s': '' if result.get('cpu') is None else round(result['cpu'], 1),
+        'Increments': result.get('increments') or '',
+        'CPU_ms_per_increment': '' if per_increment is None else round(per_increment, 4),
+    }
+
+
+def search_saving(full, restricted):
+    full_cost, restricted_cost = cpu_per_increment(full), cpu_per_increment(restricted)
+    if not full_cost or restricted_cost is None:
+        return {}
+    return {'Search_saving_percent': round(100.0 * (full_cost - restricted_cost) / full_cost, 1)}
+
+
+def compare(joint_type, full, restricted, tolerance):
+    """
+    Rows of the all-inclusive and the restricted run of a joint type (see
+    ab_check.compare_runs).
+    """
+    return compare_runs(joint_type, 'Contact', ('all', 'restricted'), full, restricted, tolerance,
+                        cost_columns, search_saving)
+
+
+def describe(full_row, restricted_row):
+    return (f"CPU per increment {restricted_row['CPU_ms_per_increment'] or 'n/a'} vs "
+            f"{full_row['CPU_ms_per_increment'] or 'n/a'} ms "
+            f"({restricted_row.get('Search_saving_percent') or 'n/a'}% saved)")
+
+
+def main(argv=None):
+    from run_batch import (campaign_model_options, find_project_root, load_config, read_config,
+                           read_contact_config, read_scheduler_config, read_workspace_config)
+    from naming import job_name
+    from scheduler import plan_job_resources
+
+    project_root = find_project_root()
+    config = load_config(project_root)
+    joint_type, adhesive, total_cores, abaqus_cmd = read_config(project_root)
+    _, _, memory_percent = read_scheduler_config(project_root)
+    _, margin = read_contact_config(project_root)
+
+    parser = argparse.ArgumentParser(
+        description="Compare restricted and all-inclusive general contact on a design point.")
+    parser.add_argument('--joint-types', nargs='+', choices=('SAP', 'SEP'), default=['SAP', 'SEP'],
+                        help="joint types to benchmark (default: both)")
+    parser.add_argument('--margin', type=float, default=margin,
+                        help=f"margin of the contact domain in mm (default: [contact] margin, {DEFAULT_MARGIN:g})")
+    parser.add_argument('--tolerance', type=float,
+                        default=config.getfloat('contact', 'rf1_tolerance', fallback=0.01),
+                        help="largest relative RF1 deviation (default: [contact] rf1_tolerance)")
+    parser.add_argument('--overlap', type=float, default=30.0)
+    parser.add_argument('--film-thickness', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    if args.margin < 0:
+        print("ERROR: The contact margin must not be negative")
+        return 1
+    try:
+        model_options = {jt: campaign_model_options(project_root, jt) for jt in args.joint_types}
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    print(f"Contact benchmark on {total_cores} cores, point: {args.overlap} mm overlap, "
+          f"{args.film_thickness} mm {adhesive}, margin {args.margin:g} mm, "
+          f"RF1 within {args.tolerance * 100:g}% of all-inclusive contact")
+
+    work_root, scratch, _ = read_workspace_config(project_root)
+    results_dir = project_root / 'results'
+    log_dir = results_dir / 'logs' / 'contact_benchmark'
+    _, memory = plan_job_resources(total_cores, memory_percent, 1, total_cores)
+
+    def run_contact(jt, restricted):
+        name = job_name(jt, args.overlap, args.film_thickness, adhesive)
+        contact = 'restricted' if restricted else 'all'
+        options = dict(model_options[jt], memory=memory, save_cae=0, output_profile='minimal')
+        options.pop('contact_margin', None)
+        # Both runs get the overlap partitions of the restricted run, so they mesh alike
+        options.update(restricted_contact=int(restricted), overlap_partitions=1)
+        if restricted:
+            options['contact_margin'] = args.margin
+        if scratch:
+            options['scratch'] = scratch
+        print(f"\n{jt} with {contact} contact")
+        return run_point(jt, args.overlap, args.film_thickness, adhesive, total_cores, project_root,
+                         abaqus_cmd, options, work_root / 'contact_benchmark' / f"{name}_{contact}",
+                         log_dir / f"{name}_{contact}.log")
+
+    csv_path = results_dir / 'contact_benchmark.csv'
+    rows = run_checks(args.joint_types, run_contact,
+                      lambda jt, full, restricted: compare(jt, full, restricted, args.tolerance),
+                      csv_path, RESULTS_HEADER)
+    return 0 if print_summary("RESTRICTED CONTACT", rows, describe, csv_path) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+"""
+Restricted general contact of the joint models.
+
+Both builders define general contact with useAllstar=ON, so Abaqus/Explicit
+searches every exterior face of every instance for contact in every
+increment, while only the bonded surfaces (Klebeflaeche) and the faces
+right at the ends of the overlap can touch. With restricted_contact, the
+contact domain is limited to the exterior faces that lie entirely within
+the overlap widened by contact_margin (mm) at both ends:
+
+    SAP   adherend faces under the strap, butt faces at x = L, the strap
+    SEP   step faces of both adherends and the faces bounding the steps
+
+The overlap is bounded by partitions, so its faces are separate from the
+free length. A margin that reaches the next partition (the clamps) adds
+the whole faces in between. The property assignments stay the same: the
+cohesive pair inside the domain, 'General' for any other contact in it.
+
+contact_faces() and restrict_general_contact() run inside Abaqus/CAE.
+"""
+
+# Tolerance for comparing vertex coordinates (mm)
+_TOLERANCE = 1e-6
+
+DEFAULT_MARGIN = 1.0
+
+
+def contact_faces(instance, x_min, x_max):
+    """
+    Exterior faces of an instance whose vertices all lie within x_min <= x
+    <= x_max. Partition faces between two cells (plies, overlap bounds) are
+    skipped.
+    """
+    faces = None
+    for face in instance.faces:
+        if len(face.getCells()) != 1:
+            continue
+        xs = [instance.vertices[i].pointOn[0][0] for i in face.getVertices()]
+        if min(xs) >= x_min - _TOLERANCE and max(xs) <= x_max + _TOLERANCE:
+            sequence = instance.faces[face.index:face.index + 1]
+            faces = sequence if faces is None else faces + sequence
+    return faces
+
+
+def restrict_general_contact(model, assembly, instances, overlap_start, overlap_end, margin=DEFAULT_MARGIN,
+                             interaction='Int-1', name='Kontaktbereich'):
+    """
+    Limit the general contact `interaction` to the faces of the instances
+    within [overlap_start - margin, overlap_end + margin]. Call instead of
+    includedPairs with useAllstar=ON. Creates the surface `name` and returns
+    the number of its faces.
+    """
+    from abaqusConstants import OFF, SELF
+
+    faces = None
+    for instance in instances:
+        found = contact_faces(instance, overlap_start - margin, overlap_end + margin)
+        if found is not None:
+            faces = found if faces is None else faces + found
+    if faces is None:
+        raise ValueError(f"No faces within {margin} mm of the overlap [{overlap_start}, {overlap_end}]")
+    surface = assembly.Surface(side1Faces=faces, name=name)
+    model.interactions[interaction].includedPairs.setValuesInStep(
+        stepName='Initial', useAllstar=OFF, addPairs=((surface, SELF), ))
+    return len(faces)
@@ -0,0 +1,208 @@
+"""
+Coordinator of distributed batches (run_batch.py --distributed).
+
+The coordinator submits every design point of a batch to a directory spool
+on a shared file system and waits for the workers (worker.py, one or more
+per solver node) to report the results. On every poll it puts points back
+into the queue whose worker has stopped sending heartbeats, so a node that
+crashes or is switched off mid-job does not lose its point. A point that
+has been requeued max_requeues times fails instead (it likely kills its
+workers), and the batch fails if no worker sends a heartbeat within
+startup_timeout seconds. When the batch ends, the workers are asked to
+stop.
+
+RemoteBatch holds what run_batch.py needs to hand a batch to remote
+workers and record what they report. It serves both the coordinator and
+the cluster array runner (cluster.py), so the remote modes share nothing
+with the local job loop of run_batch.py.
+
+Usage (from run_batch.py):
+    batch = RemoteBatch(ledger, results_dir, run_options, record_result, total=20)
+    coordinator = Coordinator(spool_dir, heartbeat_timeout=300, max_requeues=2, startup_timeout=600)
+    stats = coordinator.run(jobs, batch.task, batch.on_result, on_claim=batch.on_claim)
+"""
+
+import time
+
+import spool
+from job_ledger import JOB_DONE, JOB_FAILED
+from scheduler import BatchStats
+from solver_metrics import collect_metrics, metrics_row, record_metrics
+
+
+class RemoteBatch:
+    """
+    Tasks and result bookkeeping of a batch run by remote workers.
+
+    record_result(name, point, max_rf1, region) appends a completed point
+    to the results table; cache, if given, stores the results under the
+    cache_key of each point.
+    """
+
+    def __init__(self, ledger, results_dir, run_options, record_result, total, cache=None,
+                 post_peak_drop=0.0, termination_poll=60.0):
+        self.ledger = ledger
+        self.results_dir = results_dir
+        self.metrics_file = results_dir / 'solver_metrics.csv'
+        self.run_options = dict(run_options)
+        self.record_result = record_result
+        self.total = total
+        self.cache = cache
+        self.post_peak_drop = post_peak_drop
+        self.termination_poll = termination_poll
+
+    def task(self, job):
+        """Task of a job for worker.py; work directories are chosen by the worker."""
+        point = job.payload
+        return {
+            'name': point['name'],
+            'overlap': point['overlap'],
+            'film_thickness': point['film_thickness'],
+            'adhesive': point['adhesive'],
+            'joint_type': point['joint_type'],
+            'cores': job.cores,
+            'options': dict(self.run_options, memory=job.memory),
+            'results_dir': str(self.results_dir),
+            'post_peak_drop': self.post_peak_drop,
+            'termination_poll': self.termination_poll,
+            'extract': True,
+        }
+
+    def on_claim(self, job, worker_id):
+        point = job.payload
+        print(f"\n[{point['index']}/{self.total}] {point['name']} started on worker {worker_id}")
+        self.ledger.mark_running(point['name'])
+
+    def on_result(self, job, result):
+        """Record the result a worker reported for a job. Returns True if it succeeded."""
+        point = job.payload
+        state = result.get('state') or (JOB_DONE if result.get('success') else JOB_FAILED)
+        worker = result.get('worker', 'unknown worker')
+        message = result.get('message') or result.get('error')
+        message = f"{worker}: {message}" if message else worker
+
+        if state == JOB_DONE and 'max_rf1' in result:
+            if self.cache is not None:
+                self.cache.put(point['cache_key'], point['cache_inputs'], result['max_rf1'],
+                               result['region'], result['curve'], job_name=point['name'])
+            self.record_result(point['name'], point, result['max_rf1'], result['region'])
+        record_metrics(self.metrics_file,
+                       metrics_row(point['name'], collect_metrics(self.results_dir, point['name']),
+                                   state, result.get('cores'), result.get('ke_ie_ratio')))
+        self.ledger.mark_finished(point['name'], state, message)
+
+        duration = result.get('duration', 0.0)
+        if state == JOB_DONE:
+            print(f"✓ Simulation {point['index']} completed on {worker} in {duration:.0f} s")
+        else:
+            print(f"✗ Simulation {point['index']} {state} on {worker} ({message})")
+        return state == JOB_DONE
+
+
+class Coordinator:
+    """Hand scheduled jobs to remote workers through a spool and collect their results."""
+
+    def __init__(self, spool_dir, heartbeat_timeout=300.0, poll_interval=5.0, max_requeues=2,
+                 startup_timeout=600.0):
+        self.spool_dir = str(spool_dir)
+        self.heartbeat_timeout = heartbeat_timeout
+        self.poll_interval = poll_interval
+        self.max_requeues = max_requeues
+        self.startup_timeout = startup_timeout
+
+    def _workers_since(self, start_time):
+        """True if a worker has sent a heartbeat since start_time."""
+        return any(beat.get('time', 0) >= start_time for beat in spool.workers(self.spool_dir).values())
+
+    def run(self, jobs, task_for, on_result, on_claim=None):
+        """
+        Run all jobs on the workers of the spool.
+
+        task_for(job) returns the JSON-serialisable task of a job.
+        on_result(job, result) is called with the result reported by the
+        worker and must return True if the job succeeded. on_claim(job,
+        worker_id), if given, is called when a worker takes a job.
+
+        Returns BatchStats for the jobs. Core utilisation is not known for
+        remote nodes, so it is reported as 0.
+        """
+        spool.init_spool(self.spool_dir)
+        spool.clear_stop(self.spool_dir)
+        try:
+            return self._run(jobs, task_for, on_result, on_claim)
+        finally:
+            self.stop_workers()
+
+    def _run(self, jobs, task_for, on_result, on_claim):
+        start_time = time.time()
+
+        pending = {}
+        for job in jobs:
+            pending[spool.submit(self.spool_dir, task_for(job))] = job
+        print(f"Submitted {len(pending)} job(s) to spool {self.spool_dir}")
+
+        def fail(task_id, worker, error):
+            """Withdraw a pending task and report it as failed."""
+            spool.cancel(self.spool_dir, task_id)
+            job = pending.pop(task_id)
+            job.start_time = job.end_time = time.time()
+            job.success = bool(on_result(job, {'success': False, 'worker': worker, 'error': error}))
+
+        owners = {}
+        requeues = {}
+        started = False
+        while pending:
+            for task_id, job in list(pending.items()):
+                result = spool.get_result(self.spool_dir, task_id)
+                if result is None:
+                    continue
+                del pending[task_id]
+                job.start_time = result.get('started', start_time)
+                job.end_time = result.get('finished', time.time())
+                job.success = bool(on_result(job, result))
+
+            claimed = spool.claims(self.spool_dir)
+            for task_id, worker_id in claimed.items():
+                if task_id in pending and worker_id is not None and owners.get(task_id) != worker_id:
+                    owners[task_id] = worker_id
+                    if on_claim is not None:
+                        on_claim(pending[task_id], worker_id)
+
+            for task_id, worker_id in spool.requeue_stale(self.spool_dir, self.heartbeat_timeout):
+                owners.pop(task_id, None)
+                if task_id not in pending:
+                    continue
+                requeues[task_id] = requeues.get(task_id, 0) + 1
+                if requeues[task_id] > self.max_requeues:
+                    print(f"ERROR: Worker {worker_id or '(unknown)'} stopped responding, "
+                          f"{pending[task_id].name} lost {requeues[task_id]} workers, giving up")
+                    fail(task_id, worker_id or 'unknown worker',
+                         f"lost {requeues[task_id]} workers while running the point")
+                    continue
+                print(f"WARNING: Worker {worker_id or '(unknown)'} stopped responding, "
+                      f"requeued {pending[task_id].name}")
+
+            started = started or self._workers_since(start_time)
+            if pending and not started and time.time() - start_time > self.startup_timeout:
+                print(f"ERROR: No worker sent a heartbeat within {self.startup_timeout:.0f} s")
+                for task_id in list(pending):
+                    fail(task_id, 'coordinator', f"no worker started within {self.startup_timeout:.0f} s")
+
+            if pending:
+                time.sleep(self.poll_interval)
+
+        return BatchStats(jobs, 0, start_time, time.time())
+
+    def stop_workers(self):
+        """Ask the workers to exit once the queue is empty."""
+        spool.request_stop(self.spool_dir)
+
+
+def worker_status(spool_dir, heartbeat_timeout=300.0):
+    """Return [(worker_id, host, current job, seconds since heartbeat, alive)]."""
+    now = time.time()
+    status = []
+    for worker_id, beat in sorted(spool.workers(str(spool_dir)).items()):
+        age = now - beat.get('time', 0)
+        status.append((worker_id, beat.get('host'), beat.get('job'), age, age <= heartbeat_timeout))
+    return status
@@ -0,0 +1,90 @@
+"""
+Result extraction from regular Python.
+
+Runs modeling/extract_rf1_single.py in Abaqus Python for one ODB file. The
+extraction runs in a private temporary directory, so several extractions
+can run at the same time without overwriting each other's rf1_result.txt.
+The RF1 of a half-width symmetry model is scaled to the full width (see
+mesh_grading.rf1_scale).
+"""
+
+import csv
+import subprocess
+import tempfile
+from pathlib import Path
+
+from mesh_grading import rf1_scale
+
+EXTRACT_SCRIPT = Path(__file__).resolve().parents[2] / 'modeling' / 'extract_rf1_single.py'
+
+
+def read_curve(curve_path):
+    """Read a Time,U1,RF1 curve CSV written by extract_rf1_single.py."""
+    curve = []
+    with open(curve_path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            u1 = float(row['U1']) if row['U1'] else None
+            curve.append((float(row['Time']), u1, float(row['RF1'])))
+    return curve
+
+
+def extract_odb_result(odb_path, abaqus_cmd='abaqus', timeout=300, quiet=False):
+    """
+    Extract the maximum RF1, its region and the RF1 curve from an ODB file.
+
+    Returns a dict with the keys 'max_rf1', 'region', 'curve' and
+    'ke_ie_ratio' (largest ALLKE/ALLIE ratio, None if the ODB has no energy
+    history), or None if the extraction failed. With quiet, failures are not printed (e.g. when
+    polling the ODB of a running job).
+    """
+    report = (lambda message: None) if quiet else print
+
+    with tempfile.TemporaryDirectory(prefix='rf1_') as tmp_dir:
+        tmp_dir = Path(tmp_dir)
+        curve_path = tmp_dir / 'rf1_curve.csv'
+        cmd = [abaqus_cmd, 'python', str(EXTRACT_SCRIPT), str(odb_path), str(curve_path)]
+
+        try:
+            result = subprocess.run(cmd, cwd=str(tmp_dir), capture_output=True,
+                                    text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            report(f" Timeout extracting results from {odb_path}")
+            return None
+        except OSError as e:
+            report(f" Error running extraction: {e}")
+            return None
+
+        if result.returncode != 0:
+            report(f" Error running extraction: {result.stdout}{result.stderr}")
+            return None
+
+        result_file = tmp_dir / 'rf1_result.txt'
+        if not result_file.exists():
+            report(" Result file not created")
+            return None
+
+        lines = result_file.read_text().splitlines()
+        if len(lines) < 2 or not lines[0].strip():
+            report(f" No RF1 found in {odb_path}")
+            return None
+
+        try:
+            max_rf1 = float(lines[0].strip())
+        except ValueError:
+            report(" Could not parse RF1 value from result file")
+            return None
+
+        curve = read_curve(curve_path) if curve_path.exists() else []
+        scale = rf1_scale(odb_path)
+        if scale != 1.0:
+            max_rf1 *= scale
+            curve = [(t, u1, rf1 * scale) for t, u1, rf1 in curve]
+        ke_ie_ratio = None
+        energy_file = tmp_dir / 'energy_result.txt'
+        if energy_file.exists():
+            try:
+                ke_ie_ratio = float(energy_file.read_text().split()[0])
+            except (ValueError, IndexError):
+                pass
+        return {'max_rf1': max_rf1, 'region': lines[1].strip(), 'curve': curve,
+                'ke_ie_ratio': ke_ie_ratio}
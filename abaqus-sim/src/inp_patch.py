@@ -0,0 +1,99 @@
+"""
+Derive input decks for film thickness and adhesive variants.
+
+Film thickness and adhesive type only enter the joint models through the
+'Cohesive' contact property: the cohesive penalties (Ek/t, Gk/t, Gk/t),
+the damage initiation and the damage evolution tables. Geometry and mesh
+are identical for all variants with the same joint type and overlap.
+
+Instead of building every variant in CAE, one master .inp is written per
+(joint type, overlap) and the variants are derived from it by rewriting the
+data lines of these three tables.
+"""
+
+from pathlib import Path
+
+COHESIVE_INTERACTION = 'Cohesive'
+
+# Keywords (lower case) of the tables that depend on thickness and adhesive
+_PENALTY_KEYWORDS = ('*cohesive behavior',)
+_INITIATION_KEYWORDS = ('*damage initiation', '*contact damage')
+_EVOLUTION_KEYWORDS = ('*damage evolution', '*contact damage evolution')
+
+
+def _keyword(line):
+    """Return the lower-case keyword of a keyword line, or None for data/comment lines."""
+    stripped = line.strip()
+    if not stripped.startswith('*') or stripped.startswith('**'):
+        return None
+    return stripped.split(',')[0].strip().lower()
+
+
+def _is_interaction_start(line, name):
+    if _keyword(line) != '*surface interaction':
+        return False
+    params = [p.strip().lower().replace(' ', '') for p in line.split(',')[1:]]
+    return f"name={name.lower()}" in params
+
+
+def _format_row(values):
+    return ', '.join(f"{float(v):.10g}" for v in values)
+
+
+def patch_cohesive_properties(inp_text, adhesive, film_thickness, interaction=COHESIVE_INTERACTION):
+    """
+    Return inp_text with the cohesive tables of an interaction property replaced.
+
+    adhesive is an AdhesiveMaterial (see materials.py). Raises ValueError if
+    the interaction property or one of its tables is not found.
+    """
+    lines = inp_text.splitlines(keepends=True)
+    newline = '\r\n' if inp_text.endswith('\r\n') else '\n'
+    tables = {
+        _PENALTY_KEYWORDS: adhesive.cohesive_penalties(film_thickness),
+        _INITIATION_KEYWORDS: adhesive.damage_initiation,
+        _EVOLUTION_KEYWORDS: adhesive.damage_evolution,
+    }
+    patched = {keywords: False for keywords in tables}
+
+    out = []
+    in_block = False
+    skip_data = False
+    for line in lines:
+        keyword = _keyword(line)
+
+        if skip_data:
+            if keyword is None and not line.strip().startswith('**') and line.strip():
+                continue  # Old data line of a replaced table
+            skip_data = False
+
+        if _is_interaction_start(line, interaction):
+            in_block = True
+            out.append(line)
+            continue
+
+        if in_block and (line.strip().startswith('**') or keyword == '*surface interaction'):
+            in_block = False
+
+        out.append(line)
+        if in_block and keyword is not None:
+            for keywords, values in tables.items():
+                if keyword in keywords:
+                    out.append(' ' + _format_row(values) + newline)
+                    patched[keywords] = True
+                    skip_data = True
+                    break
+
+    missing = [keywords[0] for keywords, done in patched.items() if not done]
+    if missing:
+        raise ValueError(
+            f"Could not find {', '.join(missing)} in interaction property '{interaction}'"
+        )
+    return ''.join(out)
+
+
+def write_variant(master_inp, variant_inp, adhesive, film_thickness):
+    """Write a variant input deck derived from a master deck."""
+    master_inp = Path(master_inp)
+    text = master_inp.read_text()
+    Path(variant_inp).write_text(patch_cohesive_properties(text, adhesive, film_thickness))
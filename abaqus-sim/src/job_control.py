@@ -0,0 +1,303 @@
+"""
+Control of running Abaqus jobs from regular Python.
+
+Post-peak termination: the explicit tensile step always runs to the full
+prescribed displacement, although Max_RF1 is known as soon as the joint has
+failed. PostPeakWatcher polls the RF1 history (H-Output-2 at ZugMesspunkt)
+of a running job from its ODB and ends the analysis with
+`abaqus terminate job=<name>` once RF1 has dropped the configured fraction
+below its peak. The ODB then holds all frames up to that point and is
+extracted as usual.
+
+Stall watchdog: every job is started in its own process group (session on
+Linux), and the PIDs of its process tree are recorded while it runs. A
+JobWatchdog follows the job's .sta file and kills only that job's process
+tree when the step time stops advancing. The allowed gap adapts to the
+progress seen so far instead of a fixed 2 hour timeout.
+
+Usage (from run_batch.py):
+    watcher = PostPeakWatcher(name, results_dir, abaqus_cmd, drop_fraction=0.5)
+    watcher.start()
+    ... run the job ...
+    watcher.stop()
+    if watcher.terminated: ...
+
+    watchdog = JobWatchdog(name, results_dir / f"{name}.sta")
+    returncode = run_watched(cmd, cwd, log_file, watchdog)
+"""
+
+import os
+import signal
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from extraction import extract_odb_result
+from sta_monitor import StaTail
+
+# Number of consecutive RF1 samples that must be below the threshold, so a
+# single dip (e.g. a dynamic oscillation) does not end the analysis
+CONFIRM_SAMPLES = 3
+
+
+def post_peak_drop_reached(rf1_values, drop_fraction, confirm_samples=CONFIRM_SAMPLES):
+    """
+    Return True if the last confirm_samples RF1 values are all at least
+    drop_fraction below the peak so far (e.g. 0.5 = below 50% of the peak).
+    """
+    if len(rf1_values) <= confirm_samples:
+        return False
+    peak_index = max(range(len(rf1_values)), key=lambda i: rf1_values[i])
+    peak = rf1_values[peak_index]
+    if peak <= 0 or len(rf1_values) - 1 - peak_index < confirm_samples:
+        return False
+    threshold = (1.0 - drop_fraction) * peak
+    return all(value <= threshold for value in rf1_values[-confirm_samples:])
+
+
+def terminate_job(name, work_dir, abaqus_cmd='abaqus', timeout=120):
+    """
+    End a running analysis with `abaqus terminate`, which closes its output
+    files properly. Returns True if the command succeeded.
+    """
+    cmd = [abaqus_cmd, 'terminate', f'job={name}']
+    try:
+        result = subprocess.run(cmd, cwd=str(work_dir), capture_output=True,
+                                text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"ERROR: Could not terminate {name}: {e}")
+        return False
+    if result.returncode != 0:
+        print(f"ERROR: abaqus terminate failed for {name}: {result.stdout}{result.stderr}")
+        return False
+    return True
+
+
+class PostPeakWatcher:
+    """Terminate a running job once its RF1 has dropped far enough below the peak."""
+
+    def __init__(self, name, work_dir, abaqus_cmd='abaqus', drop_fraction=0.5, poll_interval=60.0):
+        self.name = name
+        self.work_dir = Path(work_dir)
+        self.abaqus_cmd = abaqus_cmd
+        self.drop_fraction = drop_fraction
+        self.poll_interval = poll_interval
+        self.terminated = False
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """Read the RF1 history once. Returns True if the drop was reached."""
+        odb_path = self.work_dir / f"{self.name}.odb"
+        if not odb_path.exists():
+            return False
+        result = extract_odb_result(odb_path, self.abaqus_cmd, quiet=True)
+        if result is None or not result['curve']:
+            return False  # ODB not readable yet, try again on the next poll
+        rf1_values = [rf1 for _, _, rf1 in result['curve']]
+        self.peak = max(rf1_values)
+        return post_peak_drop_reached(rf1_values, self.drop_fraction)
+
+    def _run(self):
+        while not self._stop.wait(self.poll_interval):
+            if not self.check():
+                continue
+            print(f"RF1 of {self.name} dropped {self.drop_fraction * 100:.0f}% below its peak "
+                  f"({self.peak:.2f}), terminating the analysis")
+            self.terminated = terminate_job(self.name, self.work_dir, self.abaqus_cmd)
+            return
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"post-peak-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+class JobStalled(Exception):
+    """Raised by run_watched when the watchdog killed a stalled job."""
+
+
+def new_process_group_options():
+    """Popen arguments that start a process in its own process group."""
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def process_tree(pid):
+    """
+    Return the PIDs of all descendants of a process.
+
+    Uses /proc, so the tree is only known on Linux. On Windows, taskkill /T
+    finds the tree itself.
+    """
+    children = {}
+    try:
+        entries = [e for e in os.listdir('/proc') if e.isdigit()]
+    except OSError:
+        return []
+    for entry in entries:
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, the parent PID follows the ')'
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+
+    tree = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            tree.append(child)
+            stack.append(child)
+    return tree
+
+
+def kill_process_tree(pid, known_pids=(), grace_period=10.0, process=None):
+    """
+    Kill a process started with new_process_group_options() and all its children.
+
+    known_pids are descendants recorded earlier; they are killed as well in
+    case they left the process group or lost their parent. Pass the Popen
+    object as process if it is a child of this process, so it is reaped.
+    """
+    if os.name == 'nt':
+        for target in [pid] + list(known_pids):
+            subprocess.run(['taskkill', '/PID', str(target), '/T', '/F'],
+                           capture_output=True, text=True)
+        return
+
+    def send(sig):
+        try:
+            os.killpg(pid, sig)
+        except OSError:
+            pass
+        for target in known_pids:
+            try:
+                os.kill(target, sig)
+            except OSError:
+                pass
+
+    send(signal.SIGTERM)
+    deadline = time.time() + grace_period
+    while time.time() < deadline:
+        if process is not None:
+            process.poll()  # An unreaped leader keeps the group alive
+        try:
+            os.killpg(pid, 0)
+        except OSError:
+            break  # Process group is gone
+        time.sleep(0.5)
+    send(signal.SIGKILL)
+
+
+class JobWatchdog:
+    """
+    Detect a stalled job from its .sta file.
+
+    Before the first increment, the job may take startup_timeout seconds
+    (pre-processing). After that, it is stalled when the step time has not
+    advanced for stall_factor times the longest gap seen so far between two
+    advances, but at least min_stall seconds.
+    """
+
+    def __init__(self, name, sta_path, startup_timeout=1800.0, min_stall=300.0,
+                 stall_factor=10.0):
+        self.name = name
+        self.startup_timeout = startup_timeout
+        self.min_stall = min_stall
+        self.stall_factor = stall_factor
+        self.tail = StaTail(str(sta_path))
+        self.process = None
+        self.pids = []
+        self.start_time = None
+        self.last_advance = None
+        self.last_step_time = None
+        self.longest_gap = 0.0
+        self.reason = None
+
+    def attach(self, process):
+        """Start watching a launched process."""
+        self.process = process
+        self.start_time = time.time()
+        self.tail.not_before = self.start_time - 1
+
+    @property
+    def stall_limit(self):
+        return max(self.min_stall, self.stall_factor * self.longest_gap)
+
+    def check(self):
+        """Poll the .sta file. Returns the reason if the job is stalled, else None."""
+        now = time.time()
+        if self.process is not None:
+            self.pids = process_tree(self.process.pid) or self.pids
+        if self.start_time is None:
+            self.start_time = now
+
+        latest = self.tail.poll()
+        if latest is None:
+            if now - self.start_time > self.startup_timeout:
+                self.reason = f"no increment after {self.startup_timeout:.0f} s"
+            return self.reason
+
+        if self.last_step_time is None or latest.step_time > self.last_step_time:
+            if self.last_advance is not None:
+                self.longest_gap = max(self.longest_gap, now - self.last_advance)
+            self.last_advance = now
+            self.last_step_time = latest.step_time
+        elif now - self.last_advance > self.stall_limit:
+            self.reason = (f"step time stuck at {latest.step_time:.4g} for "
+                           f"{now - self.last_advance:.0f} s (limit {self.stall_limit:.0f} s)")
+        return self.reason
+
+    def kill(self):
+        if self.process is not None:
+            kill_process_tree(self.process.pid, self.pids, process=self.process)
+
+
+def run_watched(cmd, cwd, log_file, watchdog=None, timeout=None, on_start=None, poll_interval=5.0):
+    """
+    Run a command in its own process group with its output written to log_file.
+
+    on_start(pid), if given, is called right after the launch (e.g. to record
+    the PID in the job ledger).
+
+    Returns the return code. Raises subprocess.TimeoutExpired after timeout
+    seconds and JobStalled if the watchdog detects a stall; in both cases
+    the whole process tree of the command is killed first.
+    """
+    process = subprocess.Popen(cmd, cwd=cwd, stdout=log_file, stderr=subprocess.STDOUT,
+                               **new_process_group_options())
+    if on_start is not None:
+        on_start(process.pid)
+    if watchdog is not None:
+        watchdog.attach(process)
+    start = time.time()
+    try:
+        while True:
+            try:
+                return process.wait(timeout=poll_interval)
+            except subprocess.TimeoutExpired:
+                pass
+            if timeout is not None and time.time() - start > timeout:
+                kill_process_tree(process.pid, watchdog.pids if watchdog else process_tree(process.pid),
+                                  process=process)
+                raise subprocess.TimeoutExpired(cmd, timeout)
+            if watchdog is not None and watchdog.check() is not None:
+                watchdog.kill()
+                raise JobStalled(watchdog.reason)
+    except KeyboardInterrupt:
+        # The job does not receive Ctrl+C in its own process group
+        kill_process_tree(process.pid, process_tree(process.pid), process=process)
+        raise
+    finally:
+        if process.poll() is None:
+            process.wait()
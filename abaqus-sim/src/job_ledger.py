@@ -0,0 +1,211 @@
+"""
+Persistent job ledger for batch campaigns.
+
+Every design point of a batch is recorded in a small SQLite database,
+keyed by its Abaqus job name. The ledger tracks the state of each point
+(queued, running, done, failed, timed-out) so that an interrupted batch
+can be resumed with `python run_batch.py --resume` instead of rerunning
+the whole CSV.
+
+Every run of a job (including automatic retries with fallback settings,
+see retry_policy.py) is also recorded in the attempts table with its
+settings, state, run time and cores.
+
+While a job runs, the PID of its process group is recorded as well, so a
+single job can be stopped with `python stop_abaqus.py --job <name>`.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_TIMED_OUT = 'timed-out'
+
+JOB_STATES = (JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED, JOB_TIMED_OUT)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    joint_type TEXT,
+    overlap REAL,
+    film_thickness REAL,
+    adhesive TEXT,
+    cores INTEGER,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    started_at REAL,
+    finished_at REAL,
+    message TEXT,
+    updated_at REAL,
+    pid INTEGER
+)
+"""
+
+_ATTEMPTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attempts (
+    name TEXT NOT NULL,
+    attempt INTEGER NOT NULL,
+    settings TEXT,
+    state TEXT NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    cores INTEGER,
+    message TEXT,
+    PRIMARY KEY (name, attempt)
+)
+"""
+
+# Columns added after the first release, created in older ledgers on open
+_ADDED_COLUMNS = {
+    'pid': 'INTEGER',
+}
+
+
+class JobLedger:
+    """SQLite-backed record of the state of every job in a campaign."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        # Jobs report their state from scheduler threads, so the connection
+        # is shared between threads and guarded by a lock.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_ATTEMPTS_SCHEMA)
+            columns = {row['name'] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+
+    def close(self):
+        self._conn.close()
+
+    def get(self, name):
+        """Return the ledger row of a job as a dict, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def state(self, name):
+        """Return the state of a job, or None if it is not in the ledger."""
+        row = self.get(name)
+        return row['state'] if row is not None else None
+
+    def enqueue(self, name, joint_type, overlap, film_thickness, adhesive, cores):
+        """Add a job in the queued state, or reset an existing entry to queued."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO jobs (name, joint_type, overlap, film_thickness, adhesive, cores,
+                                  state, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    joint_type = excluded.joint_type,
+                    overlap = excluded.overlap,
+                    film_thickness = excluded.film_thickness,
+                    adhesive = excluded.adhesive,
+                    cores = excluded.cores,
+                    state = excluded.state,
+                    message = NULL,
+                    updated_at = excluded.updated_at
+                """,
+                (name, joint_type, overlap, film_thickness, adhesive, cores, JOB_QUEUED, now))
+
+    def mark_running(self, name):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                UPDATE jobs SET state = ?, attempts = attempts + 1, started_at = ?,
+                                finished_at = NULL, message = NULL, pid = NULL, updated_at = ?
+                WHERE name = ?
+                """,
+                (JOB_RUNNING, now, now, name))
+
+    def mark_finished(self, name, state, message=None):
+        """Record the final state (done, failed or timed-out) of a job."""
+        if state not in (JOB_DONE, JOB_FAILED, JOB_TIMED_OUT):
+            raise ValueError(f"Not a final job state: {state}")
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, finished_at = ?, message = ?, pid = NULL, updated_at = ? WHERE name = ?",
+                (state, now, message, now, name))
+
+    def set_pid(self, name, pid):
+        """Record the PID of the process (group) running a job."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET pid = ?, updated_at = ? WHERE name = ?",
+                               (pid, time.time(), name))
+
+    def running_pids(self):
+        """Return {name: pid} of all running jobs with a recorded PID."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, pid FROM jobs WHERE state = ? AND pid IS NOT NULL", (JOB_RUNNING,)).fetchall()
+        return {row['name']: row['pid'] for row in rows}
+
+    def record_attempt(self, name, attempt, settings, state, started_at, finished_at, cores,
+                       message=None):
+        """Record one run of a job; settings is a dict of the options it ran with."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO attempts (name, attempt, settings, state, started_at,
+                                                 finished_at, cores, message)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (name, attempt, json.dumps(settings, sort_keys=True), state, started_at,
+                 finished_at, cores, message))
+
+    def attempts(self, name):
+        """Return the recorded runs of a job in order, settings decoded."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM attempts WHERE name = ? ORDER BY attempt", (name,)).fetchall()
+        attempts = [dict(row) for row in rows]
+        for attempt in attempts:
+            attempt['settings'] = json.loads(attempt['settings'] or '{}')
+        return attempts
+
+    def timings(self):
+        """
+        Return the completed runs (joint_type, overlap, film_thickness, cores,
+        duration) of all done jobs, e.g. to fit a runtime model.
+        
+        The duration is that of the successful attempt, so it leaves out
+        failed attempts and, with --pipeline, the deck writing and the wait
+        for a solver slot. Jobs without recorded attempts (distributed and
+        cluster runs) fall back to the time between start and finish.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT j.joint_type, j.overlap, j.film_thickness,
+                       COALESCE(a.cores, j.cores) AS cores,
+                       COALESCE(a.finished_at - a.started_at, j.finished_at - j.started_at) AS duration
+                FROM jobs AS j
+                LEFT JOIN attempts AS a ON a.name = j.name AND a.attempt = (
+                    SELECT attempt FROM attempts
+                    WHERE name = j.name AND state = ?
+                    ORDER BY finished_at DESC LIMIT 1)
+                WHERE j.state = ? AND j.started_at IS NOT NULL AND j.finished_at > j.started_at
+                      AND (j.message IS NULL OR j.message != 'cache hit')
+                """, (JOB_DONE, JOB_DONE)).fetchall()
+        return [dict(row) for row in rows if row['duration'] and row['duration'] > 0]
+
+    def counts(self):
+        """Return the number of jobs per state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        counts = {state: 0 for state in JOB_STATES}
+        counts.update({state: count for state, count in rows})
+        return counts
@@ -0,0 +1,113 @@
+"""
+Abaqus license token accounting for the batch scheduler.
+
+An Abaqus analysis checks out int(5 * cores^0.422) tokens for the whole
+run (5 tokens for 1 core, 12 for 8 cores, 20 for 28 cores). The token pool
+of the site is shared, so a job that is started while too few tokens are
+free waits inside the license server or fails. The scheduler therefore
+admits a job only while the pool has capacity for its tokens.
+
+The pool is a fixed number of tokens for this batch ([licensing]
+total_tokens in config.ini). Optionally, a status command that prints
+`lmstat -a` output (e.g. `abaqus licensing lmstat -a`, or a small script
+to try it locally) reports the tokens used by others, which then also
+limit new jobs.
+
+Because the token count grows much slower than the core count, fewer cores
+per job can give more throughput per token. best_cores_per_job() picks the
+core count with the highest batch throughput for a core and token budget.
+"""
+
+import re
+import subprocess
+import threading
+import time
+
+
+def abaqus_tokens(cores):
+    """Analysis tokens of one job on the given number of cores."""
+    return int(5 * max(1, cores) ** 0.422)
+
+
+def parse_lmstat(output, feature='abaqus'):
+    """
+    Return (issued, in_use) of a feature from `lmstat -a` output, or None
+    if the feature is not listed.
+    """
+    match = re.search(
+        rf'Users of {re.escape(feature)}:\s*\(Total of (\d+) licenses? issued;\s*'
+        rf'Total of (\d+) licenses? in use\)', output)
+    if match is None:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+class TokenPool:
+    """Tokens this batch may check out, optionally limited by the license server."""
+
+    def __init__(self, total_tokens, status_command=None, feature='abaqus', query_interval=60.0):
+        self.total_tokens = total_tokens
+        self.status_command = status_command
+        self.feature = feature
+        self.query_interval = query_interval
+        self._other_use = 0
+        self._queried_at = None
+        self._lock = threading.Lock()
+
+    def _query(self, used_tokens):
+        """Update the tokens in use by others from the status command."""
+        try:
+            result = subprocess.run(self.status_command, shell=True, capture_output=True,
+                                    text=True, timeout=60)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"Warning: License status query failed: {e}")
+            return
+        usage = parse_lmstat(result.stdout, self.feature)
+        if usage is None:
+            print(f"Warning: Feature '{self.feature}' not found in license status output")
+            return
+        issued, in_use = usage
+        if not self.total_tokens:
+            self.total_tokens = issued
+        # Tokens of our running jobs are part of in_use once they have been checked out
+        self._other_use = max(0, in_use - used_tokens)
+
+    def capacity(self, used_tokens):
+        """Tokens this batch may hold in total, given the tokens its running jobs use."""
+        with self._lock:
+            if self.status_command and (self._queried_at is None
+                                        or time.time() - self._queried_at >= self.query_interval):
+                self._query(used_tokens)
+                self._queried_at = time.time()
+            return max(0, self.total_tokens - self._other_use)
+
+
+def speedup(cores, parallel_fraction):
+    """Amdahl speed-up of one job on the given number of cores."""
+    return 1.0 / ((1.0 - parallel_fraction) + parallel_fraction / cores)
+
+
+def best_cores_per_job(total_cores, total_tokens, max_jobs, parallel_fraction=0.95):
+    """
+    Choose the cores per job with the highest batch throughput.
+
+    At most max_jobs jobs run at once, and they must fit into total_cores
+    and total_tokens (0 = no token limit). Throughput is the number of jobs
+    times their Amdahl speed-up; on a tie the plan with fewer tokens wins.
+
+    Returns (cores_per_job, concurrent_jobs).
+    """
+    best = None
+    for cores in range(1, total_cores + 1):
+        jobs = min(max_jobs, total_cores // cores)
+        if total_tokens:
+            jobs = min(jobs, total_tokens // abaqus_tokens(cores))
+        if jobs < 1:
+            continue
+        throughput = jobs * speedup(cores, parallel_fraction)
+        key = (round(throughput, 9), -jobs * abaqus_tokens(cores))
+        if best is None or key > best[0]:
+            best = (key, cores, jobs)
+    if best is None:
+        raise ValueError(f"A single job needs {abaqus_tokens(1)} tokens, the pool has {total_tokens}")
+    return best[1], best[2]
@@ -0,0 +1,42 @@
+"""
+Adhesive material definitions shared by the joint builders.
+
+This module does not import any Abaqus modules, so the adhesive properties
+can also be used by the batch tools running in regular Python.
+"""
+
+
+class AdhesiveMaterial:
+    def __init__(self, name, Ek, Gk, damage_initiation, damage_evolution):
+        self.name = name
+        self.Ek = Ek
+        self.Gk = Gk
+        self.damage_initiation = damage_initiation
+        self.damage_evolution = damage_evolution
+
+    def cohesive_penalties(self, thickness):
+        Kn = self.Ek / thickness
+        Ks = self.Gk / thickness
+        Kt = Ks
+        return (Kn, Ks, Kt)
+
+DP490 = AdhesiveMaterial(
+    name = "DP490",
+    Ek=659.6,
+    Gk=239.0,
+    damage_initiation=(30.112, 36.0, 36.0),
+    damage_evolution=(0.9055, 2.3213, 2.3213),
+)
+
+AF163 = AdhesiveMaterial(
+    name = "AF163",
+    Ek=1110.0,
+    Gk=413.69,
+    damage_initiation=(48.26, 47.92, 47.92),
+    damage_evolution=(3.8, 9.8, 9.8),
+)
+
+ADHESIVES = {
+    'DP490': DP490,
+    'AF163': AF163,
+}
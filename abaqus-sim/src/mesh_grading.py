@@ -0,0 +1,144 @@
+"""
+Graded mesh seeding and mesh reports of the joint models.
+
+By default the builders seed every part instance with one global seed size
+over the full adherend length, although the stress field between the
+overlap and the clamps is nearly uniform. With a coarse_seed_size, the
+edges along the loading direction (x) are seeded as follows:
+
+    overlap       global (fine) seed, as before
+    free length   biased from the fine seed at the overlap to the coarse
+                  seed at the clamp
+    clamp         coarse seed
+
+Edges across the width and through the thickness keep the fine seed, so
+the smallest element, and with it the stable time increment, stays the
+same while the element count drops roughly with the free length.
+
+After meshing, the builders write the seeds, the element counts and the
+modelled fraction of the specimen width (0.5 for a half-width symmetry
+model) to <job>_mesh.json. The report stays next to the ODB, so the RF1 of
+a half-width model is scaled back to the full width on extraction.
+
+seed_graded() and count_elements() run inside Abaqus/CAE; the element
+estimate runs in regular Python (runtime_model.py, the emulator).
+"""
+
+import json
+import math
+from pathlib import Path
+
+# Length of the clamped region at both ends of the specimen (mm)
+CLAMP_LENGTH = 50.0
+
+# Tolerance for comparing vertex coordinates (mm)
+_TOLERANCE = 1e-6
+
+MESH_SUFFIX = '_mesh.json'
+
+
+def graded_count(length, fine, coarse):
+    """Elements along an edge whose seed grows linearly from fine to coarse."""
+    if length <= 0:
+        return 0
+    if coarse <= fine:
+        return int(math.ceil(length / fine))
+    return int(math.ceil(length * math.log(coarse / fine) / (coarse - fine)))
+
+
+def adherend_x_elements(length, bonded, fine, coarse=None, clamp=CLAMP_LENGTH):
+    """
+    Elements along one adherend of the given length, bonded over its last
+    `bonded` mm, with a uniform fine seed or graded towards the clamp.
+    """
+    if not coarse:
+        return length / fine
+    free = max(0.0, length - bonded - clamp)
+    return bonded / fine + graded_count(free, fine, coarse) + math.ceil(clamp / coarse)
+
+
+def _x_edges(instance):
+    """Yield (edge, x_first, x_last) of the edges of an instance along the x axis."""
+    for edge in instance.edges:
+        first, last = (instance.vertices[i].pointOn[0] for i in edge.getVertices()[:2])
+        if (abs(first[0] - last[0]) > _TOLERANCE and abs(first[1] - last[1]) < _TOLERANCE
+                and abs(first[2] - last[2]) < _TOLERANCE):
+            yield edge, first[0], last[0]
+
+
+def seed_graded(assembly, instances, overlap_start, overlap_end, clamp_start, clamp_end, fine, coarse):
+    """
+    Seed the x edges of the instances outside the overlap [overlap_start,
+    overlap_end]: biased towards the clamps on the free length and coarse in
+    the clamps (x < clamp_start or x > clamp_end). Call after the global seed
+    and before generateMesh; the overlap must be bounded by partitions.
+    """
+    from abaqusConstants import FINER, SINGLE
+
+    end1, end2, clamped = [], [], []
+    for instance in instances:
+        for edge, x_first, x_last in _x_edges(instance):
+            low, high = min(x_first, x_last), max(x_first, x_last)
+            edges = instance.edges[edge.index:edge.index + 1]
+            if high <= clamp_start + _TOLERANCE or low >= clamp_end - _TOLERANCE:
+                clamped.append(edges)
+            elif high <= overlap_start + _TOLERANCE:
+                # Fine end towards the overlap (end1 is the first vertex)
+                (end1 if x_first > x_last else end2).append(edges)
+            elif low >= overlap_end - _TOLERANCE:
+                (end1 if x_first < x_last else end2).append(edges)
+
+    def combine(sequences):
+        combined = sequences[0]
+        for sequence in sequences[1:]:
+            combined = combined + sequence
+        return combined
+
+    if clamped:
+        assembly.seedEdgeBySize(edges=combine(clamped), size=coarse, deviationFactor=0.1,
+                                minSizeFactor=0.1, constraint=FINER)
+    if end1 or end2:
+        kwargs = {}
+        if end1:
+            kwargs['end1Edges'] = combine(end1)
+        if end2:
+            kwargs['end2Edges'] = combine(end2)
+        assembly.seedEdgeByBias(biasMethod=SINGLE, minSize=fine, maxSize=coarse,
+                                constraint=FINER, **kwargs)
+
+
+def count_elements(instances):
+    """Element count per instance name of meshed instances."""
+    return {instance.name: len(instance.elements) for instance in instances}
+
+
+def write_mesh_report(path, name, seed_size, coarse_seed_size, elements, width_fraction=1.0):
+    """Write <job>_mesh.json with the seeds, the element counts per instance and the modelled width."""
+    report = {
+        'job': name,
+        'seed_size': seed_size,
+        'coarse_seed_size': coarse_seed_size,
+        'graded': bool(coarse_seed_size),
+        'width_fraction': width_fraction,
+        'elements': elements,
+        'total_elements': sum(elements.values()),
+    }
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+def read_mesh_report(path):
+    """Read a <job>_mesh.json file, or None if there is none."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def rf1_scale(odb_path):
+    """Factor from the RF1 in an ODB to the full specimen width (2 for a half-width model)."""
+    odb_path = Path(odb_path)
+    report = read_mesh_report(odb_path.with_name(f"{odb_path.stem}{MESH_SUFFIX}")) or {}
+    return 1.0 / report.get('width_fraction', 1.0)
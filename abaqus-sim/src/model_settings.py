@@ -0,0 +1,107 @@
+"""
+Model and solver settings that determine the result of a joint simulation.
+
+These mirror the defaults hard-coded in StrapJoint() and SteppedJoint().
+They are used outside of Abaqus to describe a design point completely,
+e.g. for the result cache key. When a builder default changes, update the
+value here as well, or bump MODEL_REVISION to invalidate cached results.
+"""
+
+from materials import ADHESIVES
+from naming import format_overlap, format_thickness
+
+# Bump whenever the joint builders change in a way that alters results.
+MODEL_REVISION = 1
+
+ORIENTATION_VALUES = [-45.0, 0.0, 45.0, 90.0, 90.0, 45.0, 0.0, -45.0]
+
+MODEL_DEFAULTS = {
+    'SAP': {
+        'L': 150.0,
+        'B': 25.0,
+        'th': 2.0,
+        'pl': 8,
+        'orientation_values': ORIENTATION_VALUES,
+        'seed_size': 0.4,
+        'element_type': 'SC8R',
+        'displacement': 10.0,
+        'mass_scaling_target': 1e-05,
+        'explicit_precision': 'SINGLE',
+    },
+    'SEP': {
+        'L': 150.0,
+        'B': 25.0,
+        'th': 2.0,
+        'pl': 8,
+        'num_steps': 4,
+        'orientation_values': ORIENTATION_VALUES,
+        'seed_size': 0.4,
+        'element_type': 'SC8R',
+        'displacement': 6.0,
+        'mass_scaling_target': 1e-05,
+        'explicit_precision': 'SINGLE',
+    },
+}
+
+# Options that change the solution. Options that only affect how the job
+# is run (memory, cores) are not part of this set. Options without an entry
+# in MODEL_DEFAULTS are only hashed when they are set.
+SOLUTION_OPTIONS = {
+    'post_peak_drop',  # Early termination may cut off a later, higher peak
+    'seed_size',  # Fallback settings of a retried job (see retry_policy.py)
+    'mass_scaling_target',
+    'explicit_precision',
+    'step_time',  # Calibrated step duration (see calibration.py), 1.0 by default
+    'coarse_seed_size',  # Graded mesh towards the clamps (see mesh_grading.py)
+    'half_width',  # Half-width symmetry model, RF1 scaled to the full width
+    'restricted_contact',  # Contact domain limited to the overlap (see contact_domain.py)
+    'contact_margin',
+    'overlap_partitions',  # SEP overlap bounded by partitions without graded mesh or restricted contact
+}
+
+
+def quantise_overlap(overlap):
+    """Overlap as it appears in the job name (4 decimals)."""
+    return float(format_overlap(overlap).replace("p", "."))
+
+
+def quantise_thickness(film_thickness):
+    """Film thickness as it appears in the job name (whole microns, in mm)."""
+    film_thickness = float(film_thickness)
+    if film_thickness < 1:
+        return int(format_thickness(film_thickness)[:-2]) / 1000.0
+    return film_thickness
+
+
+def solution_inputs(joint_type, adhesive_name, overlap, film_thickness, options=None):
+    """
+    Return a dict of every input that affects the solution of a design point.
+
+    options may contain run_simulations.py options; those listed in
+    SOLUTION_OPTIONS override the builder defaults.
+    """
+    if joint_type not in MODEL_DEFAULTS:
+        raise ValueError(f"Unknown joint type: {joint_type}. Must be 'SAP' or 'SEP'.")
+    if adhesive_name not in ADHESIVES:
+        raise ValueError(f"Unknown adhesive: {adhesive_name}. Must be one of {', '.join(ADHESIVES)}.")
+
+    adhesive = ADHESIVES[adhesive_name]
+    settings = dict(MODEL_DEFAULTS[joint_type])
+    for name, value in (options or {}).items():
+        if name in SOLUTION_OPTIONS:
+            settings[name] = value
+
+    return {
+        'model_revision': MODEL_REVISION,
+        'joint_type': joint_type,
+        'adhesive': {
+            'name': adhesive.name,
+            'Ek': adhesive.Ek,
+            'Gk': adhesive.Gk,
+            'damage_initiation': list(adhesive.damage_initiation),
+            'damage_evolution': list(adhesive.damage_evolution),
+        },
+        'overlap': quantise_overlap(overlap),
+        'film_thickness': quantise_thickness(film_thickness),
+        'settings': settings,
+    }
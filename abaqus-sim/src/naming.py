@@ -0,0 +1,50 @@
+"""
+Job naming helpers shared by the batch tools.
+
+The joint builders (StrapJoint.py, SteppedJoint.py) name every job
+{JOINT_TYPE}{overlap}_{thickness}mu_{adhesive}, e.g. SAP45p0000_250mu_DP490.
+These functions reproduce that naming outside of Abaqus, including the
+quantisation of overlap (4 decimals) and film thickness (whole microns).
+"""
+
+import re
+
+
+def format_overlap(overlap):
+    """Convert overlap in mm to the filename format with 4 decimal places."""
+    return f"{round(float(overlap), 4):.4f}".replace(".", "p")
+
+
+def format_thickness(film_thickness):
+    """Convert film thickness in mm to the filename format (e.g. 0.12 -> 120mu)."""
+    film_thickness = float(film_thickness)
+    if film_thickness < 1:
+        return f"{int(film_thickness * 1000)}mu"
+    return str(film_thickness).replace(".", "p")
+
+
+def format_adhesive(adhesive_name):
+    """Make an adhesive name safe for use in a job name."""
+    return adhesive_name.replace(" ", "_").replace(".", "_").replace(",", "_")
+
+
+def job_name(joint_type, overlap, film_thickness, adhesive_name):
+    """Return the Abaqus job name for a design point."""
+    return (f"{joint_type}{format_overlap(overlap)}_"
+            f"{format_thickness(film_thickness)}_{format_adhesive(adhesive_name)}")
+
+
+def parse_job_name(name):
+    """
+    Return (joint_type, overlap, film_thickness, adhesive_name) of a job name,
+    or None if the name does not follow the job naming.
+    """
+    match = re.match(r'^(SAP|SEP)(\d+p\d+)_(\d+(?:mu|p\d+))_(.+)$', name)
+    if match is None:
+        return None
+    joint_type, overlap, thickness, adhesive = match.groups()
+    if thickness.endswith('mu'):
+        film_thickness = int(thickness[:-2]) / 1000.0
+    else:
+        film_thickness = float(thickness.replace('p', '.'))
+    return joint_type, float(overlap.replace('p', '.')), film_thickness, adhesive
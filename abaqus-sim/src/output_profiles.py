@@ -0,0 +1,43 @@
+"""
+Output-request profiles of the joint builders.
+
+The DOE pipeline only reads the RF1/U1 history at ZugMesspunkt, while the
+full output requests 12 field variables on every composite layup at 50
+intervals. A profile selects what the builders request:
+
+    minimal   RF1/U1 history at ZugMesspunkt and ALLIE/ALLKE of the whole
+              model (H-Output-1)
+    energy    same as minimal, kept for existing config files
+    damage    + CSDMG/STATUS of the cohesive contact at 10 intervals
+    full      layup field output and CSDMG/STATUS at 50 intervals
+
+ALLIE/ALLKE is a single whole-model history request, so every profile keeps
+it for the KE/IE ratio of the solver metrics (solver_metrics.py).
+
+Every profile keeps the filtered RF1 history (H-Output-Criteria) that halts
+a job once the joint has failed, so the profile does not change the
+solution. The profile of a campaign is set in the [output] section of
+config.ini (run_simulations.py option output_profile).
+"""
+
+DEFAULT_PROFILE = 'full'
+
+# Field output of the composite layups in the full profile
+LAYUP_VARIABLES = ('DAMAGEC', 'DAMAGEFC', 'DAMAGEFT', 'DAMAGEMC', 'DAMAGEMT', 'DAMAGESHR', 'DAMAGET',
+                   'DMICRT', 'LE', 'S', 'SDEG', 'STATUS')
+
+# energy: ALLIE/ALLKE history; *_intervals: output intervals (0 = not requested)
+OUTPUT_PROFILES = {
+    'minimal': {'energy': True, 'damage_intervals': 0, 'layup_intervals': 0},
+    'energy': {'energy': True, 'damage_intervals': 0, 'layup_intervals': 0},
+    'damage': {'energy': True, 'damage_intervals': 10, 'layup_intervals': 0},
+    'full': {'energy': True, 'damage_intervals': 50, 'layup_intervals': 50},
+}
+
+
+def profile_settings(name):
+    """Return the settings of an output profile."""
+    name = str(name).strip().lower()
+    if name not in OUTPUT_PROFILES:
+        raise ValueError(f"Unknown output profile: {name}. Must be one of {', '.join(OUTPUT_PROFILES)}")
+    return OUTPUT_PROFILES[name]
@@ -0,0 +1,190 @@
+"""
+Pre-flight check and cost estimate of a whole DOE (run_batch.py --preflight).
+
+Every design point is built and its input deck is run through an Abaqus
+datacheck (`abaqus job=... datacheck`), which runs the pre-processor and
+the Abaqus/Explicit packager without starting the analysis. From the
+datacheck output of each point:
+
+    .dat   NUMBER OF ELEMENTS IS ... / NUMBER OF NODES IS ...
+    .sta   Initial time increment = ... (stable increment after mass scaling)
+    .dat/.msg  ***ERROR and ***WARNING messages
+
+the expected number of increments (step time / stable increment) and the
+solver cost follow as
+
+    CPU seconds = increments * elements * cost_per_element_increment
+
+A point whose datacheck fails, or whose stable increment is far below that
+of the other points (e.g. a tiny LStep in SteppedJoint), is flagged before
+any solver time is spent. preflight_point() checks one point and
+preflight_report() writes the report to results/preflight.csv.
+"""
+
+import csv
+import re
+import statistics
+from pathlib import Path
+
+from job_ledger import JOB_DONE, JOB_FAILED
+from licensing import speedup
+from workspace import prepare_work_dir, remove_work_dir
+
+# A stable increment below this fraction of the campaign median is flagged
+SMALL_INCREMENT_RATIO = 0.2
+
+REPORT_HEADER = ['Job', 'Overlap_mm', 'Film_thickness_mm', 'Status', 'Elements', 'Nodes',
+                 'Stable_increment', 'Increments', 'CPU_hours', 'Wall_hours', 'Cores', 'Notes']
+
+
+def _read(path):
+    try:
+        return Path(path).read_text(errors='replace')
+    except OSError:
+        return ''
+
+
+def parse_datacheck(work_dir, name):
+    """
+    Read the datacheck output of a job.
+
+    Returns a dict with elements, nodes, stable_increment (None if not
+    found), errors (list of the first lines of ***ERROR messages) and the
+    number of warnings.
+    """
+    work_dir = Path(work_dir)
+    dat = _read(work_dir / f"{name}.dat")
+    sta = _read(work_dir / f"{name}.sta")
+    msg = _read(work_dir / f"{name}.msg")
+
+    def number(pattern, text, convert):
+        match = re.search(pattern, text, re.IGNORECASE)
+        return convert(match.group(1)) if match else None
+
+    stable_increment = number(r'Initial time increment\s*=\s*([-+0-9.Ee]+)', sta, float)
+    if stable_increment is None:
+        stable_increment = number(r'Initial time increment\s*=\s*([-+0-9.Ee]+)', msg, float)
+
+    errors = []
+    warnings = 0
+    for text in (dat, msg):
+        errors += [line.strip() for line in re.findall(r'\*\*\*ERROR:?(.*)', text)]
+        warnings += len(re.findall(r'\*\*\*WARNING', text))
+
+    return {
+        'elements': number(r'NUMBER OF ELEMENTS IS\s+(\d+)', dat, int),
+        'nodes': number(r'NUMBER OF NODES IS\s+(\d+)', dat, int),
+        'stable_increment': stable_increment,
+        'errors': errors,
+        'warnings': warnings,
+    }
+
+
+def estimate_cost(check, step_time, cost_per_element_increment, cores, parallel_fraction=0.95):
+    """
+    Add increments, cpu_hours and wall_hours (on the given cores) to a
+    parse_datacheck() result. They stay None if the datacheck gave no
+    element count or stable increment.
+    """
+    check = dict(check, increments=None, cpu_hours=None, wall_hours=None, cores=cores)
+    if check['elements'] and check['stable_increment']:
+        increments = step_time / check['stable_increment']
+        cpu_hours = increments * check['elements'] * cost_per_element_increment / 3600
+        check.update(increments=int(round(increments)), cpu_hours=cpu_hours,
+                     wall_hours=cpu_hours / speedup(cores, parallel_fraction))
+    return check
+
+
+def flag_outliers(checks, ratio=SMALL_INCREMENT_RATIO):
+    """Return the names of points whose stable increment is far below the median."""
+    increments = [c['stable_increment'] for c in checks.values() if c.get('stable_increment')]
+    if len(increments) < 3:
+        return []
+    limit = ratio * statistics.median(increments)
+    return [name for name, c in checks.items()
+            if c.get('stable_increment') and c['stable_increment'] < limit]
+
+
+def write_report(path, rows):
+    """Write the preflight report; rows are dicts with the REPORT_HEADER keys."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def preflight_point(name, work_dir, build, datacheck, step_time, cost_per_element_increment, cores,
+                parallel_fraction=0.95, keep_failed=True):
+    """
+    Preflight of one point: build() writes its input deck to work_dir and
+    datacheck() runs the datacheck on it, both return a job state. Returns
+    the estimate_cost() result with the state added. The work directory is
+    removed unless the check failed and keep_failed is set.
+    """
+    prepare_work_dir(work_dir)
+    state = build()
+    if state == JOB_DONE:
+        state = datacheck()
+    check = estimate_cost(parse_datacheck(work_dir, name), step_time, cost_per_element_increment,
+                          cores, parallel_fraction)
+    check['state'] = state
+    if (state == JOB_DONE and not check['errors']) or not keep_failed:
+        remove_work_dir(work_dir)
+    return check
+
+
+def report_rows(jobs, checks):
+    """Report rows of the scheduled jobs in CSV order; checks maps job names to preflight_point() results."""
+    outliers = flag_outliers(checks)
+    rows = []
+    for job in sorted(jobs, key=lambda job: job.payload['index']):
+        point = job.payload
+        check = checks.get(point['name'], {'state': JOB_FAILED, 'errors': []})
+        notes = check['errors'][:1]
+        if point['name'] in outliers:
+            notes.append('stable increment far below the campaign median')
+        if check.get('warnings'):
+            notes.append(f"{check['warnings']} warning(s)")
+        ok = check['state'] == JOB_DONE and not check['errors']
+        rows.append({
+            'Job': point['name'],
+            'Overlap_mm': point['overlap'],
+            'Film_thickness_mm': point['film_thickness'],
+            'Status': 'ok' if ok else 'failed',
+            'Elements': check.get('elements'),
+            'Nodes': check.get('nodes'),
+            'Stable_increment': check.get('stable_increment'),
+            'Increments': check.get('increments'),
+            'CPU_hours': round(check['cpu_hours'], 3) if check.get('cpu_hours') is not None else None,
+            'Wall_hours': round(check['wall_hours'], 3) if check.get('wall_hours') is not None else None,
+            'Cores': job.cores,
+            'Notes': '; '.join(notes),
+        })
+    return rows, outliers
+
+
+def preflight_report(jobs, checks, report_path, concurrent_jobs, cores):
+    """Write and print the preflight report. Returns the exit code (1 if a point failed)."""
+    rows, outliers = report_rows(jobs, checks)
+    write_report(report_path, rows)
+
+    print("\n" + "=" * 60)
+    print("PREFLIGHT")
+    print("=" * 60)
+    for row in rows:
+        if row['Status'] == 'ok' and row['CPU_hours'] is not None:
+            print(f"  {row['Job']}: {row['Elements']} elements, dt {row['Stable_increment']:.3e}, "
+                  f"{row['Increments']} increments, {row['CPU_hours']:.2f} CPU-h"
+                  + (f"  ({row['Notes']})" if row['Notes'] else ''))
+        else:
+            print(f"  {row['Job']}: {row['Status']} {row['Notes']}")
+    failed_points = [row for row in rows if row['Status'] != 'ok']
+    cpu_hours = sum(row['CPU_hours'] or 0 for row in rows)
+    wall_hours = sum(row['Wall_hours'] or 0 for row in rows)
+    print(f"Points: {len(rows)}, failed datacheck: {len(failed_points)}, "
+          f"flagged stable increment: {len(outliers)}")
+    print(f"Predicted cost: {cpu_hours:.1f} CPU-h, about {wall_hours / concurrent_jobs:.1f} h "
+          f"with {concurrent_jobs} x {cores} cores")
+    print(f"Report: {report_path}")
+    print("=" * 60)
+    return 0 if not failed_points else 1
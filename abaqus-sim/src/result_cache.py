@@ -0,0 +1,148 @@
+"""
+Content-addressed cache of simulation results.
+
+Results are stored under a SHA-256 hash of every input that affects the
+solution (see model_settings.solution_inputs), so an identical design
+point solved in an earlier campaign or optimization iteration is returned
+immediately instead of launching Abaqus again.
+
+Each entry is a small JSON file holding the maximum RF1, the region it was
+found in and the RF1 curve. Entries are evicted when they are older than
+max_age_days since they were stored, or least recently used first when
+the cache grows beyond max_size_mb.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from model_settings import solution_inputs
+
+
+def cache_key(inputs):
+    """Return the canonical hash of a solution_inputs() dict."""
+    canonical = json.dumps(inputs, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def point_key(joint_type, adhesive_name, overlap, film_thickness, options=None):
+    """Return the cache key and the hashed inputs for a design point."""
+    inputs = solution_inputs(joint_type, adhesive_name, overlap, film_thickness, options)
+    return cache_key(inputs), inputs
+
+
+class ResultCache:
+    """Directory of cached results, one JSON file per cache key."""
+
+    def __init__(self, root, max_age_days=None, max_size_mb=None):
+        self.root = Path(root)
+        self.max_age_days = max_age_days
+        self.max_size_mb = max_size_mb
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key):
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached result dict for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if self._expired(path):
+            self._remove(path)
+            return None
+
+        # Record the access time for least-recently-used eviction. The
+        # modification time is kept, it marks when the entry was stored.
+        try:
+            os.utime(path, (time.time(), path.stat().st_mtime))
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, inputs, max_rf1, region, curve=None, job_name=None):
+        """Store a result. curve is a list of (time, U1, RF1) rows."""
+        entry = {
+            'key': key,
+            'job_name': job_name,
+            'created': time.time(),
+            'inputs': inputs,
+            'max_rf1': max_rf1,
+            'region': region,
+            'curve': [list(row) for row in (curve or [])],
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.parent / f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def _entries(self):
+        return [p for p in self.root.glob('*/*.json') if p.is_file()]
+
+    def _expired(self, path):
+        if not self.max_age_days:
+            return False
+        try:
+            age = time.time() - path.stat().st_mtime
+        except OSError:
+            return True
+        return age > self.max_age_days * 86400
+
+    def _remove(self, path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def evict(self):
+        """Remove expired entries, then the least recently used beyond max_size_mb."""
+        removed = 0
+        entries = []
+        for path in self._entries():
+            if self._expired(path):
+                self._remove(path)
+                removed += 1
+            else:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, path))
+
+        if self.max_size_mb:
+            limit = self.max_size_mb * 1024 * 1024
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+                if total <= limit:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+
+        return removed
+
+
+def open_cache(config, project_root):
+    """
+    Create the ResultCache described by the [cache] section of config.ini.
+
+    Returns None if caching is disabled.
+    """
+    if not config.getboolean('cache', 'enabled', fallback=True):
+        return None
+
+    directory = config.get('cache', 'directory', fallback='').strip()
+    root = Path(directory) if directory else Path(project_root) / 'cache'
+    max_age_days = config.getfloat('cache', 'max_age_days', fallback=0) or None
+    max_size_mb = config.getfloat('cache', 'max_size_mb', fallback=0) or None
+    return ResultCache(root, max_age_days=max_age_days, max_size_mb=max_size_mb)
@@ -0,0 +1,182 @@
+"""
+Disk retention of job artifacts after a successful extraction.
+
+A solved point leaves a full ODB (field output at 50 intervals), the saved
+.cae model and, when a job ran directly in the results directory, solver
+leftovers (.stt, .res, .abq, .pac, .prt, ...). Once RF1 and its curve have
+been extracted, a RetentionPolicy ([retention] in config.ini) trims them:
+
+    scratch   delete solver leftovers of the job
+    cae       keep | compress | delete | skip (skip = not saved by the builder)
+    odb       keep | compress | prune  (prune = keep only the extracted curve)
+
+Compressed files (gzip) go to an archive directory. With max_results_gb,
+the oldest ODBs are compressed as well whenever the results directory grows
+beyond the limit. The space reclaimed is reported per job and for the
+batch.
+"""
+
+import csv
+import gzip
+import shutil
+import threading
+from pathlib import Path
+
+# Solver files that are not needed once a job has finished
+SCRATCH_SUFFIXES = ('.stt', '.res', '.abq', '.pac', '.prt', '.sel', '.mdl', '.023', '.lck',
+                    '.com', '.ipm', '.log', '.jnl', '.sim', '.simdir')
+
+CAE_POLICIES = ('keep', 'compress', 'delete', 'skip')
+ODB_POLICIES = ('keep', 'compress', 'prune')
+
+
+def format_size(num_bytes):
+    if abs(num_bytes) < 1024 ** 2:
+        return f"{num_bytes / 1024:.1f} KB"
+    if abs(num_bytes) < 1024 ** 3:
+        return f"{num_bytes / 1024 ** 2:.1f} MB"
+    return f"{num_bytes / 1024 ** 3:.2f} GB"
+
+
+def _size(path):
+    path = Path(path)
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+    return path.stat().st_size
+
+
+def directory_size(path, exclude=()):
+    """Bytes of the files below path, without those below the directories in exclude."""
+    exclude = [Path(e).resolve() for e in exclude]
+    return sum(p.stat().st_size for p in Path(path).resolve().rglob('*')
+               if p.is_file() and not any(e in p.parents for e in exclude))
+
+
+def compress_file(path, archive_dir):
+    """Gzip a file into archive_dir and remove the original. Returns the bytes saved (>= 0)."""
+    path = Path(path)
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / f"{path.name}.gz"
+    size = path.stat().st_size
+    with open(path, 'rb') as source, gzip.open(target, 'wb', compresslevel=6) as archive:
+        shutil.copyfileobj(source, archive, length=1024 * 1024)
+    path.unlink()
+    return max(0, size - target.stat().st_size)
+
+
+def write_curve(path, curve):
+    """Write an extracted Time,U1,RF1 curve (the same format as extract_rf1_single.py)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Time', 'U1', 'RF1'])
+        writer.writerows(curve)
+
+
+class RetentionPolicy:
+    """Trim the artifacts of finished jobs and keep the results directory within limits."""
+
+    def __init__(self, results_dir, scratch=True, cae='keep', odb='keep', archive_dir=None,
+                 curves_dir=None, max_results_gb=None, work_root=None):
+        if cae not in CAE_POLICIES:
+            raise ValueError(f"Unknown cae policy: {cae}. Must be one of {', '.join(CAE_POLICIES)}")
+        if odb not in ODB_POLICIES:
+            raise ValueError(f"Unknown odb policy: {odb}. Must be one of {', '.join(ODB_POLICIES)}")
+        self.results_dir = Path(results_dir)
+        self.scratch = scratch
+        self.cae = cae
+        self.odb = odb
+        self.archive_dir = Path(archive_dir) if archive_dir else self.results_dir / 'archive'
+        self.curves_dir = Path(curves_dir) if curves_dir else self.results_dir / 'curves'
+        self.max_results_gb = max_results_gb
+        # Work directories of running jobs (results/work by default)
+        self.work_root = Path(work_root) if work_root else None
+        self.reclaimed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self):
+        return self.scratch or self.cae != 'keep' or self.odb != 'keep' or bool(self.max_results_gb)
+
+    def builder_options(self):
+        """run_simulations.py options implied by the policy."""
+        return {'save_cae': 0} if self.cae == 'skip' else {}
+
+    def _trim_odb(self, name, curve, policy):
+        odb_path = self.results_dir / f"{name}.odb"
+        if not odb_path.exists():
+            return 0
+        if policy == 'prune':
+            if curve is None:
+                return 0  # Nothing to keep the curve from
+            write_curve(self.curves_dir / f"{name}.csv", curve)
+            size = _size(odb_path)
+            odb_path.unlink()
+            return size
+        return compress_file(odb_path, self.archive_dir)
+
+    def apply(self, name, curve=None):
+        """
+        Trim the artifacts of a job whose results were extracted. curve is
+        the extracted Time,U1,RF1 curve (needed to prune its ODB).
+
+        Returns the number of bytes reclaimed.
+        """
+        reclaimed = 0
+        if self.scratch:
+            for suffix in SCRATCH_SUFFIXES:
+                path = self.results_dir / f"{name}{suffix}"
+                if path.exists():
+                    size = _size(path)
+                    if path.is_dir():
+                        shutil.rmtree(path)
+                    else:
+                        path.unlink()
+                    reclaimed += size
+
+        cae_path = self.results_dir / f"{name}.cae"
+        if cae_path.exists() and self.cae in ('compress', 'delete'):
+            if self.cae == 'compress':
+                reclaimed += compress_file(cae_path, self.archive_dir)
+            else:
+                reclaimed += _size(cae_path)
+                cae_path.unlink()
+
+        if self.odb != 'keep':
+            reclaimed += self._trim_odb(name, curve, self.odb)
+
+        with self._lock:
+            self.reclaimed += reclaimed
+        return reclaimed
+
+    def has_result(self, name):
+        """True if the ODB of a job is still there, archived or pruned to its curve."""
+        return ((self.results_dir / f"{name}.odb").exists()
+                or (self.archive_dir / f"{name}.odb.gz").exists()
+                or (self.curves_dir / f"{name}.csv").exists())
+
+    def enforce_limit(self, exclude=()):
+        """
+        Compress the oldest ODBs in the results directory until it is below
+        max_results_gb (the archive directory and the work directories of
+        running jobs do not count). ODBs of the jobs in exclude (e.g. still
+        being extracted) are left alone.
+        Returns the number of bytes reclaimed.
+        """
+        if not self.max_results_gb:
+            return 0
+        limit = self.max_results_gb * 1024 ** 3
+        reclaimed = 0
+        with self._lock:
+            size = directory_size(self.results_dir, [d for d in (self.archive_dir, self.work_root) if d])
+            for odb_path in sorted(self.results_dir.glob('*.odb'), key=lambda p: p.stat().st_mtime):
+                if size <= limit:
+                    break
+                if odb_path.stem in exclude:
+                    continue
+                size -= _size(odb_path)
+                reclaimed += compress_file(odb_path, self.archive_dir)
+            self.reclaimed += reclaimed
+        return reclaimed
@@ -0,0 +1,80 @@
+"""
+Automatic retries of failed jobs with solver-setting fallbacks.
+
+A point that fails (e.g. excessive element distortion) or stalls leaves a
+hole in the DOE. Instead of counting it as failed right away, run_batch.py
+runs it again with progressively more robust settings. Each rung of the
+ladder adds one fallback to those of the rungs before it:
+
+    mass_scaling      smaller mass-scaling target time increment (less added mass)
+    seed              finer global mesh seed
+    double_precision  Abaqus/Explicit in double precision
+
+Every attempt is recorded in the job ledger with its settings, state, run
+time and cores, so the cost of the retries is visible.
+
+Usage (from run_batch.py):
+    policy = RetryPolicy(['mass_scaling', 'seed', 'double_precision'])
+    for attempt in policy.attempts('SAP'):
+        options = dict(base_options, **attempt.options)
+        ...
+"""
+
+from job_ledger import JOB_FAILED, JOB_TIMED_OUT
+from model_settings import MODEL_DEFAULTS
+
+FALLBACKS = ('mass_scaling', 'seed', 'double_precision')
+
+
+class Attempt:
+    """One run of a job: its number, the fallbacks applied and their options."""
+
+    def __init__(self, number, fallbacks, options):
+        self.number = number
+        self.fallbacks = fallbacks
+        self.options = options
+
+    @property
+    def label(self):
+        return ' + '.join(self.fallbacks) if self.fallbacks else 'default settings'
+
+
+class RetryPolicy:
+    """Which failures are retried and with which fallback ladder."""
+
+    def __init__(self, ladder=FALLBACKS, mass_scaling_factor=0.5, seed_factor=0.75,
+                 retry_states=(JOB_FAILED, JOB_TIMED_OUT)):
+        unknown = [step for step in ladder if step not in FALLBACKS]
+        if unknown:
+            raise ValueError(f"Unknown fallback(s): {', '.join(unknown)}. "
+                             f"Known fallbacks: {', '.join(FALLBACKS)}")
+        self.ladder = list(ladder)
+        self.mass_scaling_factor = mass_scaling_factor
+        self.seed_factor = seed_factor
+        self.retry_states = tuple(retry_states)
+
+    def should_retry(self, state):
+        return state in self.retry_states
+
+    def _options(self, joint_type, fallbacks, base_options):
+        defaults = MODEL_DEFAULTS[joint_type]
+        options = {}
+        if 'mass_scaling' in fallbacks:
+            target = base_options.get('mass_scaling_target', defaults['mass_scaling_target'])
+            options['mass_scaling_target'] = target * self.mass_scaling_factor
+        if 'seed' in fallbacks:
+            options['seed_size'] = round(defaults['seed_size'] * self.seed_factor, 6)
+        if 'double_precision' in fallbacks:
+            options['explicit_precision'] = 'DOUBLE'
+        return options
+
+    def attempts(self, joint_type, base_options=None):
+        """
+        Yield the first attempt (no fallbacks) and then one attempt per rung.
+        Fallbacks start from the settings in base_options (e.g. a calibrated
+        mass-scaling target) where given, else from the builder defaults.
+        """
+        yield Attempt(1, [], {})
+        for rung in range(1, len(self.ladder) + 1):
+            fallbacks = self.ladder[:rung]
+            yield Attempt(rung + 1, fallbacks, self._options(joint_type, fallbacks, base_options or {}))
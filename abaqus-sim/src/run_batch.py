@@ -3,17 +3,108 @@ Wrapper script to run Abaqus simulations from regular Python.
 This script reads config.ini and sim_params.csv, then calls Abaqus
 for each simulation using the single-point mode.
 
+Several simulations can run at the same time. The total core and memory
+budget is packed with N concurrent jobs (e.g. 4 jobs x 7 cores on a
+28-core node), see the [scheduler] section in config.ini.
+
+The state of every design point is recorded in a job ledger
+(results/job_ledger.sqlite). After an interrupted batch, --resume skips
+points that already completed and reruns only the failed, timed-out or
+unfinished ones.
+
+Results are cached by a hash of all solution inputs (see result_cache.py).
+A point that was already solved in an earlier campaign is taken from the
+cache instead of running Abaqus again. The RF1 of every completed point is
+written to results/results.csv.
+
+With --cae-server, the design points are built by long-lived CAE kernels
+(one per concurrent job) instead of starting `abaqus cae` for every point.
+
+With --pipeline, pre-processing and solving are split into two stages: the
+CAE stage only writes the .inp input deck of each point, and the solver is
+started on each deck (`abaqus job=... input=...`) as soon as it is written
+and cores are free. Pre-processing of point n+1 then overlaps with solving
+point n, and the CAE license is only held while a deck is written.
+
+With --patch-variants (implies --pipeline), CAE only writes one master deck
+per (joint type, overlap). Points that differ from it only in film thickness
+or adhesive get a copy of the master deck with rewritten cohesive tables
+(see inp_patch.py), so dense thickness sweeps need almost no pre-processing.
+
+While the batch runs, the .sta file of every running job is followed and
+its step time, increment rate, stable time increment and ETA are printed
+every [monitor] interval seconds, together with an ETA for the batch. The
+output of each Abaqus process is written to results/logs/<job>.log.
+
+With --post-peak-drop 0.5, a job is terminated as soon as its RF1 has
+dropped 50% below the peak (see job_control.py) instead of running to the
+full displacement.
+
+Every Abaqus process runs in its own process group. A watchdog follows
+each job's .sta file and kills only that job when its step time stops
+advancing (see [watchdog] in config.ini), which frees its cores for the
+next point. A single job can also be stopped by hand with
+`python stop_abaqus.py --job <name>`.
+
+Every job runs in its own work directory (<work_root>/<job_name>, see
+[workspace] in config.ini) with an optional local scratch directory. Only
+the final artifacts (.odb, .cae, .inp, .sta, .msg, .dat) are moved into
+results/ when the job has finished.
+
+With --distributed, the points are handed to worker.py processes on other
+nodes through a spool directory on a share (see coordinator.py). With
+--cluster, they are submitted as one Slurm or PBS array job with one array
+task per row of sim_params.csv (see cluster.py). In both modes the results
+are collected here as the points finish.
+
 Usage:
     python run_batch.py
+    python run_batch.py --jobs 4 --cores-per-job 7
+    python run_batch.py --resume
+    python run_batch.py --cae-server
+    python run_batch.py --pipeline --jobs 4
+    python run_batch.py --patch-variants --jobs 4
+    python run_batch.py --post-peak-drop 0.5
+    python run_batch.py --distributed //server/sims/spool
+    python run_batch.py --cluster slurm
 """
 
+import argparse
 import csv
+import functools
 import os
 import sys
 import subprocess
 import configparser
+import threading
+import time
 from pathlib import Path
 
+from benchmark import load_recommendation
+from cae_client import CaeServerPool
+from calibration import calibrated_options, load_calibration
+from cluster import SCHEDULERS, ArrayJobRunner
+from contact_domain import DEFAULT_MARGIN
+from coordinator import Coordinator, RemoteBatch
+from extraction import extract_odb_result
+from inp_patch import patch_cohesive_properties
+from job_control import JobStalled, JobWatchdog, PostPeakWatcher, run_watched, terminate_job
+from job_ledger import JobLedger, JOB_DONE, JOB_FAILED, JOB_TIMED_OUT
+from licensing import TokenPool, abaqus_tokens, best_cores_per_job
+from materials import ADHESIVES
+from mesh_grading import MESH_SUFFIX, read_mesh_report, write_mesh_report
+from naming import format_overlap, job_name
+from output_profiles import DEFAULT_PROFILE, OUTPUT_PROFILES, profile_settings
+from result_cache import open_cache, point_key
+from preflight import preflight_point, preflight_report
+from retention import RetentionPolicy, format_size
+from retry_policy import RetryPolicy
+from runtime_model import RuntimeModel, order_longest_first
+from scheduler import JobScheduler, ScheduledJob, plan_job_resources
+from solver_metrics import collect_metrics, metrics_row, record_metrics
+from sta_monitor import DEFAULT_STEP_TIME, ProgressMonitor
+from workspace import collect_artifacts, job_work_dir, prepare_work_dir, remove_work_dir
+
 
 def find_project_root():
     """Find the project root directory (abaqus-sim)."""
@@ -32,6 +123,13 @@ def find_project_root():
     return current_dir if current_dir.name == 'abaqus-sim' else project_root
 
 
+def load_config(project_root):
+    """Load config.ini from the repo root (empty config if it does not exist)."""
+    config = configparser.ConfigParser()
+    config.read(project_root.parent / 'config.ini')
+    return config
+
+
 def read_config(project_root):
     """Read configuration from config.ini file."""
     # Go up one more level to repo root where config.ini is
@@ -53,6 +151,249 @@ def read_config(project_root):
     return joint_type, adhesive_type, cpu_cores, abaqus_cmd
 
 
+def read_scheduler_config(project_root):
+    """Read the [scheduler] section from config.ini."""
+    config = load_config(project_root)
+    
+    concurrent_jobs = config.getint('scheduler', 'concurrent_jobs', fallback=1)
+    cores_per_job = config.get('scheduler', 'cores_per_job', fallback='').strip()
+    if cores_per_job not in ('auto', 'benchmark'):
+        cores_per_job = int(cores_per_job) if cores_per_job else None
+    memory_percent = config.getint('scheduler', 'memory_percent', fallback=90)
+    
+    return concurrent_jobs, cores_per_job, memory_percent
+
+
+def read_job_order(project_root):
+    """Read the start order of the jobs ([scheduler] order): 'longest' or 'csv'."""
+    return load_config(project_root).get('scheduler', 'order', fallback='longest').strip().lower()
+
+
+def read_retry_config(project_root):
+    """Read the [retry] section from config.ini and return the RetryPolicy."""
+    config = load_config(project_root)
+    
+    ladder = config.get('retry', 'ladder', fallback='mass_scaling, seed, double_precision')
+    ladder = [step.strip() for step in ladder.split(',') if step.strip()]
+    mass_scaling_factor = config.getfloat('retry', 'mass_scaling_factor', fallback=0.5)
+    seed_factor = config.getfloat('retry', 'seed_factor', fallback=0.75)
+    retry_states = [JOB_FAILED]
+    if config.getboolean('retry', 'retry_timed_out', fallback=True):
+        retry_states.append(JOB_TIMED_OUT)
+    
+    return RetryPolicy(ladder, mass_scaling_factor, seed_factor, retry_states)
+
+
+def read_retention_config(project_root, results_dir, work_root=None):
+    """
+    Read the [retention] section from config.ini and return the RetentionPolicy.
+    work_root (the [workspace] work root) does not count towards max_results_gb.
+    """
+    config = load_config(project_root)
+    
+    archive_dir = config.get('retention', 'archive_dir', fallback='').strip() or None
+    max_results_gb = config.getfloat('retention', 'max_results_gb', fallback=0.0) or None
+    
+    return RetentionPolicy(
+        results_dir,
+        scratch=config.getboolean('retention', 'delete_scratch', fallback=True),
+        cae=config.get('retention', 'cae', fallback='keep').strip().lower(),
+        odb=config.get('retention', 'odb', fallback='keep').strip().lower(),
+        archive_dir=archive_dir,
+        max_results_gb=max_results_gb,
+        work_root=work_root,
+    )
+
+
+def read_licensing_config(project_root):
+    """
+    Read the [licensing] section from config.ini.
+    
+    Returns (token_pool, parallel_fraction). token_pool is None if neither a
+    token total nor a status command is set (no token limit).
+    """
+    config = load_config(project_root)
+    
+    total_tokens = config.getint('licensing', 'total_tokens', fallback=0)
+    status_command = config.get('licensing', 'status_command', fallback='').strip() or None
+    feature = config.get('licensing', 'feature', fallback='abaqus').strip()
+    query_interval = config.getfloat('licensing', 'query_interval', fallback=60.0)
+    parallel_fraction = config.getfloat('licensing', 'parallel_fraction', fallback=0.95)
+    
+    token_pool = None
+    if total_tokens or status_command:
+        token_pool = TokenPool(total_tokens, status_command, feature, query_interval)
+    return token_pool, parallel_fraction
+
+
+def read_preflight_config(project_root):
+    """
+    Read the [preflight] section from config.ini.
+    
+    Returns (cost_per_element_increment, step_time): the CPU seconds of one
+    element for one increment on one core, and the step time of the models.
+    """
+    config = load_config(project_root)
+    
+    cost = config.getfloat('preflight', 'cost_per_element_increment', fallback=1e-6)
+    step_time = config.getfloat('preflight', 'step_time', fallback=DEFAULT_STEP_TIME)
+    
+    return cost, step_time
+
+
+def read_monitor_interval(project_root):
+    """Read the progress report interval in seconds from the [monitor] section."""
+    return load_config(project_root).getfloat('monitor', 'interval', fallback=60.0)
+
+
+def read_termination_config(project_root):
+    """Read the [termination] section from config.ini."""
+    config = load_config(project_root)
+    
+    post_peak_drop = config.getfloat('termination', 'post_peak_drop', fallback=0.0)
+    poll_interval = config.getfloat('termination', 'poll_interval', fallback=60.0)
+    
+    return post_peak_drop, poll_interval
+
+
+def read_output_profile(project_root):
+    """Read the output-request profile of the campaign from the [output] section."""
+    return load_config(project_root).get('output', 'profile', fallback=DEFAULT_PROFILE).strip().lower()
+
+
+def read_mesh_config(project_root):
+    """
+    Read the [mesh] section: the coarse seed size of the graded mesh (0 =
+    uniform seed) and whether to model half the width with a symmetry plane.
+    """
+    config = load_config(project_root)
+    coarse_seed_size = config.getfloat('mesh', 'coarse_seed_size', fallback=0.0)
+    half_width = config.getboolean('mesh', 'half_width', fallback=False)
+    return coarse_seed_size, half_width
+
+
+def read_contact_config(project_root):
+    """
+    Read the [contact] section: whether general contact is restricted to the
+    overlap and the margin (mm) of the contact domain around it.
+    """
+    config = load_config(project_root)
+    restricted = config.getboolean('contact', 'restricted', fallback=False)
+    margin = config.getfloat('contact', 'margin', fallback=DEFAULT_MARGIN)
+    return restricted, margin
+
+
+def read_calibration_config(project_root):
+    """True if jobs use the calibrated step settings of results/calibration.json."""
+    return load_config(project_root).getboolean('calibration', 'use_calibration', fallback=True)
+
+
+def campaign_model_options(project_root, joint_type):
+    """
+    Model settings of the campaign that change the solution: the calibrated
+    mass scaling and step time of the joint type (see calibration.py), the
+    graded mesh seed, the half-width symmetry model and the restricted
+    contact domain. Raises ValueError for invalid settings.
+    """
+    model_options = {}
+    if read_calibration_config(project_root):
+        calibration = load_calibration(project_root / 'results' / 'calibration.json', joint_type)
+        if calibration is not None:
+            model_options.update(calibrated_options(calibration))
+    coarse_seed_size, half_width = read_mesh_config(project_root)
+    if coarse_seed_size < 0:
+        raise ValueError(f"coarse_seed_size must not be negative, got {coarse_seed_size}")
+    if coarse_seed_size:
+        model_options['coarse_seed_size'] = coarse_seed_size
+    if half_width:
+        model_options['half_width'] = 1
+    restricted_contact, contact_margin = read_contact_config(project_root)
+    if contact_margin < 0:
+        raise ValueError(f"The contact margin must not be negative, got {contact_margin}")
+    if restricted_contact:
+        model_options.update(restricted_contact=1, contact_margin=contact_margin)
+    return model_options
+
+
+def read_watchdog_config(project_root):
+    """
+    Read the [watchdog] section from config.ini.
+    
+    Returns the JobWatchdog settings as a dict, or None if the watchdog is
+    disabled (jobs then have a fixed 2 hour timeout).
+    """
+    config = load_config(project_root)
+    if not config.getboolean('watchdog', 'enabled', fallback=True):
+        return None
+    
+    return {
+        'startup_timeout': config.getfloat('watchdog', 'startup_timeout', fallback=1800.0),
+        'min_stall': config.getfloat('watchdog', 'min_stall', fallback=300.0),
+        'stall_factor': config.getfloat('watchdog', 'stall_factor', fallback=10.0),
+    }
+
+
+def read_workspace_config(project_root):
+    """
+    Read the [workspace] section from config.ini.
+    
+    Returns (work_root, scratch, keep_failed). work_root defaults to
+    results/work, scratch is None for the Abaqus default.
+    """
+    config = load_config(project_root)
+    
+    work_root = config.get('workspace', 'work_root', fallback='').strip()
+    work_root = Path(work_root) if work_root else project_root / 'results' / 'work'
+    scratch = config.get('workspace', 'scratch', fallback='').strip() or None
+    keep_failed = config.getboolean('workspace', 'keep_failed', fallback=True)
+    
+    return work_root, scratch, keep_failed
+
+
+def read_distributed_config(project_root):
+    """
+    Read the [distributed] section from config.ini.
+    
+    Returns (spool_dir, heartbeat_timeout, max_requeues, startup_timeout).
+    spool_dir defaults to abaqus-sim/spool/distributed and must be on a share
+    all workers can reach.
+    """
+    config = load_config(project_root)
+    
+    spool_dir = config.get('distributed', 'spool_dir', fallback='').strip()
+    spool_dir = Path(spool_dir) if spool_dir else project_root / 'spool' / 'distributed'
+    heartbeat_timeout = config.getfloat('distributed', 'heartbeat_timeout', fallback=300.0)
+    max_requeues = config.getint('distributed', 'max_requeues', fallback=2)
+    startup_timeout = config.getfloat('distributed', 'startup_timeout', fallback=600.0)
+    
+    return spool_dir, heartbeat_timeout, max_requeues, startup_timeout
+
+
+def read_cluster_config(project_root):
+    """
+    Read the [cluster] section from config.ini.
+    
+    Returns (scheduler name, submit command, status command, python command,
+    poll interval, directive settings). Empty commands mean the scheduler's
+    own (sbatch/squeue or qsub/qstat).
+    """
+    config = load_config(project_root)
+    
+    scheduler = config.get('cluster', 'scheduler', fallback='slurm').strip().lower()
+    submit_command = config.get('cluster', 'submit_command', fallback='').strip() or None
+    status_command = config.get('cluster', 'status_command', fallback='').strip() or None
+    python_cmd = config.get('cluster', 'python_command', fallback='python').strip()
+    poll_interval = config.getfloat('cluster', 'poll_interval', fallback=30.0)
+    settings = {
+        'partition': config.get('cluster', 'partition', fallback='').strip(),
+        'account': config.get('cluster', 'account', fallback='').strip(),
+        'time_limit': config.get('cluster', 'time_limit', fallback='').strip(),
+        'max_parallel': config.getint('cluster', 'max_parallel', fallback=0),
+    }
+    
+    return scheduler, submit_command, status_command, python_cmd, poll_interval, settings
+
+
 def convert_unc_to_drive(path_str):
     """
     Convert UNC path to mapped drive letter if possible.
@@ -88,8 +429,52 @@ def convert_unc_to_drive(path_str):
         return path_str
 
 
-def run_abaqus_simulation(overlap, adhesive, film_thickness, cores, joint_type, project_root, abaqus_cmd='abaqus'):
-    """Run a single Abaqus simulation using subprocess."""
+def run_logged(cmd, cwd, log_path, timeout, watchdog=None, on_start=None):
+    """
+    Run a command with its output streamed to log_path.
+    
+    With a watchdog (see job_control.JobWatchdog), the fixed timeout is
+    replaced by stall detection. on_start(pid) is called once the process
+    has been started.
+    
+    Returns the return code. Raises subprocess.TimeoutExpired on timeout
+    and JobStalled if the watchdog killed the job.
+    """
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'w') as log:
+        log.write(f"$ {' '.join(cmd)}\n")
+        log.flush()
+        return run_watched(cmd, cwd, log, watchdog, timeout=None if watchdog else timeout,
+                           on_start=on_start)
+
+
+def print_log_tail(log_path, lines=20):
+    """Print the last lines of a job log, e.g. after a failure."""
+    try:
+        with open(log_path, 'r', errors='replace') as f:
+            tail = f.readlines()[-lines:]
+    except OSError:
+        return
+    print(f"Last lines of {log_path}:")
+    print(''.join(tail).rstrip())
+
+
+def run_abaqus_simulation(overlap, adhesive, film_thickness, cores, joint_type, project_root,
+                          abaqus_cmd='abaqus', options=None, watchdog=None, on_start=None,
+                          log_path=None):
+    """
+    Run a single Abaqus simulation using subprocess.
+    
+    options is an optional dict of extra settings (e.g. {'memory': 22}) that
+    are passed to run_simulations.py as name=value arguments.
+    
+    The output of Abaqus is written to log_path (default:
+    results/logs/<job_name>.log). With a watchdog, the job is killed when it
+    stalls instead of after 2 hours.
+    
+    Returns the final job state: JOB_DONE, JOB_FAILED or JOB_TIMED_OUT.
+    """
     
     # Get full path to run_simulations.py and convert UNC to drive letter if needed
     run_script = project_root / 'src' / 'run_simulations.py'
@@ -110,45 +495,186 @@ def run_abaqus_simulation(overlap, adhesive, film_thickness, cores, joint_type,
         str(cores),
         joint_type
     ]
+    for name, value in (options or {}).items():
+        cmd.append(f'{name}={value}')
+    
+    if log_path is None:
+        log_path = project_root / 'results' / 'logs' / f"{job_name(joint_type, overlap, film_thickness, adhesive)}.log"
     
     print(f"\nRunning: {' '.join(cmd)}")
     print(f"Working directory: {project_root_str}")
+    print(f"Log file: {log_path}")
     
     try:
         # Run the command from the project root directory
-        result = subprocess.run(
-            cmd,
-            cwd=project_root_str,
-            capture_output=True,
-            text=True,
-            timeout=7200  # 2 hour timeout per simulation
-        )
-        
-        # Print output
-        if result.stdout:
-            print(result.stdout)
+        returncode = run_logged(cmd, project_root_str, log_path,
+                                timeout=7200,  # 2 hour timeout per simulation
+                                watchdog=watchdog, on_start=on_start)
         
-        if result.returncode != 0:
-            print(f"ERROR: Simulation failed with return code {result.returncode}")
-            if result.stderr:
-                print(f"Error output: {result.stderr}")
-            return False
+        if returncode != 0:
+            print(f"ERROR: Simulation failed with return code {returncode}")
+            print_log_tail(log_path)
+            return JOB_FAILED
         
-        return True
+        return JOB_DONE
         
     except subprocess.TimeoutExpired:
         print("ERROR: Simulation timed out after 2 hours")
-        return False
+        return JOB_TIMED_OUT
+    except JobStalled as e:
+        print(f"ERROR: Simulation stalled and was killed: {e}")
+        return JOB_TIMED_OUT
     except FileNotFoundError:
         print("ERROR: 'abaqus' command not found. Make sure Abaqus is installed and in PATH")
-        return False
+        return JOB_FAILED
     except Exception as e:
         print(f"ERROR: Unexpected error running simulation: {e}")
-        return False
+        return JOB_FAILED
+
+
+def run_abaqus_solver(name, work_dir, cores, memory, abaqus_cmd='abaqus', timeout=7200,
+                      watchdog=None, on_start=None, scratch=None, log_dir=None, datacheck=False,
+                      domains=None, threads_per_process=None):
+    """
+    Run the solver on an input deck <work_dir>/<name>.inp written in split mode.
+    
+    The output of the solver is written to <log_dir>/<name>_solver.log
+    (default: <work_dir>/logs). scratch is passed to Abaqus as the scratch
+    directory if given. With datacheck, only the pre-processor and packager
+    run (log <name>_datacheck.log). domains defaults to the core count.
+    
+    Returns the final job state: JOB_DONE, JOB_FAILED or JOB_TIMED_OUT.
+    """
+    cmd = [
+        abaqus_cmd,
+        f'job={name}',
+        f'input={name}.inp',
+        f'cpus={cores}',
+        f'domains={domains or cores}',
+        f'memory={memory}%',
+        'interactive'
+    ]
+    if threads_per_process and threads_per_process > 1:
+        cmd.insert(-1, f'threads_per_mpi_process={threads_per_process}')
+    if scratch:
+        cmd.insert(-1, f'scratch={scratch}')
+    if datacheck:
+        cmd.insert(-1, 'datacheck')
+    
+    log_name = f"{name}_datacheck.log" if datacheck else f"{name}_solver.log"
+    log_path = Path(log_dir or Path(work_dir) / 'logs') / log_name
+    
+    print(f"\nRunning: {' '.join(cmd)}")
+    
+    try:
+        returncode = run_logged(cmd, convert_unc_to_drive(str(work_dir)), log_path, timeout,
+                                watchdog, on_start)
+        
+        if returncode != 0:
+            print(f"ERROR: Solver failed for {name} with return code {returncode}")
+            print_log_tail(log_path)
+            return JOB_FAILED
+        
+        return JOB_DONE
+        
+    except subprocess.TimeoutExpired:
+        print(f"ERROR: Solver for {name} timed out after {timeout / 3600:.0f} hours")
+        return JOB_TIMED_OUT
+    except JobStalled as e:
+        print(f"ERROR: Solver for {name} stalled and was killed: {e}")
+        return JOB_TIMED_OUT
+    except FileNotFoundError:
+        print("ERROR: 'abaqus' command not found. Make sure Abaqus is installed and in PATH")
+        return JOB_FAILED
+    except Exception as e:
+        print(f"ERROR: Unexpected error running solver: {e}")
+        return JOB_FAILED
+
+
+RESULTS_HEADER = ['ODB_File', 'Overlap_mm', 'Adhesive_Thickness_mm', 'Adhesive', 'Max_RF1', 'Region']
+
+_results_lock = threading.Lock()
 
 
-def main():
+def append_result(results_file, name, point, max_rf1, region):
+    """
+    Add or replace the row of a job in the batch results CSV.
+    
+    The CSV has the same columns as the output of extract_values.py, so it
+    can be used directly for the surrogate models.
+    """
+    row = [f"{name}.odb", round(point['overlap'], 4), round(point['film_thickness'], 4),
+           point['adhesive'], max_rf1, region]
+    with _results_lock:
+        rows = []
+        if results_file.exists():
+            with open(results_file, 'r', newline='') as f:
+                rows = [r for r in csv.reader(f)][1:]
+        rows = [r for r in rows if r and r[0] != row[0]] + [row]
+        with open(results_file, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(RESULTS_HEADER)
+            writer.writerows(rows)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the Abaqus simulations listed in sim_params.csv.")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="number of concurrent jobs (default: [scheduler] concurrent_jobs)")
+    parser.add_argument('--cores-per-job', type=int, default=None,
+                        help="cores per job (default: cpu_cores split evenly across jobs)")
+    parser.add_argument('--memory', type=int, default=None,
+                        help="total memory budget in percent (default: [scheduler] memory_percent)")
+    parser.add_argument('--order', choices=('longest', 'csv'), default=None,
+                        help="start the longest predicted jobs first, or keep the CSV order "
+                             "(default: [scheduler] order)")
+    parser.add_argument('--preflight', action='store_true',
+                        help="build every point and run an Abaqus datacheck on it, report element "
+                             "counts, stable increments and the predicted CPU hours, but do not solve")
+    parser.add_argument('--resume', action='store_true',
+                        help="skip points the job ledger records as done, rerun the rest")
+    parser.add_argument('--ledger', default=None,
+                        help="path of the job ledger database (default: results/job_ledger.sqlite)")
+    parser.add_argument('--no-retry', action='store_true',
+                        help="count failed jobs as failed instead of retrying them with fallback settings")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the result cache and run every point")
+    parser.add_argument('--cae-server', action='store_true',
+                        help="build all points in long-lived CAE kernels (one per concurrent job)")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="write input decks in CAE and run the solver on them in a separate stage")
+    parser.add_argument('--patch-variants', action='store_true',
+                        help="build one master deck per overlap in CAE and derive the thickness and "
+                             "adhesive variants by patching it (implies --pipeline)")
+    parser.add_argument('--post-peak-drop', type=float, default=None,
+                        help="terminate a job once RF1 has dropped this fraction below its peak, "
+                             "0 to run to the full displacement (default: [termination] post_peak_drop)")
+    parser.add_argument('--output-profile', choices=list(OUTPUT_PROFILES), default=None,
+                        help="output requests of the jobs (default: [output] profile)")
+    parser.add_argument('--distributed', nargs='?', const='', default=None, metavar='SPOOL',
+                        help="hand the points to worker.py processes on other nodes through a shared "
+                             "spool directory (default: [distributed] spool_dir)")
+    parser.add_argument('--cluster', nargs='?', const='', default=None, metavar='SCHEDULER',
+                        help="submit the points as a Slurm or PBS array job, one task per row "
+                             "(slurm or pbs, default: [cluster] scheduler)")
+    parser.add_argument('--monitor-interval', type=float, default=None,
+                        help="seconds between progress reports, 0 to disable (default: [monitor] interval)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main execution function."""
+    args = parse_args(argv)
+    if args.patch_variants:
+        args.pipeline = True
+    remote = [flag for flag, value in (('--distributed', args.distributed), ('--cluster', args.cluster))
+              if value is not None]
+    if remote and (args.pipeline or args.cae_server or args.preflight or len(remote) > 1):
+        print(f"ERROR: {' and '.join(remote)} cannot be combined with each other or with "
+              f"--pipeline, --patch-variants, --cae-server or --preflight")
+        return 1
+    
     print("=" * 60)
     print("Abaqus Batch Simulation Runner (Python Wrapper)")
     print("=" * 60)
@@ -159,11 +685,91 @@ def main():
     
     # Read configuration
     joint_type, adhesive_type, default_cores, abaqus_cmd = read_config(project_root)
+    concurrent_jobs, cores_per_job, memory_percent = read_scheduler_config(project_root)
+    if args.jobs is not None:
+        concurrent_jobs = args.jobs
+    if args.cores_per_job is not None:
+        cores_per_job = args.cores_per_job
+    if args.memory is not None:
+        memory_percent = args.memory
+    
+    post_peak_drop, termination_poll = read_termination_config(project_root)
+    if args.post_peak_drop is not None:
+        post_peak_drop = args.post_peak_drop
+    if not 0 <= post_peak_drop < 1:
+        print(f"\nERROR: post_peak_drop must be between 0 and 1, got {post_peak_drop}")
+        return 1
+    # Only part of the cache key when enabled, so existing entries stay valid
+    solution_options = {'post_peak_drop': post_peak_drop} if post_peak_drop else None
+    
+    # Model settings that change the solution as well
+    try:
+        model_options = campaign_model_options(project_root, joint_type)
+    except ValueError as e:
+        print(f"\nERROR: {e}")
+        return 1
+    if model_options:
+        solution_options = dict(solution_options or {}, **model_options)
+    
+    token_pool, parallel_fraction = read_licensing_config(project_root)
+    run_options = {}  # Parallel layout of every job (see benchmark.py)
+    try:
+        if cores_per_job == 'benchmark':
+            benchmark_path = project_root / 'results' / 'benchmark.json'
+            recommended = load_recommendation(benchmark_path, joint_type)
+            if recommended is None:
+                raise ValueError(f"no {joint_type} recommendation in {benchmark_path}, "
+                                 f"run src/benchmark.py first")
+            concurrent_jobs = recommended['concurrent_jobs']
+            cores_per_job = recommended['cores_per_job']
+            run_options = {'domains': recommended['domains'],
+                           'threads_per_process': recommended['threads_per_process'],
+                           'load_balancing': int(recommended['load_balancing'])}
+        elif cores_per_job == 'auto':
+            # Highest throughput per token with at most concurrent_jobs jobs
+            token_budget = token_pool.capacity(0) if token_pool is not None else 0
+            cores_per_job, concurrent_jobs = best_cores_per_job(default_cores, token_budget,
+                                                                concurrent_jobs, parallel_fraction)
+        cores, memory = plan_job_resources(default_cores, memory_percent, concurrent_jobs, cores_per_job)
+        if token_pool is not None and token_pool.total_tokens and abaqus_tokens(cores) > token_pool.total_tokens:
+            raise ValueError(f"a job on {cores} cores needs {abaqus_tokens(cores)} license tokens, "
+                             f"the pool has {token_pool.total_tokens}")
+    except ValueError as e:
+        print(f"\nERROR: Invalid scheduler settings: {e}")
+        return 1
+    run_options.update(model_options)
+    output_profile = args.output_profile or read_output_profile(project_root)
+    try:
+        profile_settings(output_profile)
+    except ValueError as e:
+        print(f"\nERROR: {e}")
+        return 1
+    run_options['output_profile'] = output_profile
+    
     print(f"Configuration:")
     print(f"  Joint type: {joint_type}")
     print(f"  Adhesive type: {adhesive_type}")
     print(f"  CPU cores: {default_cores}")
     print(f"  Abaqus command: {abaqus_cmd}")
+    print(f"  Concurrent jobs: {concurrent_jobs} x {cores} cores, {memory}% memory each")
+    if 'domains' in run_options:
+        print(f"  Benchmarked layout: {run_options['domains']} domains, "
+              f"{run_options['threads_per_process']} thread(s) per process"
+              f"{', load balancing' if run_options['load_balancing'] else ''}")
+    if 'step_time' in model_options:
+        print(f"  Calibrated step: mass-scaling target {model_options['mass_scaling_target']:g} s, "
+              f"step time {model_options['step_time']:g} s")
+    if 'coarse_seed_size' in model_options:
+        print(f"  Graded mesh: coarsened to {model_options['coarse_seed_size']:g} mm towards the clamps")
+    if 'half_width' in model_options:
+        print("  Half-width model: symmetry plane at mid-width, RF1 scaled to the full width")
+    if 'restricted_contact' in model_options:
+        print(f"  Restricted contact: overlap faces within {model_options['contact_margin']:g} mm")
+    if token_pool is not None:
+        print(f"  License tokens: {abaqus_tokens(cores)} per job, pool of {token_pool.capacity(0)}")
+    if post_peak_drop:
+        print(f"  Post-peak termination: {post_peak_drop * 100:.0f}% below peak RF1")
+    print(f"  Output profile: {output_profile}")
     
     # Find and read sim_params.csv
     params_file = project_root / 'inputs' / 'sim_params.csv'
@@ -177,9 +783,39 @@ def main():
     
     print(f"\nReading parameters from: {params_file}")
     
+    results_dir = project_root / 'results'
+    results_dir.mkdir(parents=True, exist_ok=True)
+    ledger_path = Path(args.ledger) if args.ledger else results_dir / 'job_ledger.sqlite'
+    ledger = JobLedger(ledger_path)
+    print(f"Job ledger: {ledger_path}")
+    
+    job_order = args.order or read_job_order(project_root)
+    if job_order not in ('longest', 'csv'):
+        print(f"\nERROR: Unknown job order '{job_order}' (use longest or csv)")
+        return 1
+    # Fitted before the points are queued again, which resets their ledger state
+    runtime_model = RuntimeModel(parallel_fraction).fit(ledger.timings())
+    
+    # The preflight estimates every point and leaves cache and ledger untouched
+    cache = None if args.no_cache or args.preflight else open_cache(load_config(project_root), project_root)
+    if cache is not None:
+        print(f"Result cache: {cache.root}")
+    results_file = results_dir / 'results.csv'
+    metrics_file = results_dir / 'solver_metrics.csv'
+    work_root, scratch, keep_failed = read_workspace_config(project_root)
+    try:
+        retention = read_retention_config(project_root, results_dir, work_root)
+    except ValueError as e:
+        print(f"\nERROR: Invalid retention settings: {e}")
+        return 1
+    print(f"Work directories: {work_root}")
+    
     # Read and process simulations
     successful = 0
     failed = 0
+    skipped = 0
+    cached = 0
+    jobs = []
     
     try:
         with open(params_file, 'r') as f:
@@ -192,50 +828,411 @@ def main():
             print("=" * 60)
             
             for i, params in enumerate(simulations, 1):
-                print(f"\n[{i}/{total}] Processing simulation {i}:")
-                
                 try:
                     # Extract DOE parameters from CSV
                     overlap = float(params['Overlap'])
                     film_thickness = float(params['Film_thickness'])
-                    
-                    # Use config values for adhesive and cores (same for all simulations)
-                    adhesive = adhesive_type
-                    cores = default_cores
-                    
-                    print(f"  Overlap: {overlap} mm")
-                    print(f"  Film thickness: {film_thickness} mm")
-                    print(f"  Adhesive: {adhesive}")
-                    print(f"  Cores: {cores}")
-                    print(f"  Joint type: {joint_type}")
-                    
-                    # Run the simulation
-                    success = run_abaqus_simulation(
-                        overlap, adhesive, film_thickness, 
-                        cores, joint_type, project_root, abaqus_cmd
-                    )
-                    
-                    if success:
-                        successful += 1
-                        print(f"✓ Simulation {i} completed successfully")
-                    else:
-                        failed += 1
-                        print(f"✗ Simulation {i} failed")
-                        
                 except KeyError as e:
-                    print(f"ERROR: Missing column in CSV: {e}")
+                    print(f"[{i}/{total}] ERROR: Missing column in CSV: {e}")
                     failed += 1
+                    continue
                 except ValueError as e:
-                    print(f"ERROR: Invalid value in CSV: {e}")
-                    failed += 1
-                except Exception as e:
-                    print(f"ERROR: Unexpected error: {e}")
+                    print(f"[{i}/{total}] ERROR: Invalid value in CSV: {e}")
                     failed += 1
+                    continue
+                
+                name = job_name(joint_type, overlap, film_thickness, adhesive_type)
+                
+                if args.resume and ledger.state(name) == JOB_DONE:
+                    if retention.has_result(name):
+                        print(f"[{i}/{total}] Skipping {name} (already done)")
+                        skipped += 1
+                        continue
+                    print(f"[{i}/{total}] {name} is marked done but its ODB is missing, rerunning")
+                
+                if not args.preflight:
+                    ledger.enqueue(name, joint_type, overlap, film_thickness, adhesive_type, cores)
+                
+                # Use config values for adhesive (same for all simulations)
+                payload = {
+                    'index': i,
+                    'name': name,
+                    'overlap': overlap,
+                    'film_thickness': film_thickness,
+                    'adhesive': adhesive_type,
+                    'joint_type': joint_type,
+                    'work_dir': job_work_dir(work_root, name),
+                }
+                
+                if cache is not None:
+                    payload['cache_key'], payload['cache_inputs'] = point_key(
+                        joint_type, adhesive_type, overlap, film_thickness, solution_options)
+                    entry = cache.get(payload['cache_key'])
+                    if entry is not None:
+                        print(f"[{i}/{total}] Cache hit for {name}: RF1 = {entry['max_rf1']:.2f}")
+                        append_result(results_file, name, payload, entry['max_rf1'], entry['region'])
+                        ledger.mark_finished(name, JOB_DONE, message='cache hit')
+                        cached += 1
+                        continue
+                
+                jobs.append(ScheduledJob(name, cores, memory, payload))
     
     except Exception as e:
         print(f"\nERROR: Failed to read CSV file: {e}")
         return 1
     
+    if job_order == 'longest' and jobs:
+        for job in jobs:
+            point = job.payload
+            point['predicted_runtime'] = runtime_model.predict(
+                point['joint_type'], point['overlap'], point['film_thickness'], job.cores)
+        jobs = order_longest_first(jobs, lambda job: job.payload['predicted_runtime'])
+        print(f"\nStarting the longest jobs first, runtime model: {runtime_model.describe()}")
+        if runtime_model.samples:
+            longest = jobs[0]
+            print(f"  Longest: {longest.name}, ~{longest.payload['predicted_runtime'] / 60:.1f} min")
+    
+    def build_point(job, options, watchdog=None, on_start=None):
+        """Run a point through CAE (build, and unless write_input is set, solve)."""
+        point = job.payload
+        options = dict(retention.builder_options(), **run_options, **options)
+        options['work_dir'] = convert_unc_to_drive(str(point['work_dir']))
+        if scratch:
+            options['scratch'] = scratch
+        if cae_servers is None:
+            return run_abaqus_simulation(
+                point['overlap'], point['adhesive'], point['film_thickness'],
+                job.cores, point['joint_type'], project_root, abaqus_cmd,
+                options=options, watchdog=watchdog, on_start=on_start
+            )
+        
+        # On a stall or timeout the server owns the solver process, so end only
+        # the analysis; run_point then waits for the server to let go of the
+        # work directory before the attempt returns
+        result = cae_servers.run_point(
+            point['overlap'], point['adhesive'], point['film_thickness'],
+            job.cores, point['joint_type'], options=options,
+            timeout=None if watchdog else 7200, watchdog=watchdog,
+            on_abandon=lambda: terminate_job(point['name'], point['work_dir'], abaqus_cmd)
+        )
+        if result is None and watchdog is not None and watchdog.reason:
+            print(f"ERROR: {point['name']} stalled: {watchdog.reason}")
+            return JOB_TIMED_OUT
+        if result is None:
+            return JOB_TIMED_OUT if cae_servers.alive() else JOB_FAILED
+        return JOB_DONE if result.get('success') else JOB_FAILED
+    
+    def derive_input_deck(point, master_name, master_deck, master_mesh=None):
+        """
+        Write the input deck of a point by patching the cohesive tables of a
+        master deck. The point shares the mesh, and with it the mesh report, of
+        the master.
+        """
+        try:
+            deck = patch_cohesive_properties(master_deck, ADHESIVES[point['adhesive']],
+                                             point['film_thickness'])
+            (point['work_dir'] / f"{point['name']}.inp").write_text(deck)
+            if master_mesh is not None:
+                write_mesh_report(point['work_dir'] / f"{point['name']}{MESH_SUFFIX}", point['name'],
+                                  master_mesh['seed_size'], master_mesh['coarse_seed_size'],
+                                  master_mesh['elements'], master_mesh.get('width_fraction', 1.0))
+        except KeyError:
+            print(f"ERROR: Unknown adhesive type '{point['adhesive']}'")
+            return JOB_FAILED
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Could not patch master deck {master_name}.inp: {e}")
+            return JOB_FAILED
+        return JOB_DONE
+    
+    def write_input_decks():
+        """CAE stage of the pipeline: write the input deck of every point in turn."""
+        # Name, text and mesh report of the master deck per (joint type,
+        # overlap), only used with --patch-variants. They are kept in memory
+        # because the master's work directory is removed once it has been solved.
+        masters = {}
+        for job in jobs:
+            point = job.payload
+            ledger.mark_running(point['name'])
+            prepare_work_dir(point['work_dir'])
+            master_key = (point['joint_type'], format_overlap(point['overlap']))
+            master_name, master_deck, master_mesh = (masters.get(master_key, (None, None, None))
+                                                     if args.patch_variants else (None, None, None))
+            if master_name is not None:
+                print(f"\n[{point['index']}/{total}] Deriving input deck for {point['name']} from {master_name}")
+                state = derive_input_deck(point, master_name, master_deck, master_mesh)
+            else:
+                print(f"\n[{point['index']}/{total}] Writing input deck for {point['name']}")
+                try:
+                    state = build_point(job, {'memory': job.memory, 'write_input': 1})
+                except Exception as e:
+                    print(f"ERROR: Unexpected error writing input deck: {e}")
+                    state = JOB_FAILED
+            input_deck = point['work_dir'] / f"{point['name']}.inp"
+            if state == JOB_DONE and not input_deck.exists():
+                print(f"ERROR: Input deck {point['name']}.inp was not written")
+                state = JOB_FAILED
+            if state == JOB_DONE and master_name is None and args.patch_variants:
+                masters[master_key] = (point['name'], input_deck.read_text(),
+                                       read_mesh_report(point['work_dir'] / f"{point['name']}{MESH_SUFFIX}"))
+            point['input_state'] = state
+            scheduler.wake()
+    
+    def run_attempt(job, attempt):
+        """Run one attempt of a job in its work directory. Returns (state, message)."""
+        point = job.payload
+        work_dir = point['work_dir']
+        # The first attempt of the pipeline solves the deck written by the CAE stage
+        use_deck = args.pipeline and attempt.number == 1
+        if not use_deck:
+            prepare_work_dir(work_dir)
+        monitor.add(point['name'], work_dir=work_dir)
+        watchdog = None
+        if watchdog_settings is not None:
+            watchdog = JobWatchdog(point['name'], work_dir / f"{point['name']}.sta",
+                                   **watchdog_settings)
+        record_pid = lambda pid: ledger.set_pid(point['name'], pid)
+        watcher = None
+        if post_peak_drop:
+            watcher = PostPeakWatcher(point['name'], work_dir, abaqus_cmd,
+                                      post_peak_drop, termination_poll)
+            watcher.start()
+        try:
+            if use_deck:
+                state = point['input_state']
+                if state == JOB_DONE:
+                    state = run_abaqus_solver(point['name'], work_dir, job.cores, job.memory,
+                                              abaqus_cmd, watchdog=watchdog, on_start=record_pid,
+                                              scratch=scratch, log_dir=results_dir / 'logs',
+                                              domains=run_options.get('domains'),
+                                              threads_per_process=run_options.get('threads_per_process'))
+            else:
+                ledger.mark_running(point['name'])
+                state = build_point(job, dict(attempt.options, memory=job.memory), watchdog, record_pid)
+        finally:
+            monitor.finish(point['name'])
+            if watcher is not None:
+                watcher.stop()
+        
+        message = None
+        if state == JOB_TIMED_OUT and watchdog is not None and watchdog.reason:
+            message = f"stalled: {watchdog.reason}"
+        if watcher is not None and watcher.terminated:
+            # Abaqus reports a terminated analysis as an error, the ODB is complete up to the drop
+            state = JOB_DONE
+            message = 'terminated after peak'
+            print(f"  {point['name']} was terminated after the peak, continuing with its ODB")
+        
+        # Move the final artifacts into the results store
+        try:
+            collect_artifacts(work_dir, results_dir, point['name'])
+        except OSError as e:
+            print(f"ERROR: Could not move results of {point['name']} from {work_dir}: {e}")
+            state = JOB_FAILED
+        if state == JOB_DONE or not keep_failed:
+            remove_work_dir(work_dir)
+        else:
+            print(f"  Work directory kept for inspection: {work_dir}")
+        return state, message
+    
+    def archive_logs(name, attempt_number):
+        """Keep the logs of a failed attempt as <name>[_solver]_attempt<n>.log."""
+        for log_path in (results_dir / 'logs').glob(f"{name}*.log"):
+            if '_attempt' not in log_path.stem:
+                log_path.replace(log_path.with_name(f"{log_path.stem}_attempt{attempt_number}.log"))
+    
+    def run_job(job):
+        point = job.payload
+        print(f"\n[{point['index']}/{total}] Starting simulation {point['index']}:")
+        print(f"  Overlap: {point['overlap']} mm")
+        print(f"  Film thickness: {point['film_thickness']} mm")
+        print(f"  Adhesive: {point['adhesive']}")
+        print(f"  Cores: {job.cores}")
+        print(f"  Memory: {job.memory}%")
+        print(f"  Joint type: {point['joint_type']}")
+        
+        cache_key, cache_inputs = point.get('cache_key'), point.get('cache_inputs')
+        cached_entry = None
+        for attempt in retry_policy.attempts(point['joint_type'], model_options):
+            if attempt.number > 1:
+                archive_logs(point['name'], attempt.number - 1)
+                print(f"\n  Retrying {point['name']} (attempt {attempt.number}) with {attempt.label}")
+                if cache is not None:
+                    # The fallback settings are part of the solution, look them up separately
+                    cache_key, cache_inputs = point_key(
+                        point['joint_type'], point['adhesive'], point['overlap'], point['film_thickness'],
+                        dict(solution_options or {}, **attempt.options))
+                    cached_entry = cache.get(cache_key)
+                    if cached_entry is not None:
+                        print(f"  Cache hit for {point['name']} with {attempt.label}")
+                        state, message = JOB_DONE, 'cache hit'
+                        break
+            
+            started = time.time()
+            state, message = run_attempt(job, attempt)
+            ledger.record_attempt(point['name'], attempt.number, attempt.options, state,
+                                  started, time.time(), job.cores, message)
+            if attempt.number > 1:
+                retry_costs.append(job.cores * (time.time() - started))
+            if not retry_policy.should_retry(state):
+                break
+        
+        if attempt.number > 1 and state == JOB_DONE:
+            message = f"attempt {attempt.number} ({attempt.label})" + (f", {message}" if message else '')
+            rescued.append(point['name'])
+        
+        curve = None
+        ke_ie_ratio = None
+        if state == JOB_DONE and cached_entry is not None:
+            curve = cached_entry.get('curve')
+            append_result(results_file, point['name'], point, cached_entry['max_rf1'], cached_entry['region'])
+        elif state == JOB_DONE:
+            odb_path = results_dir / f"{point['name']}.odb"
+            extracting.add(point['name'])
+            try:
+                result = extract_odb_result(odb_path, abaqus_cmd)
+            finally:
+                extracting.discard(point['name'])
+            if result is None:
+                print(f"ERROR: Could not extract RF1 from {odb_path}")
+                state = JOB_FAILED
+            else:
+                curve = result['curve']
+                ke_ie_ratio = result.get('ke_ie_ratio')
+                if cache is not None:
+                    cache.put(cache_key, cache_inputs, result['max_rf1'],
+                              result['region'], curve, job_name=point['name'])
+                append_result(results_file, point['name'], point, result['max_rf1'], result['region'])
+        
+        if cached_entry is None:
+            record_metrics(metrics_file, metrics_row(point['name'], collect_metrics(results_dir, point['name']),
+                                                     state, job.cores, ke_ie_ratio))
+        
+        if state == JOB_DONE and retention.active:
+            freed = retention.apply(point['name'], curve) + retention.enforce_limit(exclude=extracting)
+            if freed:
+                print(f"  Reclaimed {format_size(freed)} of disk space after {point['name']}")
+        
+        ledger.mark_finished(point['name'], state, message)
+        monitor.job_done(time.time() - job.start_time)
+        
+        if state == JOB_DONE:
+            print(f"✓ Simulation {point['index']} completed successfully")
+        else:
+            print(f"✗ Simulation {point['index']} {state}")
+        return state == JOB_DONE
+    
+    def preflight_job(job):
+        """Build a point, run a datacheck on its deck and estimate its cost."""
+        point = job.payload
+        print(f"\n[{point['index']}/{total}] Datacheck of {point['name']}")
+        check = preflight_point(
+            point['name'], point['work_dir'],
+            build=lambda: build_point(job, {'memory': job.memory, 'write_input': 1}),
+            datacheck=lambda: run_abaqus_solver(point['name'], point['work_dir'], job.cores, job.memory,
+                                                abaqus_cmd, timeout=3600, scratch=scratch,
+                                                log_dir=results_dir / 'logs', datacheck=True),
+            step_time=model_options.get('step_time', step_time),
+            cost_per_element_increment=cost_per_element_increment, cores=job.cores,
+            parallel_fraction=parallel_fraction, keep_failed=keep_failed)
+        preflight_checks[point['name']] = check
+        return check['state'] == JOB_DONE and not check['errors']
+    
+    cluster_runner = None
+    if args.cluster is not None:
+        scheduler_name, submit_cmd, status_cmd, python_cmd, cluster_poll, cluster_settings = \
+            read_cluster_config(project_root)
+        scheduler_name = args.cluster or scheduler_name
+        if scheduler_name not in SCHEDULERS:
+            print(f"\nERROR: Unknown cluster scheduler '{scheduler_name}' (use {' or '.join(SCHEDULERS)})")
+            return 1
+        array_dir = project_root / 'spool' / f"array_{time.strftime('%Y%m%d_%H%M%S')}"
+        cluster_runner = ArrayJobRunner(SCHEDULERS[scheduler_name](), array_dir, project_root,
+                                        cluster_settings, submit_cmd, status_cmd, python_cmd,
+                                        cluster_poll)
+        print(f"Cluster: {scheduler_name} array job, files in {array_dir}")
+    
+    cae_servers = None
+    if args.cae_server and jobs:
+        # In the pipeline only one CAE stage writes decks, so one server is enough
+        spool_dir = project_root / 'spool' / f"cae_{os.getpid()}"
+        cae_servers = CaeServerPool(spool_dir, abaqus_cmd, project_root,
+                                    size=1 if args.pipeline else min(concurrent_jobs, len(jobs)))
+        cae_servers.start()
+    
+    watchdog_settings = read_watchdog_config(project_root)
+    
+    try:
+        retry_policy = RetryPolicy([]) if args.no_retry else read_retry_config(project_root)
+    except ValueError as e:
+        print(f"\nERROR: Invalid retry settings: {e}")
+        return 1
+    if retry_policy.ladder and not remote and not args.preflight:
+        print(f"Retries of failed jobs: {', '.join(retry_policy.ladder)}")
+    retry_costs = []
+    rescued = []
+    extracting = set()  # Jobs whose ODB is being extracted, not to be compressed
+    
+    cost_per_element_increment, step_time = read_preflight_config(project_root)
+    preflight_checks = {}
+    
+    monitor_interval = args.monitor_interval
+    if monitor_interval is None:
+        monitor_interval = read_monitor_interval(project_root)
+    monitor = ProgressMonitor(results_dir, len(jobs), concurrent_jobs, interval=monitor_interval,
+                              step_time=model_options.get('step_time', DEFAULT_STEP_TIME))
+    monitor.start()
+    
+    remote_batch = None
+    if remote:
+        # Tasks for and results of the workers (--distributed) or array tasks (--cluster)
+        remote_batch = RemoteBatch(ledger, results_dir, run_options,
+                                   functools.partial(append_result, results_file), total, cache,
+                                   post_peak_drop, termination_poll)
+    
+    scheduler = JobScheduler(default_cores, memory_percent, token_pool=token_pool)
+    try:
+        if args.preflight:
+            print(f"\nPreflight: datacheck of {len(jobs)} point(s), nothing is solved")
+            stats = scheduler.run(jobs, preflight_job)
+        elif args.distributed is not None:
+            spool_dir, heartbeat_timeout, max_requeues, startup_timeout = read_distributed_config(project_root)
+            if args.distributed:
+                spool_dir = Path(args.distributed)
+            coordinator = Coordinator(spool_dir, heartbeat_timeout, max_requeues=max_requeues,
+                                      startup_timeout=startup_timeout)
+            print(f"\nWaiting for workers on spool {spool_dir}")
+            print(f"  Start them with: python src/worker.py {spool_dir}")
+            stats = coordinator.run(jobs, remote_batch.task, remote_batch.on_result,
+                                    on_claim=remote_batch.on_claim)
+        elif args.cluster is not None:
+            try:
+                stats = cluster_runner.run(jobs, remote_batch.task, remote_batch.on_result,
+                                           on_claim=remote_batch.on_claim)
+            except RuntimeError as e:
+                print(f"\nERROR: Could not submit the array job: {e}")
+                ledger.close()
+                return 1
+        elif args.pipeline:
+            for job in jobs:
+                job.payload['input_state'] = None
+            input_stage = threading.Thread(target=write_input_decks, name='cae-stage', daemon=True)
+            input_stage.start()
+            stats = scheduler.run(jobs, run_job, ready=lambda job: job.payload['input_state'] is not None)
+            input_stage.join()
+        else:
+            stats = scheduler.run(jobs, run_job)
+    finally:
+        monitor.stop()
+        if cae_servers is not None:
+            cae_servers.stop()
+    
+    if args.preflight:
+        ledger.close()
+        return preflight_report(jobs, preflight_checks, results_dir / 'preflight.csv', concurrent_jobs, cores)
+    
+    successful += cached + sum(1 for job in jobs if job.success)
+    failed += sum(1 for job in jobs if not job.success)
+    
     # Summary
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -243,8 +1240,21 @@ def main():
     print(f"Total simulations: {total}")
     print(f"Successful: {successful}")
     print(f"Failed: {failed}")
+    if args.resume:
+        print(f"Skipped (already done): {skipped}")
+    if cache is not None:
+        print(f"Taken from cache: {cached}")
+    if retention.reclaimed:
+        print(f"Disk space reclaimed: {format_size(retention.reclaimed)}")
+    if retry_costs:
+        print(f"Retries: {len(retry_costs)} attempt(s), {sum(retry_costs) / 3600:.2f} core-h, "
+              f"{len(rescued)} job(s) rescued")
+    print(f"Makespan: {stats.makespan / 60:.1f} min ({stats.makespan:.0f} s)")
+    if not remote:
+        print(f"Core utilisation: {stats.core_utilisation * 100:.1f}% of {default_cores} cores")
     print("=" * 60)
     
+    ledger.close()
     return 0 if failed == 0 else 1
 
 
@@ -37,7 +37,8 @@ if script_dir not in sys.path:
 
 try:
     # This import should now work because the 'src' directory is explicitly in sys.path
-    from StrapJoint import StrapJoint, DP490, AF163
+    from materials import DP490, AF163
+    from StrapJoint import StrapJoint
     from SteppedJoint import SteppedJoint
 except ImportError:
     # This fatal exit is a clean way to handle module import failure in Abaqus
@@ -68,12 +69,66 @@ def get_joint_function(joint_type):
     else:
         raise ValueError(f"Unknown joint type: {joint_type}. Must be 'SAP' or 'SEP'.")
 
+def parse_bool(value):
+    """Convert an option value like 1/0, true/false or on/off to a bool."""
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+# Optional name=value settings that may follow the five positional arguments.
+# Each entry maps the option name to the function converting its value.
+OPTION_TYPES = {
+    'memory': int,  # memory share for the job in percent
+    'write_input': parse_bool,  # only write the .inp input deck, do not run the solver
+    'work_dir': str,  # directory the job runs in (default: abaqus-sim/results)
+    'scratch': str,  # scratch directory of the solver (default: Abaqus default)
+    'seed_size': float,  # global mesh seed in mm (default 0.4)
+    'mass_scaling_target': float,  # target time increment of the mass scaling (default 1e-05)
+    'explicit_precision': lambda value: str(value).strip().upper(),  # SINGLE or DOUBLE
+    'save_cae': parse_bool,  # save the model as <job>.cae (default: on)
+    'domains': int,  # parallel domains of the explicit solver (default: cores)
+    'threads_per_process': int,  # threads per MPI process (default: 1)
+    'load_balancing': parse_bool,  # dynamic load balancing of the domains (default: off)
+    'step_time': float,  # duration of the tensile step (default 1.0)
+    'output_profile': lambda value: str(value).strip().lower(),  # minimal, energy, damage or full
+    'coarse_seed_size': float,  # seed at the clamps of a graded mesh (default: uniform seed)
+    'half_width': parse_bool,  # half-width model with a symmetry plane (default: off)
+    'restricted_contact': parse_bool,  # general contact only around the overlap (default: all exterior faces)
+    'contact_margin': float,  # margin of the restricted contact domain around the overlap (mm)
+    'overlap_partitions': parse_bool,  # bound the overlap by partitions in any case (SEP; SAP always has them)
+}
+
+def convert_options(raw_options):
+    """Convert a dict of option values (e.g. from a spool task) to their types."""
+    options = {}
+    for name, value in raw_options.items():
+        if name not in OPTION_TYPES:
+            raise ValueError(f"Unknown option: {name}. Known options: {', '.join(OPTION_TYPES)}")
+        options[name] = OPTION_TYPES[name](value)
+    return options
+
+def split_options(args):
+    """Separate positional arguments from name=value options."""
+    positional = []
+    raw_options = {}
+    for arg in args:
+        if '=' in arg:
+            name, value = arg.split('=', 1)
+            raw_options[name] = value
+        else:
+            positional.append(arg)
+    return positional, convert_options(raw_options)
+
 # ----------------------------------------------------------------------
 # MAIN EXECUTION
 # ----------------------------------------------------------------------
 
-def run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type='SAP'):
-    """Run simulation for a single point with given parameters."""
+def run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type='SAP', **options):
+    """
+    Run simulation for a single point with given parameters.
+
+    Additional keyword options (see OPTION_TYPES) are passed on to the joint function.
+    """
     try:
         print(f"Processing single point simulation:")
         print(f"  Joint Type: {joint_type}")
@@ -81,6 +136,8 @@ def run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type='
         print(f"  Adhesive: {adhesive_name}")
         print(f"  Thickness: {film_thickness} mm")
         print(f"  Cores: {cores}")
+        for name, value in options.items():
+            print(f"  {name}: {value}")
         
         # Get the corresponding material object
         print("Getting adhesive object...")
@@ -101,7 +158,8 @@ def run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type='
                 overlap=overlap, 
                 adhesive=adhesive_object, 
                 film_thickness=film_thickness, 
-                cores=cores
+                cores=cores,
+                **options
             )
         except ImportError as e:
             print(f"Error importing joint module: {e}")
@@ -112,7 +170,10 @@ def run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type='
             print(f"Error in joint execution: {e}")
             return False
         
-        print("Job submitted and completed successfully")
+        if options.get('write_input'):
+            print("Input deck written successfully")
+        else:
+            print("Job submitted and completed successfully")
         return True
         
     except Exception as e:
@@ -121,8 +182,43 @@ def run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type='
         traceback.print_exc()
         return False
 
+def serve_points(spool_dir, worker_id=None):
+    """
+    Server mode: build and run design points taken from a spool directory.
+    
+    One CAE kernel processes all points, so the kernel startup and license
+    checkout are paid only once. Each spool task is a dict with the keys
+    overlap, adhesive, film_thickness, cores, joint_type and optionally
+    options (see OPTION_TYPES). The server stops when a stop is requested
+    on the spool (see spool.py and cae_client.py). worker_id is recorded as
+    the owner of its claims, so a client can tell which server holds a task.
+    """
+    import time
+    from spool import serve
+    
+    def handle_task(task):
+        print(f"\nServer received task: {task}")
+        start = time.time()
+        success = run_single_point(
+            float(task['overlap']),
+            task['adhesive'],
+            float(task['film_thickness']),
+            int(task['cores']),
+            task.get('joint_type', 'SAP'),
+            **convert_options(task.get('options', {}))
+        )
+        return {'success': success, 'duration': time.time() - start}
+    
+    print(f"Serving design points from spool: {spool_dir}")
+    processed = serve(spool_dir, handle_task, worker_id=worker_id)
+    print(f"Server stopped after {processed} design point(s)")
+
 def main():
-    """Main entry point - expects 5 positional arguments."""
+    """
+    Main entry point - expects 5 positional arguments and optional name=value options.
+    
+    Alternatively 'serve <spool_dir>' starts the server mode (see serve_points).
+    """
     # Abaqus may or may not preserve the -- separator, so we need to handle both cases
     
     # Check if we have the -- separator
@@ -142,21 +238,40 @@ def main():
                 break
             potential_args.insert(0, arg)
         
-        # We expect exactly 5 arguments
-        if len(potential_args) >= 5:
-            args = potential_args[-5:]  # Take the last 5
+        # We expect 5 positional arguments, possibly followed by name=value options
+        positional_args = [arg for arg in potential_args if '=' not in arg]
+        if 'serve' in potential_args:
+            args = potential_args[potential_args.index('serve'):]
+        elif len(positional_args) >= 5:
+            option_args = [arg for arg in potential_args if '=' in arg]
+            args = positional_args[-5:] + option_args  # Take the last 5
         else:
             args = []
     
+    if args and args[0] == 'serve':
+        if len(args) < 2:
+            print("Usage: abaqus cae noGUI=run_simulations.py -- serve <spool_dir> [worker_id]")
+            sys.exit(1)
+        serve_points(args[1], args[2] if len(args) > 2 else None)
+        sys.exit(0)
+    
+    try:
+        args, options = split_options(args)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        sys.exit(1)
+    
     # Check we have all required arguments
     if len(args) < 5:
         print("ERROR: Missing arguments.")
-        print("Usage: abaqus cae noGUI=run_simulations.py -- overlap adhesive film_thickness cores joint_type")
+        print("Usage: abaqus cae noGUI=run_simulations.py -- overlap adhesive film_thickness cores joint_type [name=value ...]")
         print("  overlap: Overlap length in mm (e.g., 30.0)")
         print("  adhesive: Adhesive type (DP490 or AF163)")
         print("  film_thickness: Film thickness in mm (e.g., 0.1)")
         print("  cores: Number of CPU cores (e.g., 28)")
         print("  joint_type: Joint type (SAP or SEP)")
+        print("  name=value: optional settings, e.g. memory=22 (memory share in percent)")
+        print("Server mode: abaqus cae noGUI=run_simulations.py -- serve <spool_dir> [worker_id]")
         print(f"\nReceived sys.argv: {sys.argv}")
         sys.exit(1)
     
@@ -175,7 +290,7 @@ def main():
         print(f"  Film thickness: {film_thickness}")
         print(f"  Cores: {cores}")
         
-        success = run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type)
+        success = run_single_point(overlap, adhesive_name, film_thickness, cores, joint_type, **options)
         sys.exit(0 if success else 1)
         
     except ValueError as e:
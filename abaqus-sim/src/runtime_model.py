@@ -0,0 +1,138 @@
+"""
+Runtime prediction of design points for longest-job-first ordering.
+
+The runtime of an explicit joint model grows with its element count: the
+global seed is the same for every point, so the stable time increment
+hardly changes while larger overlaps add strap (SAP) or contact area. When
+several jobs run at once, a long job that starts last leaves the end of
+the campaign with idle cores. run_batch.py therefore starts the points in
+order of decreasing predicted runtime (longest processing time first).
+
+Predictions come from a model fitted on the timings of completed jobs in
+the job ledger, normalised to one core with Amdahl's law:
+
+    log(runtime * speedup(cores)) = a + b * log(elements) + c * log(film_thickness)
+
+fitted per joint type once it has enough completed jobs. With fewer jobs,
+the element-count estimate is scaled by the median ratio of the measured
+runtimes to their estimates, and without any history the element count
+alone orders the points.
+"""
+
+import math
+import statistics
+
+from licensing import speedup
+from mesh_grading import adherend_x_elements
+
+# Global mesh seed and default geometry of StrapJoint.py/SteppedJoint.py
+MESH_SEED = 0.4
+PLIES = 8
+LENGTH = 150.0
+WIDTH = 25.0
+
+# Completed jobs of a joint type needed to fit its regression
+MIN_FIT_SAMPLES = 4
+
+
+def estimate_elements(joint_type, overlap, seed=MESH_SEED, plies=PLIES, length=LENGTH, width=WIDTH,
+                      coarse_seed=None):
+    """
+    Rough element count of a joint model (continuum shell elements, one per
+    ply through the thickness, plus the cohesive contact faces). With
+    coarse_seed, the adherends are graded towards the clamps (mesh_grading.py).
+    """
+    across = width / seed
+    adherends = 2 * plies * across * adherend_x_elements(length, overlap, seed, coarse_seed)
+    if joint_type == 'SEP':
+        # Two stepped adherends overlapping by the overlap length
+        contact_area = overlap * width
+        strap = 0.0
+    else:
+        # Two adherends and a strap of twice the overlap length
+        contact_area = 2 * overlap * width
+        strap = plies * across * 2 * overlap / seed
+    return adherends + strap + contact_area / seed ** 2
+
+
+def _solve(matrix, vector):
+    """Solve a small linear system by Gaussian elimination. Returns None if singular."""
+    n = len(vector)
+    rows = [list(matrix[i]) + [vector[i]] for i in range(n)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(rows[r][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            return None
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+        for r in range(n):
+            if r != col:
+                factor = rows[r][col] / rows[col][col]
+                rows[r] = [a - factor * b for a, b in zip(rows[r], rows[col])]
+    return [rows[i][n] / rows[i][i] for i in range(n)]
+
+
+class RuntimeModel:
+    """Predict the wall time of a design point from past job timings."""
+
+    def __init__(self, parallel_fraction=0.95):
+        self.parallel_fraction = parallel_fraction
+        self.coefficients = {}  # joint type -> (a, b, c)
+        self.scale = None       # median runtime per element on one core
+        self.samples = 0
+
+    @staticmethod
+    def _features(joint_type, overlap, film_thickness):
+        return [1.0, math.log(estimate_elements(joint_type, overlap)), math.log(film_thickness)]
+
+    def fit(self, timings):
+        """
+        Fit the model on completed jobs, given as dicts with joint_type,
+        overlap, film_thickness, cores and duration (seconds).
+        """
+        usable = [t for t in timings
+                  if t['duration'] and t['duration'] > 0 and t['overlap'] and t['film_thickness']]
+        self.samples = len(usable)
+        self.coefficients = {}
+        self.scale = None
+        if not usable:
+            return self
+
+        serial = [t['duration'] * speedup(t['cores'] or 1, self.parallel_fraction) for t in usable]
+        self.scale = statistics.median(
+            time / estimate_elements(t['joint_type'], t['overlap']) for t, time in zip(usable, serial))
+
+        for joint_type in {t['joint_type'] for t in usable}:
+            rows = [(self._features(t['joint_type'], t['overlap'], t['film_thickness']), math.log(time))
+                    for t, time in zip(usable, serial) if t['joint_type'] == joint_type]
+            if len(rows) < MIN_FIT_SAMPLES:
+                continue
+            # Least squares via the normal equations
+            xtx = [[sum(x[i] * x[j] for x, _ in rows) for j in range(3)] for i in range(3)]
+            xty = [sum(x[i] * y for x, y in rows) for i in range(3)]
+            solution = _solve(xtx, xty)
+            if solution is not None:
+                self.coefficients[joint_type] = tuple(solution)
+        return self
+
+    def predict(self, joint_type, overlap, film_thickness, cores=1):
+        """Predicted wall time in seconds (or relative units without history)."""
+        coefficients = self.coefficients.get(joint_type)
+        if coefficients is not None:
+            x = self._features(joint_type, overlap, film_thickness)
+            serial = math.exp(sum(c * v for c, v in zip(coefficients, x)))
+        else:
+            serial = estimate_elements(joint_type, overlap) * (self.scale or 1.0)
+        return serial / speedup(cores, self.parallel_fraction)
+
+    def describe(self):
+        if self.coefficients:
+            return (f"fitted on {self.samples} completed job(s) "
+                    f"({', '.join(sorted(self.coefficients))} regression)")
+        if self.scale is not None:
+            return f"element-count estimate scaled by {self.samples} completed job(s)"
+        return "element-count estimate (no completed jobs yet)"
+
+
+def order_longest_first(jobs, predict):
+    """Sort jobs by decreasing predicted runtime; ties keep their CSV order."""
+    return sorted(jobs, key=lambda job: -predict(job))
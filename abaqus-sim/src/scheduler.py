@@ -0,0 +1,190 @@
+"""
+Resource-packing scheduler for running several Abaqus jobs at once.
+
+Jobs are started as soon as their core count and memory share fit into
+the remaining budget of the machine and, with a TokenPool (see
+licensing.py), while the license token pool has capacity. Each job runs in its own thread, so
+the blocking job runners in run_batch.py can be reused unchanged.
+
+Usage (from run_batch.py):
+    scheduler = JobScheduler(total_cores=28, total_memory=90)
+    stats = scheduler.run(jobs, worker)
+"""
+
+import threading
+import time
+
+from licensing import abaqus_tokens
+
+
+class ScheduledJob:
+    """A single design point together with the resources it occupies."""
+
+    def __init__(self, name, cores, memory, payload=None):
+        self.name = name
+        self.cores = cores
+        self.memory = memory
+        self.payload = payload
+        self.start_time = None
+        self.end_time = None
+        self.success = None
+
+    @property
+    def duration(self):
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+
+def plan_job_resources(total_cores, memory_percent, concurrent_jobs, cores_per_job=None):
+    """
+    Split the machine budget into per-job shares.
+
+    Returns a (cores, memory) tuple for a single job. If cores_per_job is not
+    given, the total core count is divided evenly across the concurrent jobs.
+    Memory is always shared evenly because Abaqus takes it as a percentage.
+    """
+    if concurrent_jobs < 1:
+        raise ValueError(f"concurrent_jobs must be at least 1, got {concurrent_jobs}")
+
+    if cores_per_job is None:
+        cores_per_job = max(1, total_cores // concurrent_jobs)
+
+    if cores_per_job < 1:
+        raise ValueError(f"cores_per_job must be at least 1, got {cores_per_job}")
+
+    if cores_per_job * concurrent_jobs > total_cores:
+        raise ValueError(
+            f"{concurrent_jobs} jobs x {cores_per_job} cores exceeds the core budget of {total_cores}"
+        )
+
+    memory = max(1, int(memory_percent // concurrent_jobs))
+    return cores_per_job, memory
+
+
+class BatchStats:
+    """Timing summary of a scheduled batch."""
+
+    def __init__(self, jobs, total_cores, start_time, end_time):
+        self.jobs = jobs
+        self.total_cores = total_cores
+        self.makespan = max(0.0, end_time - start_time)
+        self.busy_core_seconds = sum(job.cores * job.duration for job in jobs)
+
+    @property
+    def core_utilisation(self):
+        """Fraction of the core budget that was busy over the makespan."""
+        if self.makespan <= 0 or self.total_cores <= 0:
+            return 0.0
+        return self.busy_core_seconds / (self.total_cores * self.makespan)
+
+
+class JobScheduler:
+    """Start jobs while they fit into a total core and memory budget."""
+
+    def __init__(self, total_cores, total_memory, poll_interval=1.0, token_pool=None):
+        self.total_cores = total_cores
+        self.total_memory = total_memory
+        self.poll_interval = poll_interval
+        self.token_pool = token_pool
+        self.used_cores = 0
+        self.used_memory = 0
+        self.used_tokens = 0
+        self._condition = threading.Condition()
+
+    def tokens(self, job):
+        """License tokens of a job (0 without a token pool)."""
+        return abaqus_tokens(job.cores) if self.token_pool is not None else 0
+
+    def token_capacity(self):
+        """Tokens the batch may hold (None without a token pool); may query the license server."""
+        if self.token_pool is None:
+            return None
+        return self.token_pool.capacity(self.used_tokens)
+
+    def fits(self, job, token_capacity=None):
+        """
+        Return True if the job fits into the currently free resources.
+        token_capacity is the result of token_capacity().
+        """
+        if (self.used_cores + job.cores > self.total_cores
+                or self.used_memory + job.memory > self.total_memory):
+            return False
+        if token_capacity is None:
+            return True
+        return self.used_tokens + self.tokens(job) <= token_capacity
+
+    def _run_job(self, job, worker):
+        job.start_time = time.time()
+        try:
+            job.success = bool(worker(job))
+        except Exception as e:
+            print(f"ERROR: Unexpected error in job {job.name}: {e}")
+            job.success = False
+        finally:
+            job.end_time = time.time()
+            with self._condition:
+                self.used_cores -= job.cores
+                self.used_memory -= job.memory
+                self.used_tokens -= self.tokens(job)
+                self._condition.notify_all()
+
+    def wake(self):
+        """Re-check pending jobs now, e.g. after a job became ready."""
+        with self._condition:
+            self._condition.notify_all()
+
+    def run(self, jobs, worker, ready=None):
+        """
+        Run all jobs and block until every one of them has finished.
+
+        worker(job) is called in a separate thread for each job and must
+        return True on success. The first pending job that fits into the
+        free budget (cores, memory and license tokens) is started, so smaller
+        jobs can backfill gaps.
+
+        ready(job), if given, holds a job back until it returns True (e.g.
+        until its input deck has been written). Call wake() when a job
+        becomes ready to start it without waiting for the next poll.
+        """
+        for job in jobs:
+            if job.cores > self.total_cores or job.memory > self.total_memory:
+                raise ValueError(
+                    f"Job {job.name} needs {job.cores} cores / {job.memory}% memory, "
+                    f"budget is {self.total_cores} cores / {self.total_memory}%"
+                )
+            if (self.token_pool is not None and self.token_pool.total_tokens
+                    and self.tokens(job) > self.token_pool.total_tokens):
+                raise ValueError(
+                    f"Job {job.name} needs {self.tokens(job)} license tokens, "
+                    f"the pool has {self.token_pool.total_tokens}"
+                )
+
+        pending = list(jobs)
+        threads = []
+        start_time = time.time()
+
+        while pending:
+            # The license status query can take a while, so it runs outside
+            # the lock the finishing jobs need
+            token_capacity = self.token_capacity()
+            with self._condition:
+                job = next((j for j in pending
+                            if (ready is None or ready(j)) and self.fits(j, token_capacity)), None)
+                if job is None:
+                    self._condition.wait(timeout=self.poll_interval)
+                    continue
+
+                pending.remove(job)
+                self.used_cores += job.cores
+                self.used_memory += job.memory
+                self.used_tokens += self.tokens(job)
+                thread = threading.Thread(target=self._run_job, args=(job, worker),
+                                          name=job.name, daemon=True)
+                threads.append(thread)
+                thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        return BatchStats(jobs, self.total_cores, start_time, time.time())
@@ -0,0 +1,183 @@
+"""
+Solver telemetry of finished jobs from their Abaqus output files.
+
+After every run, run_batch.py parses the files of the job into one row of
+results/solver_metrics.csv (next to results.csv):
+
+    .sta       increments, stable time increment (average = step time /
+               increments, minimum of the reported increments), percent
+               change in mass from mass scaling, wall time, memory
+    .msg/.dat  mass-scaling factors, job time summary (CPU and wall time),
+               memory estimates
+    ODB        largest ALLKE/ALLIE ratio of the whole model (from the RF1
+               extraction, see extract_rf1_single.py)
+    _mesh.json element count and coarse seed of a graded mesh (see
+               mesh_grading.py)
+
+Rows are keyed by job name, so a rerun replaces the row of the earlier
+run. The table can be joined with results.csv on the job name to correlate
+cost with overlap and thickness across campaigns.
+
+To rebuild the table from the files of an existing results directory:
+    python solver_metrics.py ../results
+"""
+
+import csv
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+
+from mesh_grading import MESH_SUFFIX, read_mesh_report
+from naming import parse_job_name
+from sta_monitor import parse_sta_line
+
+METRICS_HEADER = ['Job', 'Joint_type', 'Overlap_mm', 'Film_thickness_mm', 'Adhesive', 'State', 'Cores',
+                  'Elements', 'Coarse_seed_mm', 'Increments', 'Stable_increment_avg', 'Stable_increment_min', 'Mass_scaling_min',
+                  'Mass_scaling_max', 'Added_mass_percent', 'CPU_s', 'Wall_s', 'Peak_memory_MB',
+                  'KE_IE_ratio', 'Recorded']
+
+_MEMORY_UNITS = {'k': 1.0 / 1024, 'm': 1.0, 'g': 1024.0}
+
+_metrics_lock = threading.Lock()
+
+
+def _read(path):
+    try:
+        return Path(path).read_text(errors='replace')
+    except OSError:
+        return ''
+
+
+def job_time_summary(text):
+    """Return (cpu_seconds, wall_seconds) of the JOB TIME SUMMARY in a .msg/.dat text."""
+    def value(label):
+        match = re.search(rf'{label} \(SEC\)\s*=\s*([-+0-9.Ee]+)', text)
+        return float(match.group(1)) if match else None
+    return value('TOTAL CPU TIME'), value('WALLCLOCK TIME')
+
+
+def peak_memory_mb(text):
+    """Largest memory figure reported in a text, in MB (None if there is none)."""
+    figures = []
+    for amount, unit in re.findall(r'memory[^\n]*?approximately\s+([\d.]+)\s*(kilo|mega|giga)bytes',
+                                   text, re.IGNORECASE):
+        figures.append(float(amount) * _MEMORY_UNITS[unit[0].lower()])
+    for amount, unit in re.findall(r'(?:maximum|peak) memory[^\n=:]*[=:]\s*([\d.]+)\s*([KMG])B',
+                                   text, re.IGNORECASE):
+        figures.append(float(amount) * _MEMORY_UNITS[unit.lower()])
+    return max(figures) if figures else None
+
+
+def mass_scaling_factors(text):
+    """All mass-scaling factors reported in a text."""
+    return [float(v) for v in re.findall(r'mass scaling factor[^:=\n]*[:=]\s*([-+0-9.Ee]+)',
+                                         text, re.IGNORECASE)]
+
+
+def parse_sta(text):
+    """Increments, stable increments, added mass and wall time of an explicit .sta text."""
+    records = [record for record in map(parse_sta_line, text.splitlines()) if record is not None]
+    if not records:
+        return {}
+    last = records[-1]
+    return {
+        'increments': last.increment,
+        'stable_increment_avg': last.step_time / last.increment if last.increment else None,
+        'stable_increment_min': min(record.stable_increment for record in records),
+        'added_mass_percent': last.mass_change,
+        'wall': last.wall_time,
+    }
+
+
+def collect_metrics(directory, name):
+    """Parse the .sta, .msg, .dat and mesh files of a job into a dict of metrics."""
+    directory = Path(directory)
+    sta = _read(directory / f"{name}.sta")
+    msg = _read(directory / f"{name}.msg")
+    dat = _read(directory / f"{name}.dat")
+
+    metrics = parse_sta(sta)
+    cpu, wall = job_time_summary(msg)
+    if cpu is None:
+        cpu, wall = job_time_summary(dat)
+    factors = mass_scaling_factors(sta + msg + dat)
+    mesh = read_mesh_report(directory / f"{name}{MESH_SUFFIX}") or {}
+    metrics.update(
+        elements=mesh.get('total_elements'),
+        coarse_seed_size=mesh.get('coarse_seed_size'),
+        cpu=cpu,
+        wall=wall if wall is not None else metrics.get('wall'),
+        mass_scaling_min=min(factors) if factors else None,
+        mass_scaling_max=max(factors) if factors else None,
+        peak_memory_mb=peak_memory_mb(sta + msg + dat),
+    )
+    return metrics
+
+
+def metrics_row(name, metrics, state=None, cores=None, ke_ie_ratio=None):
+    """Row of the metrics table with the METRICS_HEADER keys."""
+    parsed = parse_job_name(name) or (None, None, None, None)
+
+    def number(value, digits=6):
+        return '' if value is None else f"{value:.{digits}g}"
+
+    return {
+        'Job': name,
+        'Joint_type': parsed[0] or '',
+        'Overlap_mm': number(parsed[1]),
+        'Film_thickness_mm': number(parsed[2]),
+        'Adhesive': parsed[3] or '',
+        'State': state or '',
+        'Cores': cores or '',
+        'Elements': metrics.get('elements') or '',
+        'Coarse_seed_mm': number(metrics.get('coarse_seed_size')),
+        'Increments': metrics.get('increments', ''),
+        'Stable_increment_avg': number(metrics.get('stable_increment_avg'), 4),
+        'Stable_increment_min': number(metrics.get('stable_increment_min'), 4),
+        'Mass_scaling_min': number(metrics.get('mass_scaling_min'), 4),
+        'Mass_scaling_max': number(metrics.get('mass_scaling_max'), 4),
+        'Added_mass_percent': number(metrics.get('added_mass_percent'), 4),
+        'CPU_s': number(metrics.get('cpu')),
+        'Wall_s': number(metrics.get('wall')),
+        'Peak_memory_MB': number(metrics.get('peak_memory_mb')),
+        'KE_IE_ratio': number(ke_ie_ratio, 4),
+        'Recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+
+def record_metrics(path, row):
+    """Insert or replace the row of a job in the metrics table."""
+    path = Path(path)
+    with _metrics_lock:
+        rows = []
+        if path.exists():
+            with open(path, 'r', newline='') as f:
+                rows = [r for r in csv.DictReader(f) if r['Job'] != row['Job']]
+        rows.append(row)
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=METRICS_HEADER, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Usage: python solver_metrics.py <results_dir>")
+        return 1
+    results_dir = Path(argv[0])
+    path = results_dir / 'solver_metrics.csv'
+    rows = [metrics_row(sta.stem, collect_metrics(results_dir, sta.stem))
+            for sta in sorted(results_dir.glob('*.sta'))]
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=METRICS_HEADER)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Wrote metrics of {len(rows)} job(s) to {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
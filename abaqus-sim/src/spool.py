@@ -0,0 +1,283 @@
+"""
+Directory spool used to hand design points to long-running processes.
+
+A spool is a directory with one JSON file per task:
+
+    <spool>/incoming/<task_id>.json   submitted, waiting for a server
+    <spool>/claimed/<task_id>.json    taken by a server, being processed
+    <spool>/claimed/<task_id>.owner   id of the worker that claimed it (optional)
+    <spool>/done/<task_id>.json       result written by the server
+    <spool>/workers/<worker_id>.json  heartbeat of a worker
+    <spool>/stop                      asks all servers to shut down
+
+Tasks are claimed with an atomic rename, so several servers can share one
+spool, also across machines on a shared file system. Workers that claim
+with a worker id send heartbeats; requeue_stale() puts the tasks of workers
+whose heartbeat stopped back into the queue. This module only uses the
+standard library and runs both in regular Python and in Abaqus Python.
+"""
+
+import itertools
+import json
+import os
+import time
+import uuid
+
+# Orders tasks submitted by one process within the same millisecond
+_sequence = itertools.count()
+
+
+def _dirs(spool_dir):
+    return {name: os.path.join(spool_dir, name) for name in ('incoming', 'claimed', 'done', 'workers')}
+
+
+def init_spool(spool_dir):
+    """Create the spool directories if needed."""
+    for path in _dirs(spool_dir).values():
+        os.makedirs(path, exist_ok=True)
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def submit(spool_dir, task):
+    """Put a task (a JSON-serialisable dict) into the spool and return its id."""
+    init_spool(spool_dir)
+    # Millisecond prefix keeps the incoming queue in submission order
+    task_id = f"{int(time.time() * 1000):013d}_{next(_sequence):06d}_{uuid.uuid4().hex[:8]}"
+    _write_json(os.path.join(_dirs(spool_dir)['incoming'], f"{task_id}.json"), task)
+    return task_id
+
+
+def claim(spool_dir, worker_id=None):
+    """
+    Take the oldest waiting task.
+
+    With a worker_id, the claim is recorded as owned by that worker, so it
+    can be requeued if the worker stops sending heartbeats.
+
+    Returns (task_id, task), or (None, None) if the spool is empty.
+    """
+    dirs = _dirs(spool_dir)
+    try:
+        names = sorted(n for n in os.listdir(dirs['incoming']) if n.endswith('.json'))
+    except FileNotFoundError:
+        return None, None
+
+    for name in names:
+        claimed_path = os.path.join(dirs['claimed'], name)
+        try:
+            os.rename(os.path.join(dirs['incoming'], name), claimed_path)
+        except OSError:
+            continue  # Another server was faster
+        # The rename keeps the submit time, restart the clock for requeue_stale()
+        os.utime(claimed_path, None)
+        if worker_id is not None:
+            _write_json(os.path.join(dirs['claimed'], name[:-len('.json')] + '.owner'),
+                        {'worker': worker_id, 'claimed_at': time.time()})
+        with open(claimed_path, 'r') as f:
+            return name[:-len('.json')], json.load(f)
+
+    return None, None
+
+
+def complete(spool_dir, task_id, result):
+    """Store the result of a claimed task and release the claim."""
+    dirs = _dirs(spool_dir)
+    _write_json(os.path.join(dirs['done'], f"{task_id}.json"), result)
+    for suffix in ('.json', '.owner'):
+        try:
+            os.remove(os.path.join(dirs['claimed'], f"{task_id}{suffix}"))
+        except FileNotFoundError:
+            pass
+
+
+def cancel(spool_dir, task_id, force=False):
+    """
+    Withdraw a task the client gave up on. A waiting task is removed from
+    the queue, a result that arrived is discarded. A claimed task is left to
+    its server unless force is set (the server was killed).
+
+    Returns True once no server holds the task any more.
+    """
+    dirs = _dirs(spool_dir)
+    for path in (os.path.join(dirs['incoming'], f"{task_id}.json"),
+                 os.path.join(dirs['done'], f"{task_id}.json")):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    claimed_path = os.path.join(dirs['claimed'], f"{task_id}.json")
+    if force:
+        for suffix in ('.json', '.owner'):
+            try:
+                os.remove(os.path.join(dirs['claimed'], f"{task_id}{suffix}"))
+            except FileNotFoundError:
+                pass
+    return not os.path.exists(claimed_path)
+
+
+def get_result(spool_dir, task_id):
+    """Return the result of a task, or None if it is not finished yet."""
+    path = os.path.join(_dirs(spool_dir)['done'], f"{task_id}.json")
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def wait_for_result(spool_dir, task_id, timeout=None, poll_interval=1.0, alive=None):
+    """
+    Block until the result of a task is available and return it.
+
+    Returns None on timeout, or as soon as alive() returns False (e.g. the
+    server process died).
+    """
+    start = time.time()
+    while True:
+        result = get_result(spool_dir, task_id)
+        if result is not None:
+            return result
+        if timeout is not None and time.time() - start > timeout:
+            return None
+        if alive is not None and not alive():
+            # One last look, the result may have arrived just before exit
+            return get_result(spool_dir, task_id)
+        time.sleep(poll_interval)
+
+
+def heartbeat(spool_dir, worker_id, info=None):
+    """Record that a worker is alive. info is stored with the heartbeat."""
+    data = dict(info or {})
+    data['time'] = time.time()
+    _write_json(os.path.join(_dirs(spool_dir)['workers'], f"{worker_id}.json"), data)
+
+
+def workers(spool_dir):
+    """Return {worker_id: heartbeat data} of all workers that ever sent a heartbeat."""
+    path = _dirs(spool_dir)['workers']
+    result = {}
+    try:
+        names = [n for n in os.listdir(path) if n.endswith('.json')]
+    except FileNotFoundError:
+        return result
+    for name in names:
+        try:
+            with open(os.path.join(path, name), 'r') as f:
+                result[name[:-len('.json')]] = json.load(f)
+        except (OSError, ValueError):
+            continue  # Being rewritten
+    return result
+
+
+def claims(spool_dir):
+    """Return {task_id: worker_id or None} of all claimed tasks."""
+    path = _dirs(spool_dir)['claimed']
+    result = {}
+    try:
+        names = sorted(os.listdir(path))
+    except FileNotFoundError:
+        return result
+    for name in names:
+        if not name.endswith('.json'):
+            continue
+        task_id = name[:-len('.json')]
+        try:
+            with open(os.path.join(path, f"{task_id}.owner"), 'r') as f:
+                result[task_id] = json.load(f)['worker']
+        except (OSError, ValueError, KeyError):
+            result[task_id] = None
+    return result
+
+
+def requeue_stale(spool_dir, timeout):
+    """
+    Put claimed tasks back into the queue if their worker's last heartbeat
+    (or, without an owner, the claim itself) is older than timeout seconds.
+
+    Returns the list of (task_id, worker_id) that were requeued.
+    """
+    dirs = _dirs(spool_dir)
+    now = time.time()
+    beats = workers(spool_dir)
+    requeued = []
+    for task_id, worker_id in claims(spool_dir).items():
+        claimed_path = os.path.join(dirs['claimed'], f"{task_id}.json")
+        try:
+            last_sign = os.path.getmtime(claimed_path)
+        except OSError:
+            continue  # Completed in the meantime
+        if worker_id is not None and worker_id in beats:
+            last_sign = max(last_sign, beats[worker_id].get('time', 0))
+        if now - last_sign <= timeout:
+            continue
+        try:
+            os.rename(claimed_path, os.path.join(dirs['incoming'], f"{task_id}.json"))
+        except OSError:
+            continue
+        try:
+            os.remove(os.path.join(dirs['claimed'], f"{task_id}.owner"))
+        except FileNotFoundError:
+            pass
+        requeued.append((task_id, worker_id))
+    return requeued
+
+
+def request_stop(spool_dir):
+    """Ask all servers of the spool to shut down once they are idle."""
+    init_spool(spool_dir)
+    with open(os.path.join(spool_dir, 'stop'), 'w') as f:
+        f.write(f"{time.time()}\n")
+
+
+def clear_stop(spool_dir):
+    try:
+        os.remove(os.path.join(spool_dir, 'stop'))
+    except FileNotFoundError:
+        pass
+
+
+def stop_requested(spool_dir):
+    return os.path.exists(os.path.join(spool_dir, 'stop'))
+
+
+def serve(spool_dir, handler, poll_interval=1.0, idle_timeout=None, worker_id=None):
+    """
+    Process tasks until a stop is requested.
+
+    handler(task) is called for each claimed task and must return a
+    JSON-serialisable result dict. If it raises, the result is
+    {'success': False, 'error': <message>}. With idle_timeout, the server
+    also stops after that many seconds without work. worker_id is recorded
+    as the owner of each claim (heartbeats are up to the caller).
+
+    Returns the number of processed tasks.
+    """
+    init_spool(spool_dir)
+    processed = 0
+    idle_since = time.time()
+
+    while True:
+        task_id, task = claim(spool_dir, worker_id)
+        if task_id is None:
+            if stop_requested(spool_dir):
+                break
+            if idle_timeout is not None and time.time() - idle_since > idle_timeout:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        try:
+            result = handler(task)
+        except Exception as e:
+            result = {'success': False, 'error': str(e)}
+        complete(spool_dir, task_id, result)
+        processed += 1
+        idle_since = time.time()
+
+    return processed
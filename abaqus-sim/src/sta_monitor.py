@@ -0,0 +1,308 @@
+"""
+Live progress of running Abaqus/Explicit jobs from their .sta files.
+
+Abaqus/Explicit appends one line per reported increment to <job>.sta:
+
+    INCREMENT     STEP       TOTAL        WALL      STABLE    CRITICAL    KINETIC      TOTAL    PERCENT
+                  TIME        TIME        TIME   INCREMENT     ELEMENT     ENERGY     ENERGY  CHNG MASS
+        12345  4.265E-01   4.265E-01   00:12:34  3.412E-05        1234  1.234E-02  1.000E-03  1.234E+00
+
+The monitor tails these files (reading only the new bytes on each poll) and
+reports step time, increment rate, stable time increment and an ETA per job,
+plus an ETA for the whole batch.
+
+Usage (from run_batch.py):
+    monitor = ProgressMonitor(results_dir, total_jobs=20, concurrent_jobs=4)
+    monitor.start()
+    monitor.add('SAP45p0000_250mu_DP490')       # per attempt
+    ...
+    monitor.finish('SAP45p0000_250mu_DP490')
+    monitor.job_done(duration)                  # once the job has no attempts left
+    monitor.stop()
+
+On its own, it prints the progress of .sta files once:
+    python sta_monitor.py ../results/*.sta
+"""
+
+import os
+import sys
+import threading
+import time
+
+# Step-1 of both joint models uses the default time period of an
+# ExplicitDynamicsStep
+DEFAULT_STEP_TIME = 1.0
+
+
+class StaRecord:
+    """One increment line of an explicit .sta file."""
+
+    def __init__(self, increment, step_time, total_time, wall_time, stable_increment,
+                 critical_element, kinetic_energy, total_energy, mass_change=None):
+        self.increment = increment
+        self.step_time = step_time
+        self.total_time = total_time
+        self.wall_time = wall_time
+        self.stable_increment = stable_increment
+        self.critical_element = critical_element
+        self.kinetic_energy = kinetic_energy
+        self.total_energy = total_energy
+        self.mass_change = mass_change
+
+
+def _parse_wall_time(token):
+    """Wall time column: 'hh:mm:ss' in current releases, seconds in older ones."""
+    if ':' in token:
+        seconds = 0.0
+        for part in token.split(':'):
+            seconds = seconds * 60 + float(part)
+        return seconds
+    return float(token)
+
+
+def parse_sta_line(line):
+    """Return a StaRecord for an increment line, or None for any other line."""
+    parts = line.split()
+    if len(parts) < 8 or not parts[0].isdigit():
+        return None
+    try:
+        return StaRecord(
+            increment=int(parts[0]),
+            step_time=float(parts[1]),
+            total_time=float(parts[2]),
+            wall_time=_parse_wall_time(parts[3]),
+            stable_increment=float(parts[4]),
+            critical_element=parts[5],
+            kinetic_energy=float(parts[6]),
+            total_energy=float(parts[7]),
+            mass_change=float(parts[8]) if len(parts) > 8 else None,
+        )
+    except ValueError:
+        return None
+
+
+class StaTail:
+    """Follow a growing .sta file and keep its first and latest increment."""
+
+    def __init__(self, path, not_before=None):
+        self.path = path
+        # Ignore a stale .sta from an earlier run until the job rewrites it
+        self.not_before = not_before
+        self.offset = 0
+        self._partial = ''
+        self.first = None
+        self.latest = None
+        self.completed = False
+        self.aborted = False
+
+    def _reset(self):
+        self.offset = 0
+        self._partial = ''
+        self.first = None
+        self.latest = None
+        self.completed = False
+        self.aborted = False
+
+    def poll(self):
+        """Read lines appended since the last poll. Returns the latest record."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return self.latest
+        if self.not_before is not None and stat.st_mtime < self.not_before:
+            return self.latest
+        if stat.st_size < self.offset:
+            self._reset()  # File was rewritten by a new run
+
+        with open(self.path, 'r', errors='replace') as f:
+            f.seek(self.offset)
+            data = f.read()
+            self.offset = f.tell()
+
+        lines = (self._partial + data).split('\n')
+        self._partial = lines.pop()  # Last line may still be incomplete
+        for line in lines:
+            if 'COMPLETED SUCCESSFULLY' in line:
+                self.completed = True
+            elif 'HAS NOT BEEN COMPLETED' in line:
+                self.aborted = True
+            record = parse_sta_line(line)
+            if record is None:
+                continue
+            if self.first is None:
+                self.first = record
+            self.latest = record
+        return self.latest
+
+
+class JobProgress:
+    """Progress and ETA of one running job."""
+
+    def __init__(self, name, sta_path, step_time=DEFAULT_STEP_TIME):
+        self.name = name
+        self.step_time = step_time
+        self.start_time = time.time()
+        self.tail = StaTail(sta_path, not_before=self.start_time - 1)
+
+    def poll(self):
+        return self.tail.poll()
+
+    @property
+    def fraction(self):
+        latest = self.tail.latest
+        if latest is None or self.step_time <= 0:
+            return 0.0
+        return min(1.0, latest.step_time / self.step_time)
+
+    @property
+    def increment_rate(self):
+        """Increments per second of solver wall time."""
+        first, latest = self.tail.first, self.tail.latest
+        if first is None or latest is None or latest.wall_time <= first.wall_time:
+            return None
+        return (latest.increment - first.increment) / (latest.wall_time - first.wall_time)
+
+    @property
+    def eta(self):
+        """Remaining solver wall time in seconds, or None if not known yet."""
+        latest = self.tail.latest
+        if latest is None or latest.step_time <= 0 or latest.wall_time <= 0:
+            return None
+        remaining = max(0.0, self.step_time - latest.step_time)
+        return remaining * latest.wall_time / latest.step_time
+
+    def describe(self):
+        latest = self.tail.latest
+        if latest is None:
+            return f"{self.name}: waiting for solver output"
+        rate = self.increment_rate
+        rate_str = f"{rate:.0f} inc/s" if rate is not None else "- inc/s"
+        return (f"{self.name}: {self.fraction * 100:5.1f}%  step time {latest.step_time:.4g}/{self.step_time:g}  "
+                f"inc {latest.increment}  {rate_str}  dt {latest.stable_increment:.3e}  "
+                f"ETA {format_duration(self.eta)}")
+
+
+def format_duration(seconds):
+    if seconds is None:
+        return '--:--:--'
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressMonitor:
+    """Report the progress of all running jobs of a batch at a fixed interval."""
+
+    def __init__(self, results_dir, total_jobs, concurrent_jobs=1, interval=60.0,
+                 step_time=DEFAULT_STEP_TIME):
+        self.results_dir = results_dir
+        self.total_jobs = total_jobs
+        self.concurrent_jobs = max(1, concurrent_jobs)
+        self.interval = interval
+        self.step_time = step_time
+        self.running = {}
+        self.durations = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add(self, name, step_time=None, work_dir=None):
+        """Start following <work_dir>/<name>.sta (default: the results directory)."""
+        sta_path = os.path.join(str(work_dir or self.results_dir), f"{name}.sta")
+        with self._lock:
+            self.running[name] = JobProgress(name, sta_path, step_time or self.step_time)
+
+    def finish(self, name):
+        """Stop following an attempt of a job."""
+        with self._lock:
+            self.running.pop(name, None)
+
+    def job_done(self, duration):
+        """
+        Count a finished job and record its duration (all attempts) for the
+        batch ETA. Called once per job, after its last attempt.
+        """
+        with self._lock:
+            self.durations.append(duration)
+
+    def batch_eta(self):
+        """
+        Rough remaining time of the batch: the remaining time of the running
+        jobs plus the waiting jobs at the mean duration of the finished ones,
+        spread across the concurrent job slots.
+        """
+        with self._lock:
+            running = list(self.running.values())
+            finished = len(self.durations)
+            mean_duration = sum(self.durations) / finished if finished else None
+
+        remaining = 0.0
+        for progress in running:
+            eta = progress.eta
+            if eta is None:
+                if mean_duration is None:
+                    return None
+                eta = max(0.0, mean_duration - (time.time() - progress.start_time))
+            remaining += eta
+
+        waiting = self.total_jobs - finished - len(running)
+        if waiting > 0:
+            if mean_duration is None:
+                # No job finished yet, estimate from the running ones
+                estimates = [time.time() - p.start_time + p.eta for p in running if p.eta is not None]
+                if not estimates:
+                    return None
+                mean_duration = sum(estimates) / len(estimates)
+            remaining += waiting * mean_duration
+
+        return remaining / self.concurrent_jobs
+
+    def report(self):
+        """Poll all .sta files and print one line per running job."""
+        with self._lock:
+            running = list(self.running.values())
+            finished = len(self.durations)
+        if not running:
+            return
+        print(f"\n--- Progress: {finished}/{self.total_jobs} jobs finished, "
+              f"batch ETA {format_duration(self.batch_eta())} ---")
+        for progress in running:
+            progress.poll()
+            print(f"  {progress.describe()}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.report()
+            except Exception as e:
+                print(f"Warning: Progress monitor failed: {e}")
+
+    def start(self):
+        if self.interval <= 0:
+            return
+        self._thread = threading.Thread(target=self._run, name='sta-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python sta_monitor.py <job>.sta [<job>.sta ...]")
+        return 1
+
+    for path in argv:
+        name = os.path.splitext(os.path.basename(path))[0]
+        progress = JobProgress(name, path)
+        progress.tail.not_before = None
+        progress.poll()
+        status = ' (completed)' if progress.tail.completed else ' (aborted)' if progress.tail.aborted else ''
+        print(progress.describe() + status)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,49 @@
+import argparse
 import subprocess
 import sys
 import os
+from pathlib import Path
+
+from job_control import kill_process_tree, terminate_job
+from job_ledger import JobLedger
+
+def stop_job(name, ledger_path, work_dir, abaqus_cmd='abaqus'):
+    """
+    Stop a single job of a running batch.
+    
+    Kills the process tree recorded for the job in the job ledger (Linux and
+    Windows). Without a recorded PID, e.g. for jobs run by a CAE server,
+    the analysis is ended with `abaqus terminate` in the job's work_dir.
+    """
+    ledger = JobLedger(ledger_path)
+    try:
+        row = ledger.get(name)
+    finally:
+        ledger.close()
+    
+    if row is not None and row['pid']:
+        print(f"Killing process tree of {name} (PID {row['pid']})...")
+        kill_process_tree(row['pid'])
+        return True
+    
+    print(f"No PID recorded for {name}, trying abaqus terminate...")
+    return terminate_job(name, work_dir, abaqus_cmd)
+
+def stop_batch_jobs(ledger_path):
+    """Stop every running job recorded in the job ledger."""
+    ledger = JobLedger(ledger_path)
+    try:
+        running = ledger.running_pids()
+    finally:
+        ledger.close()
+    
+    if not running:
+        print("No running jobs with a recorded PID were found.")
+        return True
+    for name, pid in running.items():
+        print(f"Killing process tree of {name} (PID {pid})...")
+        kill_process_tree(pid)
+    return True
 
 def stop_abaqus_simulations():
     """Stop all running Abaqus simulations."""
@@ -46,4 +89,26 @@ def stop_abaqus_simulations():
     return True
 
 if __name__ == '__main__':
-    stop_abaqus_simulations()
\ No newline at end of file
+    results_dir = Path(__file__).resolve().parent.parent / 'results'
+    
+    parser = argparse.ArgumentParser(description="Stop running Abaqus simulations.")
+    parser.add_argument('--job', default=None,
+                        help="stop only this job (name as in the job ledger)")
+    parser.add_argument('--ledger', default=str(results_dir / 'job_ledger.sqlite'),
+                        help="path of the job ledger database")
+    parser.add_argument('--abaqus', default='abaqus',
+                        help="Abaqus command for jobs without a recorded PID")
+    args = parser.parse_args()
+    
+    if args.job:
+        from run_batch import find_project_root, read_workspace_config
+        from workspace import job_work_dir
+        
+        work_root = read_workspace_config(find_project_root())[0]
+        ok = stop_job(args.job, args.ledger, job_work_dir(work_root, args.job), args.abaqus)
+    elif os.name == 'nt':
+        ok = stop_abaqus_simulations()
+    else:
+        # No image names to kill on Linux, stop the jobs of the batch instead
+        ok = stop_batch_jobs(args.ledger)
+    sys.exit(0 if ok else 1)
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+Validation of the half-width symmetry model against the full model.
+
+Geometry and loading of both joints are symmetric about the mid-plane
+across the width B. The layups are not: mirrored across the width, the
+[-45/0/45/90]s plies become [45/0/-45/90]s, so the symmetry boundary
+condition only approximates the full model, and this check decides whether
+the half model is good enough. With half_width = true in the [mesh] section
+of config.ini, the builders extrude only B/2, put a symmetry boundary
+condition (ZSYMM) on the cut face and write width_fraction = 0.5 to the
+mesh report, so the extracted RF1 is doubled back to the full width. The
+check runs a representative design point as full and as half model per
+joint type and compares
+
+    RF1 deviation   relative difference of the (scaled) peak RF1 to the
+                    full model
+    elements        element counts of both meshes
+    speedup         wall time of the full model / wall time of the half model
+
+The runs use the campaign's model settings (run_batch.campaign_model_options:
+calibrated step, graded mesh seed, restricted contact), so the check
+covers the models run_batch.py actually solves. All runs are written
+to results/symmetry_check.csv; the exit code is 1 if a deviation exceeds
+the tolerance or a run fails.
+
+Usage (from the abaqus-sim directory):
+    python src/symmetry_check.py
+    python src/symmetry_check.py --joint-types SEP --tolerance 0.005
+"""
+
+import argparse
+import sys
+
+from ab_check import compare_runs, print_summary, run_checks, run_point
+
+RESULTS_HEADER = ['Joint_type', 'Model', 'Completed', 'Wall_s', 'Elements', 'Max_RF1', 'RF1_deviation',
+                  'Speedup', 'Within_tolerance']
+
+
+def compare(joint_type, full, half, tolerance):
+    """
+    Rows of the full and the half model of a joint type (see
+    ab_check.compare_runs); max_rf1 of both is at full width.
+    """
+    return compare_runs(joint_type, 'Model', ('full', 'half'), full, half, tolerance,
+                        lambda result: {'Elements': result.get('elements') or ''})
+
+
+def describe(full_row, half_row):
+    return f"{half_row['Elements']} vs {full_row['Elements']} elements"
+
+
+def main(argv=None):
+    from run_batch import (campaign_model_options, find_project_root, load_config, read_config,
+                           read_scheduler_config, read_workspace_config)
+    from naming import job_name
+    from scheduler import plan_job_resources
+
+    project_root = find_project_root()
+    config = load_config(project_root)
+    joint_type, adhesive, total_cores, abaqus_cmd = read_config(project_root)
+    _, _, memory_percent = read_scheduler_config(project_root)
+
+    parser = argparse.ArgumentParser(
+        description="Compare the half-width symmetry model with the full model on a design point.")
+    parser.add_argument('--joint-types', nargs='+', choices=('SAP', 'SEP'), default=['SAP', 'SEP'],
+                        help="joint types to check (default: both)")
+    parser.add_argument('--tolerance', type=float,
+                        default=config.getfloat('mesh', 'symmetry_tolerance', fallback=0.01),
+                        help="largest relative RF1 deviation (default: [mesh] symmetry_tolerance)")
+    parser.add_argument('--overlap', type=float, default=30.0)
+    parser.add_argument('--film-thickness', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    try:
+        model_options = {jt: campaign_model_options(project_root, jt) for jt in args.joint_types}
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    print(f"Symmetry check on {total_cores} cores, point: {args.overlap} mm overlap, "
+          f"{args.film_thickness} mm {adhesive}, RF1 within {args.tolerance * 100:g}% of the full model")
+
+    work_root, scratch, _ = read_workspace_config(project_root)
+    results_dir = project_root / 'results'
+    log_dir = results_dir / 'logs' / 'symmetry_check'
+    _, memory = plan_job_resources(total_cores, memory_percent, 1, total_cores)
+
+    def run_model(jt, half_width):
+        name = job_name(jt, args.overlap, args.film_thickness, adhesive)
+        model = 'half' if half_width else 'full'
+        options = dict(model_options[jt], memory=memory, save_cae=0, output_profile='minimal',
+                       half_width=int(half_width))
+        if scratch:
+            options['scratch'] = scratch
+        print(f"\n{jt} {model} model")
+        return run_point(jt, args.overlap, args.film_thickness, adhesive, total_cores, project_root,
+                         abaqus_cmd, options, work_root / 'symmetry_check' / f"{name}_{model}",
+                         log_dir / f"{name}_{model}.log")
+
+    csv_path = results_dir / 'symmetry_check.csv'
+    rows = run_checks(args.joint_types, run_model,
+                      lambda jt, full, half: compare(jt, full, half, args.tolerance),
+                      csv_path, RESULTS_HEADER)
+    return 0 if print_summary("HALF-WIDTH SYMMETRY MODEL", rows, describe, csv_path) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
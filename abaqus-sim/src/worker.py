@@ -0,0 +1,198 @@
+"""
+Worker for distributed batches (run_batch.py --distributed).
+
+The coordinator puts the design points of sim_params.csv into a directory
+spool on a shared file system (see spool.py). A worker on each solver node
+claims one point at a time, runs it through run_simulations.py in a local
+work directory, moves the final artifacts into the shared results
+directory, extracts RF1 and reports the result and its timings back
+through the spool.
+
+While a worker runs, a heartbeat is written every heartbeat_interval
+seconds. If a worker dies mid-job, its heartbeat stops and the coordinator
+puts the point back into the queue for another worker.
+
+Usage (on each node, from the abaqus-sim directory):
+    python src/worker.py <spool_dir>
+    python src/worker.py <spool_dir> --jobs 2 --cores 14
+    python src/worker.py <spool_dir> --stop      # ask all workers to exit
+"""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+import spool
+from extraction import extract_odb_result
+from job_control import JobWatchdog, PostPeakWatcher
+from job_ledger import JOB_DONE, JOB_FAILED
+from run_batch import (find_project_root, load_config, read_config, read_watchdog_config,
+                       read_workspace_config, run_abaqus_simulation)
+from workspace import collect_artifacts, job_work_dir, prepare_work_dir, remove_work_dir
+
+
+class Worker:
+    """
+    Claim design points from a spool and run them one after another.
+
+    handle() runs a single point and is also used by the array tasks of
+    cluster.py, which have no spool (spool_dir=None).
+    """
+
+    def __init__(self, spool_dir, project_root, worker_id, abaqus_cmd='abaqus', cores=None,
+                 results_dir=None, heartbeat_interval=30.0, poll_interval=5.0):
+        self.spool_dir = str(spool_dir) if spool_dir is not None else None
+        self.project_root = Path(project_root)
+        self.worker_id = worker_id
+        self.abaqus_cmd = abaqus_cmd
+        self.cores = cores
+        self.results_dir = Path(results_dir) if results_dir else None
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.work_root, self.scratch, self.keep_failed = read_workspace_config(self.project_root)
+        self.watchdog_settings = read_watchdog_config(self.project_root)
+        self.current = None
+        self._stop = threading.Event()
+
+    def _heartbeat(self):
+        while not self._stop.is_set():
+            spool.heartbeat(self.spool_dir, self.worker_id, {
+                'host': socket.gethostname(),
+                'pid': os.getpid(),
+                'job': self.current,
+            })
+            self._stop.wait(self.heartbeat_interval)
+
+    def handle(self, task):
+        """Run one design point and return the result reported to the coordinator."""
+        name = task['name']
+        self.current = name
+        cores = self.cores or task['cores']
+        results_dir = self.results_dir or Path(task.get('results_dir') or self.project_root / 'results')
+        work_dir = prepare_work_dir(job_work_dir(self.work_root, name))
+        options = dict(task.get('options') or {}, work_dir=str(work_dir))
+        if self.scratch:
+            options['scratch'] = self.scratch
+        watchdog = None
+        if self.watchdog_settings is not None:
+            watchdog = JobWatchdog(name, work_dir / f"{name}.sta", **self.watchdog_settings)
+
+        watcher = None
+        if task.get('post_peak_drop'):
+            watcher = PostPeakWatcher(name, work_dir, self.abaqus_cmd, task['post_peak_drop'],
+                                      task.get('termination_poll', 60.0))
+            watcher.start()
+
+        print(f"\n[{self.worker_id}] Running {name} on {cores} cores")
+        started = time.time()
+        try:
+            state = run_abaqus_simulation(
+                task['overlap'], task['adhesive'], task['film_thickness'], cores,
+                task['joint_type'], self.project_root, self.abaqus_cmd,
+                options=options, watchdog=watchdog
+            )
+        finally:
+            if watcher is not None:
+                watcher.stop()
+        finished = time.time()
+        message = None
+        if watchdog is not None and watchdog.reason:
+            message = f"stalled: {watchdog.reason}"
+        if watcher is not None and watcher.terminated:
+            state = JOB_DONE
+            message = 'terminated after peak'
+
+        try:
+            collect_artifacts(work_dir, results_dir, name)
+        except OSError as e:
+            print(f"ERROR: Could not move results of {name} to {results_dir}: {e}")
+            state = JOB_FAILED
+        if state == JOB_DONE or not self.keep_failed:
+            remove_work_dir(work_dir)
+
+        result = {
+            'state': state,
+            'success': state == JOB_DONE,
+            'worker': self.worker_id,
+            'host': socket.gethostname(),
+            'cores': cores,
+            'started': started,
+            'finished': finished,
+            'duration': finished - started,
+            'message': message,
+        }
+
+        if state == JOB_DONE and task.get('extract'):
+            extracted = extract_odb_result(results_dir / f"{name}.odb", self.abaqus_cmd)
+            if extracted is None:
+                result.update(state=JOB_FAILED, success=False, message='RF1 extraction failed')
+            else:
+                result.update(extracted)
+
+        print(f"[{self.worker_id}] {name}: {result['state']} after {result['duration']:.0f} s")
+        self.current = None
+        return result
+
+    def run(self, idle_timeout=None):
+        """Serve points until a stop is requested. Returns the number of points run."""
+        beat = threading.Thread(target=self._heartbeat, name=f"heartbeat-{self.worker_id}", daemon=True)
+        beat.start()
+        try:
+            return spool.serve(self.spool_dir, self.handle, poll_interval=self.poll_interval,
+                               idle_timeout=idle_timeout, worker_id=self.worker_id)
+        finally:
+            self._stop.set()
+            beat.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run design points from a distributed batch spool.")
+    parser.add_argument('spool_dir', help="spool directory shared with the coordinator")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="number of points this node runs at the same time")
+    parser.add_argument('--cores', type=int, default=None,
+                        help="cores per point (default: as requested by the coordinator)")
+    parser.add_argument('--results-dir', default=None,
+                        help="shared results directory as seen from this node "
+                             "(default: as given by the coordinator)")
+    parser.add_argument('--worker-id', default=None,
+                        help="worker name (default: <host>-<pid>)")
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help="exit after this many seconds without work")
+    parser.add_argument('--stop', action='store_true',
+                        help="ask all workers of the spool to exit once idle")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        spool.request_stop(args.spool_dir)
+        print(f"Stop requested for workers of {args.spool_dir}")
+        return 0
+
+    project_root = find_project_root()
+    _, _, _, abaqus_cmd = read_config(project_root)
+    heartbeat_interval = load_config(project_root).getfloat('distributed', 'heartbeat_interval',
+                                                            fallback=30.0)
+    spool.clear_stop(args.spool_dir)
+
+    base_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    workers = [
+        Worker(args.spool_dir, project_root, base_id if args.jobs == 1 else f"{base_id}-{n}",
+               abaqus_cmd, args.cores, args.results_dir, heartbeat_interval)
+        for n in range(1, args.jobs + 1)
+    ]
+    print(f"Starting {len(workers)} worker(s) on spool {args.spool_dir}")
+    threads = [threading.Thread(target=w.run, args=(args.idle_timeout,), name=w.worker_id)
+               for w in workers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Per-job work directories.
+
+Concurrent jobs must not share a working directory: Abaqus writes many
+files named after the job and the current directory (.jnl, .rpy, lock
+files, ...). Every job of a batch therefore runs in <work_root>/<job_name>.
+When the job has finished, only its final artifacts are moved into the
+results directory and the work directory is removed.
+
+The work root can be on a fast local disk while the results directory is
+on a network share.
+"""
+
+import shutil
+from pathlib import Path
+
+from mesh_grading import MESH_SUFFIX
+
+# Files that are kept in the results directory after a job
+FINAL_ARTIFACTS = ('.odb', '.cae', '.inp', '.sta', '.msg', '.dat', MESH_SUFFIX)
+
+
+def job_work_dir(work_root, name):
+    return Path(work_root) / name
+
+
+def prepare_work_dir(work_dir):
+    """Create an empty work directory, removing leftovers of an earlier run."""
+    work_dir = Path(work_dir)
+    if work_dir.exists():
+        shutil.rmtree(work_dir)
+    work_dir.mkdir(parents=True)
+    return work_dir
+
+
+def collect_artifacts(work_dir, results_dir, name, suffixes=FINAL_ARTIFACTS):
+    """
+    Move the final artifacts <name><suffix> of a job into the results directory.
+
+    Existing files of the same name in the results directory are replaced.
+    Returns the list of moved files (destination paths).
+    """
+    work_dir = Path(work_dir)
+    results_dir = Path(results_dir)
+    if work_dir.resolve() == results_dir.resolve():
+        return []
+    results_dir.mkdir(parents=True, exist_ok=True)
+
+    moved = []
+    for suffix in suffixes:
+        source = work_dir / f"{name}{suffix}"
+        if not source.exists():
+            continue
+        target = results_dir / source.name
+        if target.exists():
+            target.unlink()
+        # shutil.move copies if the work root is on another file system
+        shutil.move(str(source), str(target))
+        moved.append(target)
+    return moved
+
+
+def remove_work_dir(work_dir):
+    shutil.rmtree(work_dir, ignore_errors=True)
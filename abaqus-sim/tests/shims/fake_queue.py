@@ -0,0 +1,77 @@
+"""
+State of the sbatch/squeue and qsub/qstat stand-ins in this directory.
+
+The queue is a directory (FAKE_QUEUE_DIR) with one file per array task,
+<job id>_<row>, holding the task state. Submitting starts every array task
+as a background process that runs the batch script with the index
+variable set and removes its file once the script has exited, as a real
+scheduler drops finished tasks from the queue.
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+def queue_dir():
+    path = Path(os.environ['FAKE_QUEUE_DIR'])
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def next_job_id():
+    counter = queue_dir() / 'last_job_id'
+    job_id = int(counter.read_text()) + 1 if counter.exists() else 1000
+    counter.write_text(str(job_id))
+    return str(job_id)
+
+
+def array_rows(script_path, pattern):
+    """Rows of the array directive matched by pattern (its group is the spec)."""
+    for line in Path(script_path).read_text().splitlines():
+        match = re.match(pattern, line)
+        if match:
+            spec = match.group(1).split('%')[0]
+            if '-' in spec:
+                first, last = spec.split('-')
+                return list(range(int(first), int(last) + 1))
+            return [int(row) for row in spec.split(',')]
+    raise SystemExit(f"no array directive in {script_path}")
+
+
+def submit(script_path, rows, index_variable, pending_state, running_state):
+    """Queue one task per row and start them. Returns the job id."""
+    job_id = next_job_id()
+    for row in rows:
+        task_file = queue_dir() / f"{job_id}_{row}"
+        task_file.write_text(pending_state)
+        subprocess.Popen([sys.executable, __file__, str(task_file), str(script_path), index_variable,
+                          str(row), running_state],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    return job_id
+
+
+def queued(job_id):
+    """{row: state} of the tasks of a job still in the queue."""
+    states = {}
+    for path in queue_dir().glob(f"{job_id}_*"):
+        try:
+            states[int(path.name.split('_')[1])] = path.read_text()
+        except OSError:
+            continue
+    return states
+
+
+def run_task(task_file, script_path, index_variable, row, running_state):
+    task_file = Path(task_file)
+    task_file.write_text(running_state)
+    try:
+        subprocess.run(['bash', script_path], env=dict(os.environ, **{index_variable: row}))
+    finally:
+        task_file.unlink()
+
+
+if __name__ == '__main__':
+    run_task(*sys.argv[1:])
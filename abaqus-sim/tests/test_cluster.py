@@ -0,0 +1,73 @@
+"""
+ArrayJobRunner against the sbatch/squeue and qsub/qstat stand-ins in
+shims/ (see shims/fake_queue.py).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from cluster import SCHEDULERS, ArrayJobRunner, PbsArray, SlurmArray
+from scheduler import ScheduledJob
+
+SHIMS = Path(__file__).resolve().parent / 'shims'
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="the shims are bash/python scripts")
+
+
+def test_slurm_parse_status():
+    output = ("1234_3 RUNNING\n"
+              "1234_7 PENDING\n"
+              "12345_8 RUNNING\n"
+              "garbage\n")
+    assert SlurmArray().parse_status(output, '1234') == {3: 'RUNNING', 7: 'PENDING'}
+    assert SlurmArray().parse_job_id("1234;cluster\n") == '1234'
+
+
+def test_pbs_parse_status():
+    output = ("Job id            Name             User              Time Use S Queue\n"
+              "----------------  ---------------- ----------------  -------- - -----\n"
+              "1234[].server     abaqus_batch     user                     0 B workq\n"
+              "1234[3].server    abaqus_batch     user              00:00:01 R workq\n"
+              "1234[7].server    abaqus_batch     user                     0 Q workq\n"
+              "12345[8].server   abaqus_batch     user              00:00:01 R workq\n")
+    assert PbsArray().parse_status(output, '1234') == {3: 'R', 7: 'Q'}
+    assert PbsArray().parse_job_id("1234[].server\n") == '1234'
+
+
+@pytest.mark.parametrize('scheduler_name, submit_command, status_command',
+                         [('slurm', 'sbatch', 'squeue'), ('pbs', 'qsub', 'qstat')])
+def test_array_job_runner(tmp_path, monkeypatch, scheduler_name, submit_command, status_command):
+    monkeypatch.setenv('FAKE_QUEUE_DIR', str(tmp_path / 'queue'))
+    jobs = [ScheduledJob(f"point_{row}", 2, 10, {'index': row}) for row in (1, 2, 4)]
+    runner = ArrayJobRunner(SCHEDULERS[scheduler_name](), tmp_path / 'array', tmp_path,
+                            submit_command=str(SHIMS / submit_command),
+                            status_command=str(SHIMS / status_command),
+                            python_cmd=str(SHIMS / 'array_task'), poll_interval=0.1)
+
+    def task_for(job):
+        # Row 2 dies before it writes its result file
+        return {'name': job.name, 'exit_without_result': job.payload['index'] == 2}
+
+    claimed, results = {}, {}
+
+    def on_claim(job, worker):
+        claimed[job.name] = worker
+
+    def on_result(job, result):
+        results[job.name] = result
+        return result['success']
+
+    stats = runner.run(jobs, task_for, on_result, on_claim)
+
+    assert set(results) == {'point_1', 'point_2', 'point_4'}
+    assert results['point_1']['success'] and results['point_4']['success']
+    assert not results['point_2']['success']
+    assert results['point_2']['error'] == 'array task ended without a result'
+    assert [job.success for job in jobs] == [True, False, True]
+    # The successful tasks were seen running before their result appeared
+    assert claimed['point_1'] == f"{scheduler_name} {runner.job_id}_1"
+    assert 'point_4' in claimed
+    assert stats.makespan > 0
+    assert (tmp_path / 'array' / 'array_job.sh').exists()
@@ -2,10 +2,16 @@ from odbAccess import openOdb
 import sys
 import os
 
-def extract_rf1_from_odb(odb_path):
-    """Extract RF1 value and region from a single ODB file."""
+def extract_rf1_from_odb(odb_path, curve_path=None):
+    """
+    Extract RF1 value and region from a single ODB file.
+    
+    If curve_path is given, the RF1 history of the region with the highest RF1
+    is also written there as CSV (Time, U1, RF1).
+    """
     try:
-        odb = openOdb(odb_path)
+        # Read-only, so the ODB of a job that is still running can be read as well
+        odb = openOdb(odb_path, readOnly=True)
         rf1_max = None
         region_found = None
         
@@ -31,6 +37,11 @@ def extract_rf1_from_odb(odb_path):
             with open('rf1_result.txt', 'w') as f:
                 f.write(f"{rf1_max}\n{region_found}" if rf1_max is not None else "")
             
+            write_energy_ratio(step)
+            
+            if curve_path and rf1_max is not None:
+                write_rf1_curve(step.historyRegions[region_found], curve_path)
+            
         finally:
             odb.close()
             
@@ -38,10 +49,44 @@ def extract_rf1_from_odb(odb_path):
         print(f"Error processing ODB file: {e}")
         sys.exit(1)
 
+def write_energy_ratio(step, result_path='energy_result.txt'):
+    """
+    Write the largest ALLKE/ALLIE ratio of the whole model (H-Output-1), a
+    check that the explicit analysis stayed quasi-static. Times with almost
+    no internal energy yet (below 1% of its maximum) are skipped.
+    """
+    for region in step.historyRegions.values():
+        outputs = region.historyOutputs
+        if 'ALLKE' not in outputs.keys() or 'ALLIE' not in outputs.keys():
+            continue
+        allke_by_time = {t: ke for t, ke in outputs['ALLKE'].data}
+        allie_data = outputs['ALLIE'].data
+        allie_max = max(ie for _, ie in allie_data)
+        ratios = [allke_by_time.get(t, 0.0) / ie for t, ie in allie_data
+                  if ie > 0.01 * allie_max]
+        if ratios:
+            with open(result_path, 'w') as f:
+                f.write(f"{max(ratios)}\n")
+        return
+
+def write_rf1_curve(region, curve_path):
+    """Write the RF1 (and U1, if available) history of a region as CSV."""
+    outputs = region.historyOutputs
+    rf1_data = outputs['RF1'].data
+    u1_by_time = {}
+    if 'U1' in outputs.keys():
+        u1_by_time = {t: u for t, u in outputs['U1'].data}
+    
+    with open(curve_path, 'w') as f:
+        f.write("Time,U1,RF1\n")
+        for t, rf1 in rf1_data:
+            f.write(f"{t},{u1_by_time.get(t, '')},{rf1}\n")
+
 if __name__ == '__main__':
-    if len(sys.argv) != 2:
-        print("Usage: abaqus cae noGUI=extract_rf1_single.py -- odb_path")
+    if len(sys.argv) not in (2, 3):
+        print("Usage: abaqus python extract_rf1_single.py odb_path [curve_csv]")
         sys.exit(1)
     
     odb_path = sys.argv[1]
-    extract_rf1_from_odb(odb_path)
\ No newline at end of file
+    curve_path = sys.argv[2] if len(sys.argv) == 3 else None
+    extract_rf1_from_odb(odb_path, curve_path)
\ No newline at end of file
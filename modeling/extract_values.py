@@ -1,9 +1,19 @@
 import csv
 import re
+import sys
 import tkinter as tk
 from tkinter import filedialog
 import os
+import shutil
 import subprocess
+import tempfile
+
+# The mesh report helpers live in abaqus-sim/src
+ABAQUS_SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'abaqus-sim', 'src'))
+if ABAQUS_SRC_DIR not in sys.path:
+    sys.path.append(ABAQUS_SRC_DIR)
+
+from mesh_grading import rf1_scale
 
 # === Step 1: Select ODB files ===
 root = tk.Tk()
@@ -64,16 +74,21 @@ with open(csv_path, 'w', newline='') as csvfile:
         rf1_max = None
         region_found = None
         
+        # Run each extraction in a private directory, so extractions running
+        # at the same time do not overwrite each other's rf1_result.txt
+        work_dir = tempfile.mkdtemp(prefix='rf1_')
+        
         try:
             # Call extract_rf1_single.py with abaqus python
             cmd = f'abaqus python "{extract_script}" "{odb_path}"'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300)
+            result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=300,
+                                    cwd=work_dir)
             
             if result.returncode != 0:
                 print(f" Error running extraction: {result.stderr}")
             else:
                 # Read the result file
-                result_file = 'rf1_result.txt'
+                result_file = os.path.join(work_dir, 'rf1_result.txt')
                 if os.path.exists(result_file):
                     with open(result_file, 'r') as f:
                         lines = f.readlines()
@@ -81,6 +96,8 @@ with open(csv_path, 'w', newline='') as csvfile:
                             try:
                                 rf1_max = float(lines[0].strip())
                                 region_found = lines[1].strip()
+                                # A half-width symmetry model carries half the load
+                                rf1_max *= rf1_scale(odb_path)
                                 print(f" Found RF1: {rf1_max:.2f} in region {region_found}")
                             except ValueError:
                                 print(f" Could not parse RF1 value from result file")
@@ -99,6 +116,8 @@ with open(csv_path, 'w', newline='') as csvfile:
             print(f" Timeout processing {odb_name}")
         except Exception as e:
             print(f" Error processing {odb_name}: {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
 
         writer.writerow([odb_name, overlap, thickness, adhesive, rf1_max, region_found])
 
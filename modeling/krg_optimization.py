@@ -8,8 +8,19 @@ import tkinter as tk
 from tkinter import filedialog
 import configparser
 import matplotlib.pyplot as plt
+from pathlib import Path
 from krg_training import train_and_predict_kriging
 
+# The batch tools (result cache, extraction) live in abaqus-sim/src
+ABAQUS_SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'abaqus-sim', 'src'))
+if ABAQUS_SRC_DIR not in sys.path:
+    sys.path.append(ABAQUS_SRC_DIR)
+
+from cae_client import CaeServerPool
+from extraction import extract_odb_result
+from result_cache import open_cache, point_key
+from run_batch import campaign_model_options, read_output_profile
+
 # Read configuration
 config = configparser.ConfigParser()
 config_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.ini')
@@ -25,6 +36,20 @@ ADHESIVE_TYPE = config.get('simulation', 'adhesive_type')
 CPU_CORES = config.getint('simulation', 'cpu_cores')
 JOINT_TYPE = config.get('simulation', 'joint_type', fallback='SAP')
 N_ITERATIONS = config.getint('optimization', 'n_iterations')
+USE_CAE_SERVER = config.getboolean('optimization', 'use_cae_server', fallback=False)
+
+# Result cache shared with run_batch.py (None if disabled in config.ini)
+RESULT_CACHE = open_cache(config, os.path.dirname(ABAQUS_SRC_DIR))
+
+# Model settings of the campaign (calibration.json, [mesh], [contact]) and the
+# [output] profile as in run_batch.py, so the points are solved like the batch
+# points and share their cache entries
+try:
+    MODEL_OPTIONS = campaign_model_options(Path(ABAQUS_SRC_DIR).parent, JOINT_TYPE)
+except ValueError as e:
+    print(f"Error: {e}")
+    sys.exit(1)
+OUTPUT_PROFILE = read_output_profile(Path(ABAQUS_SRC_DIR).parent)
 
 def select_results_file():
     """Open a file dialog to select the results CSV file."""
@@ -54,10 +79,13 @@ def format_overlap_for_filename(overlap_mm):
     rounded = round(float(overlap_mm), 4)
     return f"{rounded:.4f}".replace(".", "p")
 
-def get_rf1_from_odb(overlap_mm, thickness_mm):
-    """Extract RF1 value and region from an ODB file using abaqus python."""
+def get_result_from_odb(overlap_mm, thickness_mm):
+    """
+    Extract RF1 value, region and RF1 curve from an ODB file using abaqus python.
+    
+    Returns a dict with the keys 'max_rf1', 'region' and 'curve', or None.
+    """
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    abaqus_dir = os.path.abspath(os.path.join(script_dir, '..', 'abaqus-sim', 'src'))
     results_dir = os.path.abspath(os.path.join(script_dir, '..', 'abaqus-sim', 'results'))
     
     # Format the filename components
@@ -70,49 +98,13 @@ def get_rf1_from_odb(overlap_mm, thickness_mm):
     
     if not os.path.exists(odb_path):
         print(f"Error: ODB file not found: {odb_path}")
-        return None, None
+        return None
     
     try:
-        # Save current directory to return to it later
-        original_dir = os.getcwd()
-        try:
-            # Change to the abaqus directory
-            os.chdir(abaqus_dir)
-            
-            # Run the extraction script in Abaqus Python
-            extract_script = os.path.join(script_dir, 'extract_rf1_single.py')
-            cmd = f'abaqus python "{extract_script}" "{odb_path}"'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                print("Error running extraction script:")
-                print(result.stderr)
-                return None, None
-            
-            # Read results from the text file
-            result_file = 'rf1_result.txt'
-            if os.path.exists(result_file):
-                with open(result_file, 'r') as f:
-                    lines = f.readlines()
-                    if len(lines) >= 2:
-                        rf1_value = float(lines[0].strip())
-                        region_name = lines[1].strip()
-                        return rf1_value, region_name
-            
-            return None, None
-            
-        finally:
-            os.chdir(original_dir)
-            # Clean up result file
-            if os.path.exists(os.path.join(abaqus_dir, 'rf1_result.txt')):
-                try:
-                    os.remove(os.path.join(abaqus_dir, 'rf1_result.txt'))
-                except Exception:
-                    pass
-            
+        return extract_odb_result(odb_path)
     except Exception as e:
-        print(f"Error in get_rf1_from_odb: {e}")
-        return None, None
+        print(f"Error in get_result_from_odb: {e}")
+        return None
 
 def update_results_csv(overlap, thickness, rf1_value, region_name, results_file='results.csv'):
     """Update the results CSV file with a new data point."""
@@ -162,8 +154,52 @@ def add_point_to_sim_params(overlap, adhesive_thickness):
     else:
         new_point.to_csv(sim_params_path, index=False)
 
+def launch_simulation(overlap, adhesive_thickness, cae_server=None):
+    """Run the Abaqus simulation of one point and return True on success."""
+    options = dict(MODEL_OPTIONS, output_profile=OUTPUT_PROFILE)
+    if cae_server is not None:
+        # Hand the point to the running CAE kernel
+        result = cae_server.run_point(overlap, ADHESIVE_TYPE, adhesive_thickness, CPU_CORES, JOINT_TYPE,
+                                      options=options)
+        print(f"CAE server result: {result}")
+        return bool(result and result.get('success'))
+    
+    # Launch Abaqus simulation and capture output
+    cmd = f'abaqus cae noGUI=run_simulations.py -- {overlap} {ADHESIVE_TYPE} {adhesive_thickness} {CPU_CORES} {JOINT_TYPE}'
+    cmd += ''.join(f' {name}={value}' for name, value in options.items())
+    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+    
+    # Print Abaqus output
+    if result.stdout:
+        print(result.stdout)
+    if result.stderr:
+        print("Errors:", result.stderr)
+    
+    print(f"Exit code: {result.returncode}")
+    return result.returncode == 0
+
 def run_optimization_loop(n_iterations=5, results_file='results.csv'):
-    """Run the iterative optimization loop."""
+    """
+    Run the iterative optimization loop.
+    
+    With use_cae_server = true in config.ini, one CAE kernel builds the
+    points of all iterations instead of starting Abaqus CAE for each one.
+    """
+    cae_server = None
+    if USE_CAE_SERVER:
+        project_root = os.path.dirname(ABAQUS_SRC_DIR)
+        spool_dir = os.path.join(project_root, 'spool', f"krg_{os.getpid()}")
+        cae_server = CaeServerPool(spool_dir, 'abaqus', project_root, size=1)
+        cae_server.start()
+    
+    try:
+        return optimization_iterations(n_iterations, results_file, cae_server)
+    finally:
+        if cae_server is not None:
+            cae_server.stop()
+
+def optimization_iterations(n_iterations, results_file, cae_server=None):
+    """Run the iterations of the optimization loop."""
     print("\nRunning optimization loop with:")
     print(f"Results file: {results_file}")
     print(f"Number of iterations: {n_iterations}")
@@ -222,6 +258,22 @@ def run_optimization_loop(n_iterations=5, results_file='results.csv'):
         print(f"  Length Scale (Thickness): {hyperparameters['length_scale_thickness']:.4f}")
         print(f"  Log Marginal Likelihood: {hyperparameters['log_marginal_likelihood']:.2f}")
         
+        # 2a. Reuse a cached result if this point has been solved before
+        cache_key = cache_inputs = None
+        if RESULT_CACHE is not None:
+            cache_key, cache_inputs = point_key(JOINT_TYPE, ADHESIVE_TYPE, overlap, adhesive_thickness,
+                                                MODEL_OPTIONS)
+            cached = RESULT_CACHE.get(cache_key)
+            if cached is not None:
+                print(f"\nCache hit: RF1 = {cached['max_rf1']:.2f} (no simulation needed)")
+                update_results_csv(overlap, adhesive_thickness, cached['max_rf1'], cached['region'], opt_results_file)
+                iteration_data['rf1_value'] = cached['max_rf1']
+                add_point_to_sim_params(overlap, adhesive_thickness)
+                iteration_history.append(iteration_data)
+                print(f"Iteration {iteration + 1} complete.\n")
+                print("-" * 50)
+                continue
+        
         # Get the absolute paths
         script_dir = os.path.dirname(os.path.abspath(__file__))
         sim_dir = os.path.abspath(os.path.join(script_dir, '..', 'abaqus-sim', 'src'))
@@ -242,19 +294,7 @@ def run_optimization_loop(n_iterations=5, results_file='results.csv'):
             thickness_microns = format_thickness_for_filename(adhesive_thickness)
             job_name = f"{JOINT_TYPE}{overlap_str}_{thickness_microns}mu_{ADHESIVE_TYPE}"
             
-            # Launch Abaqus simulation and capture output
-            cmd = f'abaqus cae noGUI=run_simulations.py -- {overlap} {ADHESIVE_TYPE} {adhesive_thickness} {CPU_CORES} {JOINT_TYPE}'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            
-            # Print Abaqus output
-            if result.stdout:
-                print(result.stdout)
-            if result.stderr:
-                print("Errors:", result.stderr)
-            
-            print(f"Exit code: {result.returncode}")
-            
-            if result.returncode != 0:
+            if not launch_simulation(overlap, adhesive_thickness, cae_server):
                 print("Error: Abaqus simulation failed")
                 return iteration_history
                 
@@ -273,9 +313,15 @@ def run_optimization_loop(n_iterations=5, results_file='results.csv'):
             
             # 3. Extract RF1 from the ODB file
             print("\nExtracting results from ODB file...")
-            rf1_value, region_name = get_rf1_from_odb(overlap, adhesive_thickness)
+            odb_result = get_result_from_odb(overlap, adhesive_thickness)
+            rf1_value = odb_result['max_rf1'] if odb_result else None
+            region_name = odb_result['region'] if odb_result else None
             
             if rf1_value is not None and region_name is not None:
+                if RESULT_CACHE is not None:
+                    RESULT_CACHE.put(cache_key, cache_inputs, rf1_value, region_name,
+                                     odb_result['curve'], job_name=job_name)
+
                 # 4. Update optimization results file with the new point
                 os.chdir(original_dir)  # Return to original directory
                 update_results_csv(overlap, adhesive_thickness, rf1_value, region_name, opt_results_file)
@@ -370,6 +416,7 @@ if __name__ == '__main__':
     print(f"Configuration:")
     print(f"- Adhesive Type: {ADHESIVE_TYPE}")
     print(f"- CPU Cores: {CPU_CORES}")
+    print(f"- Model options: {MODEL_OPTIONS or 'defaults'}, output profile {OUTPUT_PROFILE}")
     print(f"- Number of iterations: {N_ITERATIONS}")
     print("-" * 50)
     